@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Build reference-data/zip_county_crosswalk.csv for gen21-geo-rollup.py from public Census files.
+
+Inputs (downloaded from www2.census.gov unless local copies are given):
+  ZCTA_URL        2020 ZCTA-to-county relationship file (pipe-delimited, one row
+                  per ZCTA x county part, with land area of each part)
+  POPULATION_URL  county population estimates (STATE, COUNTY, POPESTIMATE{year})
+
+Output columns: zip, county_fips, county_name, state, population. A ZCTA that
+spans counties gets one row per county; population is the county's estimate
+apportioned by the part's share of the county's land area, so the rows of a
+county sum to its population and gen21 assigns each ZIP to its most populous
+county part.
+
+Run: python3 scripts/build-zip-county-crosswalk.py [--zcta tab20_zcta520_county20_natl.txt] [--population co-est.csv]
+"""
+import argparse, csv, io, os, urllib.request
+from collections import defaultdict
+
+ZCTA_URL = "https://www2.census.gov/geo/docs/maps-data/data/rel2020/zcta520/tab20_zcta520_county20_natl.txt"
+POPULATION_URL = ("https://www2.census.gov/programs-surveys/popest/datasets/2020-2023/counties/totals/"
+                  "co-est2023-alldata.csv")
+POPULATION_COLUMN = 'POPESTIMATE2023'
+OUTPUT = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'zip_county_crosswalk.csv')
+
+STATE_FIPS = {
+    '01': 'AL', '02': 'AK', '04': 'AZ', '05': 'AR', '06': 'CA', '08': 'CO', '09': 'CT', '10': 'DE',
+    '11': 'DC', '12': 'FL', '13': 'GA', '15': 'HI', '16': 'ID', '17': 'IL', '18': 'IN', '19': 'IA',
+    '20': 'KS', '21': 'KY', '22': 'LA', '23': 'ME', '24': 'MD', '25': 'MA', '26': 'MI', '27': 'MN',
+    '28': 'MS', '29': 'MO', '30': 'MT', '31': 'NE', '32': 'NV', '33': 'NH', '34': 'NJ', '35': 'NM',
+    '36': 'NY', '37': 'NC', '38': 'ND', '39': 'OH', '40': 'OK', '41': 'OR', '42': 'PA', '44': 'RI',
+    '45': 'SC', '46': 'SD', '47': 'TN', '48': 'TX', '49': 'UT', '50': 'VT', '51': 'VA', '53': 'WA',
+    '54': 'WV', '55': 'WI', '56': 'WY', '60': 'AS', '66': 'GU', '69': 'MP', '72': 'PR', '78': 'VI',
+}
+
+
+def read_text(path, url, encoding):
+    if path:
+        with open(path, encoding=encoding) as f:
+            return f.read()
+    print(f"  downloading {url}")
+    req = urllib.request.Request(url, headers={'User-Agent': 'MedicaidTracker/1.0'})
+    return urllib.request.urlopen(req, timeout=120).read().decode(encoding)
+
+
+parser = argparse.ArgumentParser(description='Build the ZIP -> county crosswalk from Census files')
+parser.add_argument('--zcta', help='local copy of the ZCTA-county relationship file')
+parser.add_argument('--population', help='local copy of the county population estimates CSV')
+args = parser.parse_args()
+
+print("Reading county population estimates...")
+county_pop = {}
+for row in csv.DictReader(io.StringIO(read_text(args.population, POPULATION_URL, 'latin-1'))):
+    if row['COUNTY'] != '000':  # 000 = state total
+        county_pop[row['STATE'] + row['COUNTY']] = int(row[POPULATION_COLUMN])
+
+print("Reading ZCTA-county relationship file...")
+parts, county_land, county_name = [], defaultdict(int), {}
+for row in csv.DictReader(io.StringIO(read_text(args.zcta, ZCTA_URL, 'utf-8-sig')), delimiter='|'):
+    fips = row['GEOID_COUNTY_20']
+    county_land[fips] += int(row['AREALAND_PART'] or 0)
+    county_name[fips] = row['NAMELSAD_COUNTY_20']
+    if row['GEOID_ZCTA5_20']:  # county area outside any ZCTA has no ZIP
+        parts.append((row['GEOID_ZCTA5_20'], fips, int(row['AREALAND_PART'] or 0)))
+
+with open(OUTPUT + '.tmp', 'w', newline='') as f:
+    w = csv.writer(f)
+    w.writerow(['zip', 'county_fips', 'county_name', 'state', 'population'])
+    for zcta, fips, land in sorted(parts):
+        share = land / county_land[fips] if county_land[fips] else 0.0
+        w.writerow([zcta, fips, county_name[fips], STATE_FIPS.get(fips[:2], ''),
+                    round(county_pop.get(fips, 0) * share)])
+os.replace(OUTPUT + '.tmp', OUTPUT)
+print(f"\nWrote {len(parts):,} ZIP x county rows for {len({p[0] for p in parts}):,} ZIPs, "
+      f"{len(county_land):,} counties -> {OUTPUT}")
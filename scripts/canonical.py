@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Views over the canonical dataset written by gen25-canonicalize.py.
+
+register(con) creates, on any DuckDB connection or Session:
+
+  claims          encoded rows (integer ids, month_idx, year, paid/claims/benes)
+  codes, provider_types, states, months   lookup tables
+  claims_decoded  claims left-joined back to code / ptype / state / 'YYYY-MM' month
+                  (NULL where an id is NULL; no row is dropped)
+
+Aggregate on claims and decode only the final result, e.g.
+
+  SELECT c.code, SUM(paid) FROM claims JOIN codes c USING (code_id) GROUP BY 1
+"""
+import os
+
+CANONICAL_DIR = os.path.expanduser("~/.openclaw/workspace/canonical")
+MONTH_EPOCH = '2018-01'  # month_idx 0
+
+# lookup table -> (id column, value column, id type)
+DICTIONARIES = {
+    'codes': ('code_id', 'code', 'INTEGER'),
+    'provider_types': ('ptype_id', 'ptype', 'SMALLINT'),
+    'states': ('state_id', 'state', 'SMALLINT'),
+}
+
+
+def available(source=None):
+    """True when the canonical claims exist (and, given source, are at least as new as it)."""
+    path = os.path.join(CANONICAL_DIR, 'claims.parquet')
+    if not os.path.exists(path):
+        return False
+    return source is None or os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def register(con):
+    if not available():
+        raise SystemExit(f"No canonical dataset in {CANONICAL_DIR}; run scripts/gen25-canonicalize.py first")
+    for name in ('claims', 'months', *DICTIONARIES):
+        con.execute(f"CREATE OR REPLACE VIEW {name} AS "
+                    f"SELECT * FROM read_parquet('{os.path.join(CANONICAL_DIR, name + '.parquet')}')")
+    con.execute("""
+        CREATE OR REPLACE VIEW claims_decoded AS
+        SELECT cl.billing_npi, cl.servicing_npi, c.code, p.ptype, s.state, m.month, cl.year,
+               cl.paid, cl.claims, cl.benes
+        FROM claims cl
+        LEFT JOIN codes c USING (code_id)
+        LEFT JOIN provider_types p USING (ptype_id)
+        LEFT JOIN states s USING (state_id)
+        LEFT JOIN months m USING (month_idx)
+    """)
+    return con
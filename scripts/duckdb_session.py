@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shared DuckDB connection factory for the generators.
+
+connect(profile) returns the script's one Session, configured for the job:
+
+  scan     full-table aggregations: most of RAM, all cores, spill to disk,
+           insertion order not preserved (lets big GROUP BYs stream)
+  batch    repeated per-NPI batch queries: moderate memory, all cores
+  ml       feature extraction next to pandas/sklearn: leaves RAM for Python
+  service  long-running query service: small, fixed footprint
+
+memory_limit is a fraction of physical RAM (DUCKDB_MEMORY_LIMIT overrides, e.g.
+"12GB"); DUCKDB_THREADS and DUCKDB_TEMP_DIR override threads / spill location.
+
+Session.execute() logs wall time and peak DuckDB buffer memory for each query,
+and Session.batches() sizes batches from the peak memory measured on the
+previous batch instead of a hard-coded batch size.
+
+Usage:
+  from duckdb_session import connect
+  con = connect('scan')
+  rows = con.execute("SELECT ...").fetchall()
+  for batch in con.batches(npis, initial=100):
+      con.execute(...)
+"""
+import duckdb, os, threading, time, resource
+
+TEMP_DIR = os.path.expanduser("~/.openclaw/workspace/duckdb-tmp")
+POLL_SECONDS = 0.05
+LOG_MIN_SECONDS = 0.5  # quieter log for trivial queries
+
+PROFILES = {
+    'scan': {'memory_fraction': 0.6, 'threads': None, 'preserve_insertion_order': False},
+    'batch': {'memory_fraction': 0.4, 'threads': None, 'preserve_insertion_order': False},
+    'ml': {'memory_fraction': 0.35, 'threads': None, 'preserve_insertion_order': False},
+    'service': {'memory_fraction': 0.15, 'threads': 4, 'preserve_insertion_order': True},
+}
+BATCH_MEMORY_FRACTION = 0.5  # target peak per batch, as a share of memory_limit
+
+_session = None
+
+
+def physical_memory():
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+def _parse_bytes(text):
+    units = {'KB': 1e3, 'MB': 1e6, 'GB': 1e9, 'TB': 1e12, 'KIB': 2**10, 'MIB': 2**20, 'GIB': 2**30, 'TIB': 2**40}
+    text = text.strip().upper().replace(' ', '')
+    for unit, mult in sorted(units.items(), key=lambda u: -len(u[0])):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * mult)
+    return int(text)
+
+
+def _mb(n):
+    return f"{n / 1e6:,.0f}MB"
+
+
+class Session:
+    def __init__(self, profile, **overrides):
+        settings = {**PROFILES[profile], **overrides}
+        self.profile = profile
+        env_limit = os.environ.get('DUCKDB_MEMORY_LIMIT')
+        self.memory_limit = _parse_bytes(env_limit) if env_limit else int(physical_memory() * settings['memory_fraction'])
+        threads = int(os.environ.get('DUCKDB_THREADS', 0)) or settings['threads'] or os.cpu_count()
+        temp_dir = os.environ.get('DUCKDB_TEMP_DIR', TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+
+        self.con = duckdb.connect(config={
+            'memory_limit': f"{self.memory_limit // 2**20}MiB",
+            'threads': threads,
+            'temp_directory': temp_dir,
+            'preserve_insertion_order': settings['preserve_insertion_order'],
+        })
+        self._monitor = self.con.cursor()
+        self.log = []          # (label, seconds, peak bytes)
+        self.window_peak = 0   # peak since the current batch started
+        print(f"  [duckdb] profile={profile} memory_limit={_mb(self.memory_limit)} threads={threads} temp={temp_dir}")
+
+    def _buffer_bytes(self):
+        return self._monitor.execute("SELECT COALESCE(SUM(memory_usage_bytes), 0) FROM duckdb_memory()").fetchone()[0]
+
+    def execute(self, sql, params=None, label=None):
+        """Run sql like DuckDBPyConnection.execute, recording peak buffer memory while it runs."""
+        peak = [0]
+        done = threading.Event()
+
+        def poll():
+            while not done.is_set():
+                peak[0] = max(peak[0], self._buffer_bytes())
+                done.wait(POLL_SECONDS)
+
+        watcher = threading.Thread(target=poll, daemon=True)
+        t0 = time.time()
+        watcher.start()
+        try:
+            result = self.con.execute(sql, params) if params is not None else self.con.execute(sql)
+        finally:
+            done.set()
+            watcher.join()
+        elapsed = time.time() - t0
+        peak[0] = max(peak[0], self._buffer_bytes())
+        self.window_peak = max(self.window_peak, peak[0])
+
+        label = label or ' '.join(sql.split())[:60]
+        self.log.append((label, elapsed, peak[0]))
+        if elapsed >= LOG_MIN_SECONDS:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            print(f"  [duckdb] {elapsed:6.1f}s peak {_mb(peak[0])} (process max {_mb(rss)}): {label}")
+        return result
+
+    def cursor(self):
+        return self.con.cursor()
+
+    def batches(self, items, initial=100, max_size=20000):
+        """Yield consecutive slices of items; each batch is sized so its peak DuckDB memory
+        (measured over the queries run for the previous batch) lands near
+        BATCH_MEMORY_FRACTION of memory_limit."""
+        target = self.memory_limit * BATCH_MEMORY_FRACTION
+        size, i = initial, 0
+        while i < len(items):
+            batch = items[i:i + size]
+            self.window_peak = 0
+            yield batch
+            i += len(batch)
+            if self.window_peak:
+                per_item = self.window_peak / len(batch)
+                # grow at most 4x per step so one cheap batch cannot trigger a huge one
+                size = max(1, min(max_size, size * 4, int(target / per_item)))
+
+    def close(self):
+        global _session
+        if _session is self:
+            _session = None
+        if self.log:
+            slowest = max(self.log, key=lambda r: r[1])
+            peak = max(self.log, key=lambda r: r[2])
+            print(f"  [duckdb] {len(self.log)} queries, {sum(r[1] for r in self.log):.1f}s total; "
+                  f"slowest {slowest[1]:.1f}s, peak {_mb(peak[2])} ({peak[0]})")
+            self.log = []
+        self._monitor.close()
+        self.con.close()
+
+
+def connect(profile='scan', **overrides):
+    """The script's DuckDB session; created on first call and reused afterwards."""
+    global _session
+    if _session is None:
+        _session = Session(profile, **overrides)
+    return _session
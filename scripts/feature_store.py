@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+On-disk provider feature store for the ML scripts.
+
+build() computes the ml-v3-retrain.py features (FEAT_COLS) for every billing
+provider in one DuckDB query and writes STORE_DIR:
+
+  X.npy             float32 [n_providers, len(FEAT_COLS)], raw (unscaled), inf/NaN -> 0
+  npi.npy           int64 [n_providers]
+  providers.parquet npi, specialty, state + FEAT_COLS (for building output records)
+  meta.json         featCols, nProviders, source, builtAt
+
+open_store() memory-maps X.npy, so training and scoring read it in chunks and
+several processes share one copy through the page cache. Labels are derived at
+load time from the OIG exclusions (labels()), so a new OIG file needs no rebuild.
+
+Usage:
+  from feature_store import open_store
+  store = open_store()
+  y = store.labels()['fraud']
+  for lo, hi in store.chunks(50000):
+      X = store.X[lo:hi]
+"""
+import csv, json, os, time
+import numpy as np
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+STORE_DIR = os.path.expanduser("~/.openclaw/workspace/ml/feature-store")
+OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
+
+FRAUD_EXCL_TYPES = {'1128a1', '1128a3', '1128b1', '1128b7'}
+BORDERLINE_EXCL_TYPES = {'1128a2', '1128a4', '1128b8'}
+
+FEAT_COLS = [
+    'total_paid', 'total_claims', 'total_benes', 'code_count',
+    'cost_per_claim', 'cost_per_bene', 'claims_per_bene',
+    'active_months', 'paid_per_month', 'claims_per_month',
+    'top_code_conc', 'self_bill_ratio', 'max_growth_ratio',
+    'short_burst', 'low_code_high_bill',
+    'paid_z_specialty', 'cpc_z_specialty', 'cpb_z_specialty',
+    'paid_z_state', 'cpc_z_state',
+    'peer_count',
+]
+SPECIALTY_MIN_PEERS = 5
+STATE_MIN_PEERS = 10
+
+
+def rollup_sql(source):
+    """Provider x code x month aggregate of the spending parquet, in the shape of the
+    gen23 provider_code_month rollup (the input feature_sql() expects)."""
+    return f"""
+        SELECT
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            HCPCS_CODE AS code,
+            CAST(CLAIM_FROM_MONTH AS VARCHAR) AS month,
+            -- MAX (not MODE) so feature_sql's MAX over codes and months equals MAX over raw lines
+            MAX(BILLING_PROVIDER_STATE_CD) AS state,
+            MAX(BILLING_PROVIDER_TYPE) AS specialty,
+            SUM(TOTAL_PAID) AS totalPaid,
+            SUM(TOTAL_CLAIMS) AS totalClaims,
+            SUM(TOTAL_UNIQUE_BENEFICIARIES) AS totalBeneficiaries,
+            COUNT(*) AS lines,
+            COUNT(*) FILTER (WHERE BILLING_PROVIDER_NPI_NUM = SERVICING_PROVIDER_NPI_NUM) AS selfLines
+        FROM {source}
+        GROUP BY ALL"""
+
+
+def feature_sql(source, cutoff=None):
+    """One row per billing NPI with npi, specialty, state and FEAT_COLS.
+    source is a provider x code x month table expression (rollup_sql() or the gen23
+    provider_code_month rollup); cutoff ('YYYY-MM') keeps only months before it,
+    giving features as of that month."""
+    where = f"WHERE month < '{cutoff}'" if cutoff else ''
+    return f"""
+        WITH src AS (
+            SELECT * FROM {source} {where}
+        ),
+        base AS (
+            SELECT
+                npi,
+                MAX(specialty) AS specialty,
+                MAX(state) AS state,
+                SUM(totalPaid) AS total_paid,
+                SUM(totalClaims) AS total_claims,
+                SUM(totalBeneficiaries) AS total_benes,
+                COUNT(DISTINCT code) AS code_count,
+                COUNT(DISTINCT month) AS active_months,
+                SUM(selfLines) / SUM(lines) AS self_bill_ratio
+            FROM src
+            WHERE TRY_CAST(npi AS BIGINT) IS NOT NULL
+            GROUP BY npi
+            HAVING SUM(totalPaid) > 0
+        ),
+        conc AS (
+            SELECT npi, MAX(code_paid) / NULLIF(SUM(code_paid), 0) AS top_code_conc
+            FROM (SELECT npi, SUM(totalPaid) AS code_paid FROM src GROUP BY npi, code)
+            GROUP BY npi
+        ),
+        growth AS (
+            SELECT npi, MAX(yr_paid) / NULLIF(MIN(CASE WHEN yr_paid > 100 THEN yr_paid END), 0) AS max_growth_ratio
+            FROM (SELECT npi, LEFT(month, 4) AS yr, SUM(totalPaid) AS yr_paid FROM src GROUP BY npi, yr)
+            GROUP BY npi
+        ),
+        f AS (
+            SELECT b.*, c.top_code_conc, g.max_growth_ratio,
+                b.total_paid / NULLIF(b.total_claims, 0) AS cost_per_claim,
+                b.total_paid / NULLIF(b.total_benes, 0) AS cost_per_bene,
+                b.total_claims / NULLIF(b.total_benes, 0) AS claims_per_bene,
+                b.total_paid / NULLIF(b.active_months, 0) AS paid_per_month,
+                b.total_claims / NULLIF(b.active_months, 0) AS claims_per_month
+            FROM base b LEFT JOIN conc c USING (npi) LEFT JOIN growth g USING (npi)
+        ),
+        peers AS (
+            SELECT *,
+                COUNT(*) OVER sp AS sp_n, AVG(total_paid) OVER sp AS sp_paid, STDDEV(total_paid) OVER sp AS sp_paid_sd,
+                AVG(cost_per_claim) OVER sp AS sp_cpc, STDDEV(cost_per_claim) OVER sp AS sp_cpc_sd,
+                AVG(cost_per_bene) OVER sp AS sp_cpb, STDDEV(cost_per_bene) OVER sp AS sp_cpb_sd,
+                COUNT(*) OVER st AS st_n, AVG(total_paid) OVER st AS st_paid, STDDEV(total_paid) OVER st AS st_paid_sd,
+                AVG(cost_per_claim) OVER st AS st_cpc, STDDEV(cost_per_claim) OVER st AS st_cpc_sd
+            FROM f
+            WINDOW sp AS (PARTITION BY specialty), st AS (PARTITION BY state)
+        )
+        SELECT
+            npi, specialty, state,
+            total_paid, total_claims, total_benes, code_count,
+            cost_per_claim, cost_per_bene, claims_per_bene,
+            active_months, paid_per_month, claims_per_month,
+            top_code_conc, self_bill_ratio, max_growth_ratio,
+            CASE WHEN active_months <= 12 AND total_paid > 1e6 THEN 1 ELSE 0 END AS short_burst,
+            CASE WHEN code_count <= 2 AND total_paid > 500000 THEN 1 ELSE 0 END AS low_code_high_bill,
+            CASE WHEN sp_n >= {SPECIALTY_MIN_PEERS} THEN (total_paid - sp_paid) / NULLIF(sp_paid_sd, 0) END AS paid_z_specialty,
+            CASE WHEN sp_n >= {SPECIALTY_MIN_PEERS} THEN (cost_per_claim - sp_cpc) / NULLIF(sp_cpc_sd, 0) END AS cpc_z_specialty,
+            CASE WHEN sp_n >= {SPECIALTY_MIN_PEERS} THEN (cost_per_bene - sp_cpb) / NULLIF(sp_cpb_sd, 0) END AS cpb_z_specialty,
+            CASE WHEN st_n >= {STATE_MIN_PEERS} THEN (total_paid - st_paid) / NULLIF(st_paid_sd, 0) END AS paid_z_state,
+            CASE WHEN st_n >= {STATE_MIN_PEERS} THEN (cost_per_claim - st_cpc) / NULLIF(st_cpc_sd, 0) END AS cpc_z_state,
+            CASE WHEN sp_n >= {SPECIALTY_MIN_PEERS} THEN sp_n END AS peer_count
+        FROM peers
+        ORDER BY CAST(npi AS BIGINT)"""
+
+
+def build(con, parquet=PARQUET, store_dir=STORE_DIR):
+    """Compute features with con (a duckdb_session Session) and write the store."""
+    os.makedirs(store_dir, exist_ok=True)
+    prov_path = os.path.join(store_dir, 'providers.parquet')
+    source = f"({rollup_sql(f'read_parquet({parquet!r})')})"
+    con.execute(f"COPY ({feature_sql(source)}) TO '{prov_path}.tmp' (FORMAT PARQUET)",
+                label='provider features')
+    os.replace(f'{prov_path}.tmp', prov_path)
+
+    n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [prov_path]).fetchone()[0]
+    X = np.lib.format.open_memmap(os.path.join(store_dir, 'X.npy.tmp'), mode='w+',
+                                  dtype=np.float32, shape=(n, len(FEAT_COLS)))
+    for j, col in enumerate(FEAT_COLS):  # one column in memory at a time
+        v = con.execute(f"SELECT CAST({col} AS DOUBLE) AS v FROM read_parquet(?) ORDER BY CAST(npi AS BIGINT)",
+                        [prov_path]).fetchnumpy()['v']
+        v = np.ma.filled(v, np.nan) if np.ma.isMaskedArray(v) else v
+        X[:, j] = np.nan_to_num(v.astype(np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    X.flush()
+    del X
+    os.replace(os.path.join(store_dir, 'X.npy.tmp'), os.path.join(store_dir, 'X.npy'))
+    npis = con.execute("SELECT CAST(npi AS BIGINT) AS npi FROM read_parquet(?) ORDER BY CAST(npi AS BIGINT)",
+                       [prov_path]).fetchnumpy()['npi']
+    np.save(os.path.join(store_dir, 'npi.npy'), np.asarray(npis, dtype=np.int64))
+
+    meta = {'featCols': FEAT_COLS, 'nProviders': int(n), 'source': parquet,
+            'builtAt': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    with open(os.path.join(store_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def signed_log1p(X):
+    """sign(x) * log(1 + |x|): compresses the dollar and count columns (8+ orders of
+    magnitude) for models that are not scale-invariant."""
+    return np.sign(X) * np.log1p(np.abs(X))
+
+
+def load_oig(path=OIG_CSV):
+    """{npi: (set of exclusion types, earliest exclusion month 'YYYY-MM' or None)} for OIG rows with a valid NPI."""
+    out = {}
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            npi = row.get('NPI', '').strip()
+            if npi and len(npi) == 10 and npi.isdigit() and npi != '0000000000':
+                types, month = out.get(npi, (set(), None))
+                types.add(row.get('EXCLTYPE', '').strip().strip('"'))
+                date = row.get('EXCLDATE', '').strip()  # YYYYMMDD
+                if date[:6].isdigit():
+                    month = min(month or '9999-99', f"{date[:4]}-{date[4:6]}")
+                out[npi] = (types, month)
+    return out
+
+
+class Store:
+    def __init__(self, store_dir=STORE_DIR):
+        meta_path = os.path.join(store_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise SystemExit(f"No feature store in {store_dir}; run scripts/ml-build-feature-store.py first")
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        if self.meta['featCols'] != FEAT_COLS:
+            raise SystemExit(f"Feature store in {store_dir} has different columns; rebuild it")
+        self.dir = store_dir
+        self.feat_cols = self.meta['featCols']
+        self.X = np.load(os.path.join(store_dir, 'X.npy'), mmap_mode='r')
+        self.npi = np.load(os.path.join(store_dir, 'npi.npy'))
+        self.providers_path = os.path.join(store_dir, 'providers.parquet')
+        self._labels = None
+
+    def __len__(self):
+        return len(self.npi)
+
+    def chunks(self, size):
+        for lo in range(0, len(self), size):
+            yield lo, min(lo + size, len(self))
+
+    def labels(self, oig_csv=OIG_CSV):
+        """fraud / borderline / any (int8 arrays aligned with npi) and excl_year (float, NaN if none)."""
+        if self._labels is None:
+            oig = load_oig(oig_csv)
+            fraud = np.zeros(len(self), np.int8)
+            border = np.zeros(len(self), np.int8)
+            any_ = np.zeros(len(self), np.int8)
+            year = np.full(len(self), np.nan)
+            pos = np.searchsorted(self.npi, np.array([int(n) for n in oig], dtype=np.int64))
+            for (npi, (types, emonth)), i in zip(oig.items(), pos):
+                if i < len(self) and self.npi[i] == int(npi):
+                    any_[i] = 1
+                    fraud[i] = bool(types & FRAUD_EXCL_TYPES)
+                    border[i] = not fraud[i] and bool(types & BORDERLINE_EXCL_TYPES)
+                    if emonth is not None:
+                        year[i] = int(emonth[:4])
+            self._labels = {'fraud': fraud, 'borderline': border, 'any': any_, 'excl_year': year}
+        return self._labels
+
+    def npi_str(self, i):
+        return f"{int(self.npi[i]):010d}"
+
+
+def open_store(store_dir=STORE_DIR):
+    return Store(store_dir)
@@ -5,47 +5,13 @@ import json
 import csv
 import os
 import re
+from name_utils import clean_city, clean_name
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 REF = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data")
 OUT = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
 
-# --- TITLE CASE HELPER ---
-SMALL_WORDS = {'of', 'the', 'and', 'in', 'for', 'to', 'a', 'an', 'at', 'by', 'or', 'on', 'is', 'with'}
-KEEP_UPPER = {'LLC', 'INC', 'LP', 'LLP', 'PC', 'PA', 'MD', 'DO', 'DDS', 'DMD', 'PhD', 'RN',
-              'NP', 'PLLC', 'DPM', 'OD', 'PT', 'II', 'III', 'IV', 'VA', 'NY', 'CA', 'TX',
-              'FL', 'IL', 'OH', 'MI', 'NJ', 'NC', 'MA', 'WA', 'CO', 'MN', 'OR', 'WI', 'CT',
-              'SC', 'AL', 'KY', 'OK', 'IA', 'AR', 'MS', 'KS', 'NV', 'NM', 'NE', 'WV', 'ID',
-              'HI', 'NH', 'ME', 'MT', 'RI', 'DE', 'SD', 'ND', 'AK', 'VT', 'WY', 'DC', 'PR',
-              'DDS', 'HHS', 'DHHS', 'PHS', 'IHS', 'DPH', 'USA', 'US', 'CDC'}
-
-def title_case(s):
-    if not s:
-        return s
-    words = s.split()
-    result = []
-    for i, w in enumerate(words):
-        upper = w.upper()
-        if upper in KEEP_UPPER:
-            result.append(upper)
-        elif i > 0 and w.lower() in SMALL_WORDS:
-            result.append(w.lower())
-        else:
-            # Title case but preserve internal caps like "McDonald"
-            result.append(w.capitalize())
-        # Handle hyphenated words
-    return ' '.join(result)
-
-def clean_city(city):
-    if not city:
-        return city
-    return title_case(city)
-
-def clean_name(name):
-    if not name:
-        return name
-    return title_case(name)
-
 # --- LOAD EXISTING DATA ---
 print("Loading NPI lookups...")
 npi_info = {}
@@ -116,8 +82,7 @@ for fname in files:
         changed = True
     
     if changed:
-        with open(path, 'w') as f:
-            json.dump(data, f)
+        write_json(path, data)
         fixed += 1
 
 print(f"  Updated {fixed} provider files, enriched {enriched} procedure entries")
@@ -131,8 +96,7 @@ for p in top_provs:
         p['name'] = clean_name(p['name'])
     if p.get('city'):
         p['city'] = clean_city(p['city'])
-with open(os.path.join(OUT, 'top-providers-1000.json'), 'w') as f:
-    json.dump(top_provs, f)
+write_json(os.path.join(OUT, 'top-providers-1000.json'), top_provs)
 
 # Also clean top-providers.json (the original 50)
 if os.path.exists(os.path.join(OUT, 'top-providers.json')):
@@ -143,8 +107,7 @@ if os.path.exists(os.path.join(OUT, 'top-providers.json')):
             p['name'] = clean_name(p['name'])
         if p.get('city'):
             p['city'] = clean_city(p['city'])
-    with open(os.path.join(OUT, 'top-providers.json'), 'w') as f:
-        json.dump(tp, f)
+    write_json(os.path.join(OUT, 'top-providers.json'), tp)
 
 # --- CLEAN WATCHLIST ---
 print("Cleaning watchlist files...")
@@ -158,8 +121,7 @@ for wl_file in ['watchlist.json', 'expanded-watchlist.json']:
                 p['name'] = clean_name(p['name'])
             if p.get('city'):
                 p['city'] = clean_city(p['city'])
-        with open(path, 'w') as f:
-            json.dump(wl, f)
+        write_json(path, wl)
 
 # --- CLEAN STATE FILES ---
 print("Cleaning state data files...")
@@ -177,8 +139,7 @@ if os.path.exists(state_dir):
                     p['name'] = clean_name(p['name'])
                 if p.get('city'):
                     p['city'] = clean_city(p['city'])
-        with open(path, 'w') as f:
-            json.dump(data, f)
+        write_json(path, data)
 
 # --- CLEAN VIRAL DATA FILES ---
 print("Cleaning viral data files...")
@@ -193,7 +154,6 @@ for viral_file in ['covid-vaccine-top-billers.json', 'covid-testing-top-billers.
                 p['name'] = clean_name(p['name'])
             if p.get('city'):
                 p['city'] = clean_city(p['city'])
-        with open(path, 'w') as f:
-            json.dump(data, f)
+        write_json(path, data)
 
 print("\nDone with cleaning and enrichment!")
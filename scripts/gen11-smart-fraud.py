@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """Smarter fraud detection: compare to code-specific benchmarks, find swings, new entrants."""
-import duckdb
+from duckdb_session import connect
 import json
 import csv
 import os
 from collections import defaultdict
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
 REF = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/npi_lookups_expanded.csv")
 
-con = duckdb.connect()
+con = connect('scan')
 
 # Load NPI info
 npi_info = {}
@@ -247,14 +248,12 @@ for npi, data in flag_by_npi.items():
 
 smart_watchlist.sort(key=lambda x: (-x['flagCount'], -x['totalPaid']))
 
-with open(os.path.join(OUT, 'smart-watchlist.json'), 'w') as f:
-    json.dump(smart_watchlist, f)
+write_json(os.path.join(OUT, 'smart-watchlist.json'), smart_watchlist)
 
 # Save per-test results
 for name, flags in [('code-outliers', code_outlier_flags), ('billing-swings', swing_flags),
                      ('new-entrants', new_entrant_flags), ('rate-outliers', rate_flags)]:
-    with open(os.path.join(OUT, f'fraud-{name}.json'), 'w') as f:
-        json.dump(flags, f)
+    write_json(os.path.join(OUT, f'fraud-{name}.json'), flags)
 
 multi = sum(1 for p in smart_watchlist if p['flagCount'] >= 2)
 triple = sum(1 for p in smart_watchlist if p['flagCount'] >= 3)
@@ -1,21 +1,19 @@
 #!/usr/bin/env python3
 """Look up missing NPI names and enrich all watchlists + generate provider detail files."""
 import json
-import csv
 import os
 import time
 import urllib.request
-import duckdb
+from duckdb_session import connect
+from jsonout import write_json
+from npi_lookups import read_lookups, write_lookups
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 REF = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data")
 OUT = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
 
 # Load existing NPI lookups
-existing = {}
-with open(os.path.join(REF, 'npi_lookups_expanded.csv')) as f:
-    for row in csv.DictReader(f):
-        existing[row['npi']] = row
+existing, fields = read_lookups(os.path.join(REF, 'npi_lookups_expanded.csv'))
 
 # Collect all NPIs that need lookup from watchlists
 missing_npis = set()
@@ -67,11 +65,12 @@ for i, npi in enumerate(missing_npis):
             addr = next((a for a in addresses if a.get('address_purpose') == 'LOCATION'), addresses[0] if addresses else {})
             city = addr.get('city', '')
             state = addr.get('state', '')
+            zip5 = addr.get('postal_code', '')[:5]
             taxonomies = result.get('taxonomies', [])
             taxonomy = taxonomies[0].get('desc', '') if taxonomies else ''
             
             row = {'npi': npi, 'provider_name': name, 'entity_type': entity,
-                   'taxonomy_description': taxonomy, 'city': city, 'state': state}
+                   'taxonomy_description': taxonomy, 'city': city, 'state': state, 'zip': zip5}
         else:
             row = {'npi': npi, 'provider_name': '', 'entity_type': '', 
                    'taxonomy_description': '', 'city': '', 'state': ''}
@@ -89,12 +88,7 @@ for i, npi in enumerate(missing_npis):
 
 # Save updated CSV
 print(f"Saving {len(existing)} total NPI lookups...")
-fieldnames = ['npi', 'provider_name', 'entity_type', 'taxonomy_description', 'city', 'state']
-with open(os.path.join(REF, 'npi_lookups_expanded.csv'), 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    for npi, row in existing.items():
-        writer.writerow({k: row.get(k, '') for k in fieldnames})
+write_lookups(os.path.join(REF, 'npi_lookups_expanded.csv'), existing, fields)
 
 # Title case helper
 KEEP_UPPER = {'LLC','INC','LP','LLP','PC','PA','MD','DO','DDS','DMD','PhD','RN','NP','PLLC',
@@ -117,7 +111,7 @@ def title_case(s):
 print("Enriching watchlist files with names...")
 
 # Get spending data for all flagged NPIs
-con = duckdb.connect()
+con = connect('scan')
 all_flagged_npis = set()
 for wl_file in ['expanded-watchlist.json', 'smart-watchlist.json']:
     with open(os.path.join(OUT, wl_file)) as f:
@@ -159,8 +153,7 @@ for p in ew:
     p['totalPaid'] = spend.get('totalPaid', 0)
     p['totalClaims'] = spend.get('totalClaims', 0)
     p['totalBenes'] = spend.get('totalBenes', 0)
-with open(os.path.join(OUT, 'expanded-watchlist.json'), 'w') as f:
-    json.dump(ew, f)
+write_json(os.path.join(OUT, 'expanded-watchlist.json'), ew)
 
 # Update smart watchlist
 with open(os.path.join(OUT, 'smart-watchlist.json')) as f:
@@ -179,8 +172,7 @@ for p in sw:
         p['state'] = info.get('state', '')
     if not p.get('totalPaid') or p['totalPaid'] == 0:
         p['totalPaid'] = spend.get('totalPaid', 0)
-with open(os.path.join(OUT, 'smart-watchlist.json'), 'w') as f:
-    json.dump(sw, f)
+write_json(os.path.join(OUT, 'smart-watchlist.json'), sw)
 
 # Also generate minimal provider detail files for flagged NPIs that don't have one
 provider_dir = os.path.join(OUT, 'providers')
@@ -203,8 +195,7 @@ for npi in all_flagged_npis:
             'flags': [],
             'limited': True
         }
-        with open(os.path.join(provider_dir, f'{npi}.json'), 'w') as f:
-            json.dump(detail, f)
+        write_json(os.path.join(provider_dir, f'{npi}.json'), detail)
         created += 1
 
 print(f"Created {created} new provider detail files for flagged NPIs")
@@ -4,6 +4,7 @@ Generate auto-narratives for provider detail pages.
 Creates plain-English analysis paragraphs for each provider based on their data.
 """
 import json, os, glob
+from jsonout import write_json
 
 BASE = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
 BENCHMARKS_FILE = os.path.join(BASE, "code-benchmarks.json")
@@ -207,8 +208,7 @@ for filepath in files:
     narrative = generate_narrative(p)
     if narrative:
         p['narrative'] = narrative
-        with open(filepath, 'w') as f:
-            json.dump(p, f)
+        write_json(filepath, p)
         updated += 1
 
 print(f"Generated narratives for {updated} of {len(files)} providers")
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Generate provider detail pages for ML top-200 flagged providers."""
-import duckdb, json, os, csv, time, urllib.request
+import json, os, time, urllib.request
+from duckdb_session import connect
+from jsonout import write_json
+from npi_lookups import read_lookups, write_lookups
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 BASE = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
@@ -8,10 +11,7 @@ NPI_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/npi
 BENCHMARKS = os.path.join(BASE, "code-benchmarks.json")
 
 # Load existing NPI names
-npi_names = {}
-with open(NPI_CSV) as f:
-    for row in csv.DictReader(f):
-        npi_names[row['npi']] = row
+npi_names, npi_fields = read_lookups(NPI_CSV)
 
 # Load ML scores
 with open(os.path.join(BASE, "ml-scores.json")) as f:
@@ -63,7 +63,8 @@ for i, npi in enumerate(unknown):
             npi_names[npi] = {
                 'npi': npi, 'provider_name': name,
                 'taxonomy_description': taxs[0].get('desc','') if taxs else '',
-                'city': addr.get('city',''), 'state': addr.get('state','')
+                'city': addr.get('city',''), 'state': addr.get('state',''),
+                'zip': addr.get('postal_code','')[:5]
             }
         time.sleep(0.15)
     except:
@@ -71,15 +72,10 @@ for i, npi in enumerate(unknown):
 
 # Save updated NPI lookups
 print("Saving updated NPI lookups...")
-fieldnames = ['npi', 'provider_name', 'entity_type', 'taxonomy_description', 'city', 'state']
-with open(NPI_CSV, 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in npi_names.values():
-        writer.writerow({k: row.get(k,'') for k in fieldnames})
+write_lookups(NPI_CSV, npi_names, npi_fields)
 
 # Query detailed data
-con = duckdb.connect()
+con = connect('scan')
 npi_list = ','.join(f"'{n}'" for n in need_pages)
 
 print("Querying billing data...")
@@ -157,8 +153,7 @@ for npi in need_pages:
         provider["costPerBeneficiary"] = round(tp / tb, 2)
         provider["claimsPerBeneficiary"] = round(tc / tb, 1)
     
-    with open(os.path.join(BASE, "providers", f"{npi}.json"), 'w') as f:
-        json.dump(provider, f)
+    write_json(os.path.join(BASE, "providers", f"{npi}.json"), provider)
     created += 1
 
 print(f"Created {created} provider detail pages")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Generate provider detail pages for ML v2 flagged providers that don't have pages yet."""
-import json, os, csv, sys
+import os, csv, sys
 sys.path.insert(0, os.path.dirname(__file__))
 
 PROJ = os.path.expanduser("~/Projects/medicaid-tracker-app")
@@ -21,8 +21,9 @@ with open(NPI_CSV) as f:
         npi_info[row['npi']] = row
 
 # Query parquet for these NPIs
-import duckdb
-con = duckdb.connect()
+from duckdb_session import connect
+from jsonout import write_json
+con = connect('scan')
 
 # Process in batches of 50 to avoid memory issues
 BATCH = 50
@@ -144,8 +145,7 @@ for i in range(0, len(missing_npis), BATCH):
         }
         
         out_path = os.path.join(PROVIDERS_DIR, f"{npi}.json")
-        with open(out_path, 'w') as f:
-            json.dump(provider, f, indent=2)
+        write_json(out_path, provider)
         generated += 1
     
     print(f"  Batch {i//BATCH + 1}: generated {len(batch)} pages ({generated} total)")
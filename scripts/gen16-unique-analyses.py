@@ -7,11 +7,13 @@ Unique analyses nobody else is doing:
 4. Code Migration — providers who changed what they bill
 5. Dual-Billing Pattern Detection — equal claim counts across codes
 """
-import duckdb, json, os
+import os
+from duckdb_session import connect
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
-con = duckdb.connect()
+con = connect('scan')
 
 #############################################
 # ANALYSIS 1: BILLING NETWORKS
@@ -84,8 +86,7 @@ billing_network_output = {
     }
 }
 
-with open(f"{OUT}/billing-networks.json", 'w') as f:
-    json.dump(billing_network_output, f, indent=2)
+write_json(f"{OUT}/billing-networks.json", billing_network_output)
 print(f"  Top network: {network_data[0]['billingNpi']} bills for {network_data[0]['servicingProviderCount']} providers (${network_data[0]['totalPaid']:,.0f})")
 print(f"  Ghost billers (bill but never service): {ghost_billers:,}")
 print(f"  Ghost servicers (service but never bill): {ghost_servicers:,}")
@@ -173,8 +174,7 @@ consistency_output = {
     "mostVolatile": volatile_billers,
     "explanation": "Coefficient of Variation (CV) measures how uniform billing is. CV < 0.05 means less than 5% monthly variation — suspiciously smooth. Real medical practices typically have CV of 0.15-0.40."
 }
-with open(f"{OUT}/billing-consistency.json", 'w') as f:
-    json.dump(consistency_output, f, indent=2)
+write_json(f"{OUT}/billing-consistency.json", consistency_output)
 print(f"  Suspiciously smooth billers (CV<0.05): {len(smooth_billers)}")
 print(f"  Most volatile billers (CV>2.0): {len(volatile_billers)}")
 
@@ -211,8 +211,7 @@ monopolies = con.execute(f"""
 monopoly_data = [{"npi": str(r[0]), "code": r[1], "providerPaid": float(r[2]),
     "codeTotalSpending": float(r[3]), "marketShare": round(float(r[4]), 4)} for r in monopolies]
 
-with open(f"{OUT}/code-monopolies.json", 'w') as f:
-    json.dump(monopoly_data, f, indent=2)
+write_json(f"{OUT}/code-monopolies.json", monopoly_data)
 print(f"  Monopolies found (>25% market share): {len(monopoly_data)}")
 if monopoly_data:
     print(f"  Top: NPI {monopoly_data[0]['npi']} controls {monopoly_data[0]['marketShare']*100:.1f}% of {monopoly_data[0]['code']} (${monopoly_data[0]['providerPaid']:,.0f})")
@@ -263,8 +262,7 @@ migrations = con.execute(f"""
 migration_data = [{"npi": str(r[0]), "earlyTopCode": r[1], "earlyPaid": float(r[2]),
     "lateTopCode": r[3], "latePaid": float(r[4]), "totalPaid": float(r[5])} for r in migrations]
 
-with open(f"{OUT}/code-migrations.json", 'w') as f:
-    json.dump(migration_data, f, indent=2)
+write_json(f"{OUT}/code-migrations.json", migration_data)
 print(f"  Providers who changed primary code: {len(migration_data)}")
 
 #############################################
@@ -300,8 +298,7 @@ dual_data = [{"npi": str(r[0]), "code1": r[1], "claims1": int(r[2]), "paid1": fl
     "code2": r[4], "claims2": int(r[5]), "paid2": float(r[6]),
     "claimDiffPct": round(float(r[7])*100, 2), "combinedPaid": float(r[8])} for r in dual_billing]
 
-with open(f"{OUT}/dual-billing.json", 'w') as f:
-    json.dump(dual_data, f, indent=2)
+write_json(f"{OUT}/dual-billing.json", dual_data)
 print(f"  Dual-billing patterns found: {len(dual_data)}")
 if dual_data:
     d = dual_data[0]
@@ -2,11 +2,12 @@
 """
 Generate provider detail JSON files for top 10,000 providers by total spending.
 Also generates an expanded top-providers list.
-Uses DuckDB to query parquet in small batches to avoid OOM.
+Queries the parquet in batches sized from measured DuckDB memory (duckdb_session).
 """
-import duckdb
 import json
 import os
+from jsonout import write_json
+from duckdb_session import connect
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "public", "data", "providers")
 TOP_FILE = os.path.join(os.path.dirname(__file__), "..", "public", "data", "top-providers-expanded.json")
@@ -14,7 +15,7 @@ os.makedirs(OUT_DIR, exist_ok=True)
 
 # Step 1: Get top 10,000 providers by total spending
 print("Step 1: Finding top 10,000 providers...")
-con = duckdb.connect()
+con = connect('batch')
 top_providers = con.execute(f"""
     SELECT 
         BILLING_PROVIDER_NPI_NUM as npi,
@@ -27,8 +28,7 @@ top_providers = con.execute(f"""
     GROUP BY BILLING_PROVIDER_NPI_NUM
     ORDER BY total_paid DESC
     LIMIT 10000
-""").fetchall()
-con.close()
+""", label='top 10,000 providers').fetchall()
 print(f"Found {len(top_providers)} providers")
 
 # Check which already have detail files
@@ -39,17 +39,14 @@ need_details = [(npi, tp, tc, tb, uc, am) for npi, tp, tc, tb, uc, am in top_pro
 print(f"Need to generate: {len(need_details)} new detail files")
 
 # Step 2: For each provider needing details, query their procedure breakdown
-BATCH_SIZE = 100
 generated = 0
 
-for batch_start in range(0, len(need_details), BATCH_SIZE):
-    batch = need_details[batch_start:batch_start + BATCH_SIZE]
+for batch_num, batch in enumerate(con.batches(need_details, initial=100), 1):
     npis = [str(row[0]) for row in batch]
     npi_list = ",".join(f"'{n}'" for n in npis)
     
-    print(f"Batch {batch_start//BATCH_SIZE + 1}: querying {len(batch)} providers...")
+    print(f"Batch {batch_num}: querying {len(batch)} providers...")
     
-    con = duckdb.connect()
     # Get procedure breakdown for this batch
     rows = con.execute(f"""
         SELECT 
@@ -62,7 +59,7 @@ for batch_start in range(0, len(need_details), BATCH_SIZE):
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY BILLING_PROVIDER_NPI_NUM, HCPCS_CODE
         ORDER BY BILLING_PROVIDER_NPI_NUM, paid DESC
-    """).fetchall()
+    """, label='procedures').fetchall()
     
     # Get monthly trends for this batch
     monthly = con.execute(f"""
@@ -75,8 +72,7 @@ for batch_start in range(0, len(need_details), BATCH_SIZE):
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY BILLING_PROVIDER_NPI_NUM, CLAIM_FROM_MONTH
         ORDER BY BILLING_PROVIDER_NPI_NUM, month
-    """).fetchall()
-    con.close()
+    """, label='monthly').fetchall()
     
     # Group by NPI
     proc_by_npi = {}
@@ -114,11 +110,11 @@ for batch_start in range(0, len(need_details), BATCH_SIZE):
         }
         
         out_path = os.path.join(OUT_DIR, f"{npi}.json")
-        with open(out_path, 'w') as f:
-            json.dump(detail, f, separators=(',', ':'))
+        write_json(out_path, detail)
         generated += 1
     
     print(f"  Generated {generated} files so far")
+con.close()
 
 # Step 3: Build expanded top providers list (for the provider listing page)
 print("\nStep 3: Building expanded top providers list...")
@@ -153,8 +149,7 @@ for npi, tp, tc, tb, uc, am in top_providers[:5000]:  # top 5000 for listing
         "uniqueCodes": int(uc)
     })
 
-with open(TOP_FILE, 'w') as f:
-    json.dump(top_list, f, separators=(',', ':'))
+write_json(TOP_FILE, top_list)
 print(f"Wrote {len(top_list)} providers to top-providers-expanded.json")
 
 print(f"\nDone! Generated {generated} new detail files. Total detail files: {len(os.listdir(OUT_DIR))}")
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Generate data for new insight articles and features."""
-import duckdb
+from duckdb_session import connect
 import json
 import os
 import csv
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
@@ -21,7 +22,7 @@ if os.path.exists(REF):
                 'specialty': row.get('specialty','')
             }
 
-con = duckdb.connect()
+con = connect('scan')
 
 # 1. Arizona new entrants analysis
 print("1. Arizona new entrants...")
@@ -75,8 +76,7 @@ for row in az_new:
 az_only = [e for e in az_entries if e['state'] == 'AZ']
 print(f"  AZ new entrants >$1M: {len(az_only)}")
 
-with open(f"{OUT}/az-new-entrants.json", 'w') as f:
-    json.dump(az_only[:100], f)
+write_json(f"{OUT}/az-new-entrants.json", az_only[:100])
 
 # 2. NY Home Care analysis
 print("2. NY Home Care providers...")
@@ -113,8 +113,7 @@ for row in ny_home:
 ny_only = [e for e in ny_home_entries if e['state'] == 'NY']
 print(f"  NY home care providers >$10M: {len(ny_only)}")
 
-with open(f"{OUT}/ny-home-care.json", 'w') as f:
-    json.dump(ny_home_entries[:100], f)
+write_json(f"{OUT}/ny-home-care.json", ny_home_entries[:100])
 
 # 3. Top beneficiary counts
 print("3. Top beneficiary counts...")
@@ -151,8 +150,7 @@ for row in top_benes:
 
 print(f"  Top beneficiary provider: {bene_entries[0]['name']} ({bene_entries[0]['totalBenes']:,} benes)")
 
-with open(f"{OUT}/top-beneficiary-counts.json", 'w') as f:
-    json.dump(bene_entries, f)
+write_json(f"{OUT}/top-beneficiary-counts.json", bene_entries)
 
 # 4. Specialty pharma deep dive (J-codes)
 print("4. Specialty pharma J-codes...")
@@ -184,8 +182,7 @@ for row in jcodes:
 
 print(f"  J-codes >$1K/claim: {len(jcode_entries)}")
 
-with open(f"{OUT}/specialty-pharma.json", 'w') as f:
-    json.dump(jcode_entries, f)
+write_json(f"{OUT}/specialty-pharma.json", jcode_entries)
 
 # 5. State-level flagged provider counts (for heat map)
 print("5. State flagged provider counts...")
@@ -227,8 +224,7 @@ if os.path.exists(ml_path):
 state_flag_list = [{'state': k, **v, 'total': v['stat'] + v['ml']} for k, v in state_flags.items() if k and k != 'Unknown']
 state_flag_list.sort(key=lambda x: x['total'], reverse=True)
 
-with open(f"{OUT}/state-flag-counts.json", 'w') as f:
-    json.dump(state_flag_list, f)
+write_json(f"{OUT}/state-flag-counts.json", state_flag_list)
 
 print(f"  States with flags: {len(state_flag_list)}")
 print(f"  Top: {state_flag_list[0]['state']} ({state_flag_list[0]['total']} flags)")
@@ -267,37 +263,10 @@ for npi in list(flagged_npis)[:200]:  # Top 200 for timeline
             pass
 
 timeline_data.sort(key=lambda x: x.get('totalPaid', 0), reverse=True)
-with open(f"{OUT}/provider-timelines.json", 'w') as f:
-    json.dump(timeline_data[:100], f)
+write_json(f"{OUT}/provider-timelines.json", timeline_data[:100])
 
 print(f"  Timeline entries: {len(timeline_data)}")
 
-# 7. Spending by specialty (for charts)
-print("7. Spending by specialty...")
-# Load from existing provider data
-specialty_totals = {}
-stats_path = f"{OUT}/stats.json"
-if os.path.exists(stats_path):
-    with open(stats_path) as f:
-        stats = json.load(f)
-
-# Get from top providers
-top_providers_path = f"{OUT}/top-providers.json"
-if os.path.exists(top_providers_path):
-    with open(top_providers_path) as f:
-        for p in json.load(f):
-            spec = p.get('specialty', 'Unknown')
-            if spec not in specialty_totals:
-                specialty_totals[spec] = {'count': 0, 'totalPaid': 0}
-            specialty_totals[spec]['count'] += 1
-            specialty_totals[spec]['totalPaid'] += p.get('totalPaid', 0)
-
-spec_list = [{'specialty': k, **v} for k, v in specialty_totals.items()]
-spec_list.sort(key=lambda x: x['totalPaid'], reverse=True)
-
-with open(f"{OUT}/specialty-spending.json", 'w') as f:
-    json.dump(spec_list[:30], f)
-
-print(f"  Specialties: {len(spec_list)}")
+# 7. Spending by specialty: specialty-spending.json now comes from gen22-specialty-cube.py
 
 print("\nDone! All new data files generated.")
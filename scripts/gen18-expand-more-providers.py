@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """
 Generate provider detail JSON files for providers ranked 10,001-30,000 by spending.
-Processes in small batches of 50 to avoid OOM on 16GB Mac.
+Batch sizes follow measured DuckDB memory (duckdb_session) instead of a fixed 50.
 """
-import duckdb, json, os
+import os
+from jsonout import write_json
+from duckdb_session import connect
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "public", "data", "providers")
@@ -14,7 +16,7 @@ print(f"Existing detail files: {len(existing)}")
 
 # Step 1: Get providers ranked 10,001-30,000 by total spending
 print("Finding providers ranked 10,001-30,000...")
-con = duckdb.connect()
+con = connect('batch')
 providers = con.execute(f"""
     SELECT 
         BILLING_PROVIDER_NPI_NUM as npi,
@@ -27,24 +29,20 @@ providers = con.execute(f"""
     GROUP BY BILLING_PROVIDER_NPI_NUM
     ORDER BY total_paid DESC
     LIMIT 30000 OFFSET 10000
-""").fetchall()
-con.close()
+""", label='providers ranked 10,001-30,000').fetchall()
 print(f"Found {len(providers)} providers in rank range")
 
 # Filter out those we already have
 need = [(npi, tp, tc, tb, uc, am) for npi, tp, tc, tb, uc, am in providers if str(npi) not in existing]
 print(f"Need to generate: {len(need)} new detail files")
 
-# Step 2: Process in batches of 50
-BATCH = 50
+# Step 2: Process in memory-sized batches
 generated = 0
 
-for i in range(0, len(need), BATCH):
-    batch = need[i:i+BATCH]
+for batch_num, batch in enumerate(con.batches(need, initial=50)):
     npis = [str(r[0]) for r in batch]
     npi_list = ",".join(f"'{n}'" for n in npis)
     
-    con = duckdb.connect()
     # Procedure breakdown
     rows = con.execute(f"""
         SELECT BILLING_PROVIDER_NPI_NUM, HCPCS_CODE,
@@ -53,7 +51,7 @@ for i in range(0, len(need), BATCH):
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY 1, 2
         ORDER BY 1, 3 DESC
-    """).fetchall()
+    """, label='procedures').fetchall()
     
     # Monthly trends
     monthly = con.execute(f"""
@@ -63,8 +61,7 @@ for i in range(0, len(need), BATCH):
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY 1, 2
         ORDER BY 1, 2
-    """).fetchall()
-    con.close()
+    """, label='monthly').fetchall()
     
     # Group
     proc_by = {}
@@ -91,11 +88,11 @@ for i in range(0, len(need), BATCH):
             "procedures": proc_by.get(npi, [])[:30],
             "monthlyTrend": month_by.get(npi, [])
         }
-        with open(os.path.join(OUT_DIR, f"{npi}.json"), 'w') as f:
-            json.dump(detail, f, separators=(',', ':'))
+        write_json(os.path.join(OUT_DIR, f"{npi}.json"), detail)
         generated += 1
     
-    if (i // BATCH) % 20 == 0:
+    if batch_num % 20 == 0:
         print(f"  Progress: {generated}/{len(need)} ({generated*100//max(len(need),1)}%)")
 
+con.close()
 print(f"\nDone! Generated {generated} new files. Total: {len(os.listdir(OUT_DIR))}")
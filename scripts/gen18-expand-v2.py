@@ -2,9 +2,12 @@
 """
 Expand provider detail files. Two-step approach to avoid OOM:
 Step 1: DuckDB → CSV of top 30K providers (aggregate only)
-Step 2: For each new NPI, query procedure/monthly data in small batches
+Step 2: For each new NPI, query procedure/monthly data in batches sized from
+        measured DuckDB memory (duckdb_session)
 """
-import duckdb, json, os, csv
+import os, csv
+from jsonout import write_json
+from duckdb_session import connect
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "public", "data", "providers")
@@ -16,7 +19,7 @@ print(f"Existing detail files: {len(existing)}")
 
 # Step 1: Export top 30K NPIs to CSV
 print("Step 1: Exporting top 30K providers to CSV...")
-con = duckdb.connect()
+con = connect('batch')
 con.execute(f"""
     COPY (
         SELECT 
@@ -31,8 +34,7 @@ con.execute(f"""
         ORDER BY 2 DESC
         LIMIT 30000
     ) TO '{TMP_CSV}' (HEADER, DELIMITER ',')
-""")
-con.close()
+""", label='top 30K providers')
 print(f"Exported to {TMP_CSV}")
 
 # Read CSV and find new NPIs
@@ -45,23 +47,20 @@ with open(TMP_CSV) as f:
 
 print(f"Need to generate: {len(need)} new detail files")
 
-# Step 2: Process in batches of 50
-BATCH = 50
+# Step 2: Process in memory-sized batches
 generated = 0
 
-for i in range(0, len(need), BATCH):
-    batch = need[i:i+BATCH]
+for batch_num, batch in enumerate(con.batches(need, initial=50)):
     npis = [r['npi'] for r in batch]
     npi_list = ",".join(f"'{n}'" for n in npis)
     
-    con = duckdb.connect()
     rows = con.execute(f"""
         SELECT BILLING_PROVIDER_NPI_NUM, HCPCS_CODE,
                SUM(TOTAL_PAID), SUM(TOTAL_CLAIMS), SUM(TOTAL_UNIQUE_BENEFICIARIES)
         FROM read_parquet('{PARQUET}')
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY 1, 2 ORDER BY 1, 3 DESC
-    """).fetchall()
+    """, label='procedures').fetchall()
     
     monthly = con.execute(f"""
         SELECT BILLING_PROVIDER_NPI_NUM, CLAIM_FROM_MONTH,
@@ -69,8 +68,7 @@ for i in range(0, len(need), BATCH):
         FROM read_parquet('{PARQUET}')
         WHERE BILLING_PROVIDER_NPI_NUM IN ({npi_list})
         GROUP BY 1, 2 ORDER BY 1, 2
-    """).fetchall()
-    con.close()
+    """, label='monthly').fetchall()
     
     proc_by = {}
     for npi, code, paid, claims, bene in rows:
@@ -97,11 +95,11 @@ for i in range(0, len(need), BATCH):
             "procedures": proc_by.get(npi, [])[:30],
             "monthlyTrend": month_by.get(npi, [])
         }
-        with open(os.path.join(OUT_DIR, f"{npi}.json"), 'w') as f:
-            json.dump(detail, f, separators=(',', ':'))
+        write_json(os.path.join(OUT_DIR, f"{npi}.json"), detail)
         generated += 1
     
-    if (i // BATCH) % 10 == 0:
+    if batch_num % 10 == 0:
         print(f"  Progress: {generated}/{len(need)} files")
 
+con.close()
 print(f"\nDone! Generated {generated} new files. Total: {len(os.listdir(OUT_DIR))}")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benford's-law screening of TOTAL_PAID for every billing NPI.
+
+One DuckDB aggregation extracts the first and second significant digit of each
+payment row in SQL and counts them per provider. Conformity (MAD and
+chi-squared against Benford's expected frequencies) is then computed for all
+providers at once as NumPy matrix operations, so the cost is one parquet scan
+regardless of how many providers qualify.
+
+Thresholds are configured per NPPES entity type (NPI-1 individuals, NPI-2
+organizations). Organizations bill from fee schedules far more often, so they
+get a higher row minimum before a nonconforming distribution counts.
+
+Output: public/data/benford-flags.json, the MAX_FLAGS nonconforming providers
+with the largest first-digit chi-squared, in that order (the order and count
+src/app/insights/benford-analysis/page.tsx presents). claimCount is
+SUM(TOTAL_CLAIMS); paymentRows is the number of payment rows tested.
+Run: python3 scripts/gen19-benford.py
+Requires: duckdb, numpy
+"""
+import os, csv
+from duckdb_session import connect
+import numpy as np
+from jsonout import write_json
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+
+# Per entity type: minimum payment rows before a provider is tested, and the
+# MAD / chi-squared cutoffs. MAD cutoffs follow Nigrini's nonconformity bounds
+# (first digit 0.015, second digit 0.012); chi-squared cutoffs are the 1%
+# critical values for 8 and 9 degrees of freedom.
+THRESHOLDS = {
+    'NPI-1':   {'minRows': 100, 'mad1': 0.015, 'mad2': 0.012, 'chi1': 20.090, 'chi2': 21.666},
+    'NPI-2':   {'minRows': 300, 'mad1': 0.018, 'mad2': 0.014, 'chi1': 20.090, 'chi2': 21.666},
+    'unknown': {'minRows': 100, 'mad1': 0.015, 'mad2': 0.012, 'chi1': 20.090, 'chi2': 21.666},
+}
+MAX_FLAGS = 200
+
+# Expected Benford frequencies
+FIRST_EXPECTED = np.log10(1 + 1 / np.arange(1, 10))
+SECOND_EXPECTED = np.array([
+    np.log10(1 + 1 / (10 * np.arange(1, 10) + d)).sum() for d in range(10)
+])
+
+# Nigrini first-digit conformity bands (by MAD)
+CONFORMITY_BANDS = [(0.006, 'close'), (0.012, 'acceptable'), (0.015, 'marginal')]
+
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+
+con = connect('scan')
+
+# First digit: x / 10^floor(log10(x)); second digit: the next digit of the same
+# mantissa. Rows under $10 have no meaningful second digit and are only counted
+# for the first-digit test.
+d1_cols = ",\n        ".join(f"COUNT(*) FILTER (WHERE d1 = {d}) AS d1_{d}" for d in range(1, 10))
+d2_cols = ",\n        ".join(f"COUNT(*) FILTER (WHERE d2 = {d}) AS d2_{d}" for d in range(10))
+
+print("Extracting leading digits per provider (single scan)...")
+rows = con.execute(f"""
+    WITH digits AS (
+        SELECT
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            TOTAL_PAID AS paid,
+            TOTAL_CLAIMS AS claims,
+            CAST(FLOOR(TOTAL_PAID / POW(10, FLOOR(LOG10(TOTAL_PAID)))) AS INT) AS d1,
+            CASE WHEN TOTAL_PAID >= 10
+                 THEN CAST(FLOOR(TOTAL_PAID / POW(10, FLOOR(LOG10(TOTAL_PAID)) - 1)) AS BIGINT) % 10
+            END AS d2
+        FROM read_parquet('{PARQUET}')
+        WHERE TOTAL_PAID >= 1
+    )
+    SELECT
+        npi,
+        COUNT(*) AS n_rows,
+        SUM(paid) AS total_paid,
+        SUM(claims) AS total_claims,
+        {d1_cols},
+        {d2_cols}
+    FROM digits
+    GROUP BY npi
+    HAVING COUNT(*) >= {min(t['minRows'] for t in THRESHOLDS.values())}
+""").fetchnumpy()
+con.close()
+
+npis = np.array([str(n) for n in rows['npi']])
+n_rows = rows['n_rows'].astype(np.int64)
+total_paid = rows['total_paid'].astype(np.float64)
+total_claims = rows['total_claims'].astype(np.int64)
+first = np.column_stack([rows[f'd1_{d}'] for d in range(1, 10)]).astype(np.float64)
+second = np.column_stack([rows[f'd2_{d}'] for d in range(10)]).astype(np.float64)
+print(f"  {len(npis):,} providers with enough rows to test")
+
+
+def conformity(counts, expected):
+    """MAD and chi-squared for every row of a provider x digit count matrix."""
+    n = counts.sum(axis=1, keepdims=True)
+    safe_n = np.where(n > 0, n, 1)
+    observed = counts / safe_n
+    mad = np.abs(observed - expected).mean(axis=1)
+    exp_counts = safe_n * expected
+    chi = ((counts - exp_counts) ** 2 / exp_counts).sum(axis=1)
+    return observed, mad, chi
+
+
+first_obs, mad1, chi1 = conformity(first, FIRST_EXPECTED)
+_, mad2, chi2 = conformity(second, SECOND_EXPECTED)
+
+# Per-provider thresholds from entity type
+entity = np.array([npi_info.get(n, {}).get('entity_type') or 'unknown' for n in npis])
+entity = np.where(np.isin(entity, list(THRESHOLDS)), entity, 'unknown')
+thr = {k: np.array([THRESHOLDS[e][k] for e in entity]) for k in ('minRows', 'mad1', 'mad2', 'chi1', 'chi2')}
+
+eligible = n_rows >= thr['minRows']
+first_fail = (mad1 > thr['mad1']) & (chi1 > thr['chi1'])
+second_fail = (mad2 > thr['mad2']) & (chi2 > thr['chi2'])
+flagged = eligible & (first_fail | second_fail)
+print(f"  {int(eligible.sum()):,} eligible, {int(flagged.sum()):,} nonconforming")
+
+order = np.argsort(-chi1[flagged])
+idx = np.flatnonzero(flagged)[order][:MAX_FLAGS]
+
+
+def band(mad):
+    for limit, label in CONFORMITY_BANDS:
+        if mad <= limit:
+            return label
+    return 'nonconforming'
+
+
+flags = []
+for i in idx:
+    npi = npis[i]
+    info = npi_info.get(npi, {})
+    flags.append({
+        'npi': npi,
+        'name': info.get('provider_name', ''),
+        'state': info.get('state', ''),
+        'entityType': entity[i],
+        'chiSquared': round(float(chi1[i]), 4),
+        'mad': round(float(mad1[i]), 5),
+        'secondDigitChiSquared': round(float(chi2[i]), 4),
+        'secondDigitMad': round(float(mad2[i]), 5),
+        'conformity': band(mad1[i]),
+        'failedTests': [t for t, hit in (('first_digit', first_fail[i]), ('second_digit', second_fail[i])) if hit],
+        'firstDigitDistribution': [round(float(p), 4) for p in first_obs[i]],
+        'totalPaid': round(float(total_paid[i]), 2),
+        'claimCount': int(total_claims[i]),
+        'paymentRows': int(n_rows[i]),
+        'flag': 'benford_nonconformity',
+    })
+
+write_json(os.path.join(OUT, 'benford-flags.json'), flags)
+
+print(f"\nWrote {len(flags)} Benford flags to benford-flags.json")
+for p in flags[:10]:
+    print(f"  NPI {p['npi']}: chi2={p['chiSquared']:.1f} MAD={p['mad']:.4f} rows={p['paymentRows']:,} ({p['entityType']})")
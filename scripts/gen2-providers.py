@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 """Step 2: Top 50 providers"""
-import duckdb, json, os, csv
+import os, csv
+from duckdb_session import connect
+from jsonout import write_json
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), "..", "public", "data")
 REF = os.path.join(os.path.dirname(__file__), "..", "reference-data")
-con = duckdb.connect()
+con = connect('scan')
 rows = con.execute(f"SELECT BILLING_PROVIDER_NPI_NUM, SUM(TOTAL_PAID), SUM(TOTAL_CLAIMS), SUM(TOTAL_UNIQUE_BENEFICIARIES), COUNT(DISTINCT HCPCS_CODE) FROM read_parquet('{PARQUET}') GROUP BY 1 ORDER BY 2 DESC LIMIT 50").fetchall()
 con.close()
 npi_info = {}
@@ -15,5 +17,5 @@ providers = []
 for r in rows:
     info = npi_info.get(r[0],{})
     providers.append({"npi":r[0],"totalPaid":r[1],"totalClaims":r[2],"totalBenes":r[3],"procCount":r[4],"name":info.get("name",""),"specialty":info.get("specialty",""),"city":info.get("city",""),"state":info.get("state","")})
-with open(os.path.join(OUT,"top-providers.json"),"w") as f: json.dump(providers,f)
+write_json(os.path.join(OUT,"top-providers.json"), providers)
 print(f"Done: {len(providers)} providers")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Impossible-volume detector for servicing providers.
+
+Joins every claim row on a timed HCPCS code against
+reference-data/hcpcs_unit_capacity.csv (minutes per unit and the most units a
+single clinician can plausibly deliver in a day) and computes implied work
+hours per servicing NPI for every month in one grouped DuckDB pass.
+
+A month is over capacity when the implied hours exceed HOURS_PER_DAY_LIMIT per
+calendar day, or any single code exceeds its max_units_per_day. Providers with
+at least MIN_MONTHS_OVER such months are flagged. Totals (claims, paid) only
+cover the timed codes in the capacity table.
+
+Outputs:
+  public/data/impossible-volume.json        (top servicing NPIs by peak hours/day)
+  public/data/fraud-impossible-volume.json  (all flags, smart-watchlist format)
+  public/data/smart-watchlist.json          (impossible_volume flag merged in)
+
+Run: python3 scripts/gen20-impossible-volume.py
+"""
+import os, csv
+from duckdb_session import connect
+from collections import defaultdict
+from jsonout import write_json
+from watchlist import merge_flag
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
+CAPACITY_CSV = os.path.join(REF, 'hcpcs_unit_capacity.csv')
+NPI_CSV = os.path.join(REF, 'npi_lookups_expanded.csv')
+
+HOURS_PER_DAY_LIMIT = 24.0
+MIN_MONTHS_OVER = 3
+WORKING_DAYS_PER_MONTH = 22  # claimsPerDay only (original artifact); hours per day use calendar days, as gen23
+TOP_N = 500
+
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+
+con = connect('scan')
+
+print("Computing implied work hours per servicing NPI x month...")
+rows = con.execute(f"""
+    WITH cap AS (
+        SELECT code, unit_minutes, max_units_per_day
+        FROM read_csv('{CAPACITY_CSV}', header = true,
+                      types = {{'code': 'VARCHAR', 'unit_minutes': 'DOUBLE', 'max_units_per_day': 'DOUBLE'}})
+    ),
+    code_month AS (
+        SELECT
+            d.SERVICING_PROVIDER_NPI_NUM AS npi,
+            d.CLAIM_FROM_MONTH AS month,
+            d.HCPCS_CODE AS code,
+            DAY(LAST_DAY(CAST(d.CLAIM_FROM_MONTH || '-01' AS DATE))) AS days,
+            SUM(d.TOTAL_CLAIMS) AS claims,
+            SUM(d.TOTAL_PAID) AS paid,
+            SUM(d.TOTAL_UNIQUE_BENEFICIARIES) AS benes,
+            SUM(d.TOTAL_CLAIMS) * ANY_VALUE(c.unit_minutes) / 60.0 AS hours,
+            SUM(d.TOTAL_CLAIMS) / (ANY_VALUE(c.max_units_per_day) * days) AS unit_ratio
+        FROM read_parquet('{PARQUET}') d
+        JOIN cap c ON d.HCPCS_CODE = c.code
+        WHERE d.SERVICING_PROVIDER_NPI_NUM IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    ),
+    monthly AS (
+        SELECT
+            npi, month,
+            SUM(claims) AS claims,
+            SUM(paid) AS paid,
+            SUM(benes) AS benes,
+            SUM(hours) AS hours,
+            SUM(hours) / ANY_VALUE(days) AS hours_per_day,
+            MAX(unit_ratio) AS unit_ratio,
+            ARG_MAX(code, hours) AS top_code
+        FROM code_month
+        GROUP BY 1, 2
+    )
+    SELECT
+        npi,
+        COUNT(*) AS active_months,
+        SUM(claims) AS total_claims,
+        SUM(paid) AS total_paid,
+        SUM(benes) AS total_benes,
+        SUM(hours) AS total_hours,
+        MAX(hours_per_day) AS peak_hours_per_day,
+        ARG_MAX(month, hours_per_day) AS peak_month,
+        ARG_MAX(top_code, hours_per_day) AS peak_code,
+        MAX(unit_ratio) AS peak_unit_ratio,
+        COUNT(*) FILTER (WHERE hours_per_day > {HOURS_PER_DAY_LIMIT} OR unit_ratio > 1) AS months_over
+    FROM monthly
+    GROUP BY npi
+    HAVING COUNT(*) FILTER (WHERE hours_per_day > {HOURS_PER_DAY_LIMIT} OR unit_ratio > 1) >= {MIN_MONTHS_OVER}
+    ORDER BY peak_hours_per_day DESC
+""").fetchall()
+con.close()
+print(f"  {len(rows):,} servicing NPIs over capacity in {MIN_MONTHS_OVER}+ months")
+
+flags = []
+for r in rows:
+    npi = str(r[0])
+    info = npi_info.get(npi, {})
+    active_months = int(r[1])
+    total_claims = int(r[2])
+    flags.append({
+        'npi': npi,
+        'name': info.get('provider_name', ''),
+        'specialty': info.get('taxonomy_description', ''),
+        'city': info.get('city', ''),
+        'state': info.get('state', ''),
+        'role': 'servicing',
+        'totalClaims': total_claims,
+        'activeMonths': active_months,
+        'claimsPerDay': round(total_claims / max(active_months * WORKING_DAYS_PER_MONTH, 1), 1),
+        'totalPaid': round(float(r[3]), 2),
+        'totalBenes': int(r[4] or 0),
+        'impliedHours': round(float(r[5]), 0),
+        'peakHoursPerDay': round(float(r[6]), 1),
+        'peakMonth': r[7],
+        'peakCode': r[8],
+        'peakUnitRatio': round(float(r[9]), 2),
+        'monthsOverCapacity': int(r[10]),
+        'flag': 'impossible_volume',
+    })
+
+write_json(os.path.join(OUT, 'impossible-volume.json'), flags[:TOP_N])
+write_json(os.path.join(OUT, 'fraud-impossible-volume.json'), flags)
+
+# ============================================
+# Merge into smart watchlist (re-runs replace the previous impossible_volume flag)
+# ============================================
+print("Merging into smart-watchlist.json...")
+watchlist = merge_flag(OUT, 'impossible_volume', flags)
+
+by_code = defaultdict(int)
+for fl in flags:
+    by_code[fl['peakCode']] += 1
+print(f"\nWrote {min(len(flags), TOP_N)} to impossible-volume.json, {len(flags)} to fraud-impossible-volume.json")
+print(f"Smart watchlist now {len(watchlist)} providers")
+print("Peak codes:", ", ".join(f"{c} ({n})" for c, n in sorted(by_code.items(), key=lambda x: -x[1])[:10]))
+for p in flags[:10]:
+    print(f"  NPI {p['npi']}: {p['peakHoursPerDay']:.1f} h/day in {p['peakMonth']} ({p['peakCode']}), {p['monthsOverCapacity']} months over")
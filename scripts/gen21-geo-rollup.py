@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Geographic rollups for every billing provider.
+
+Normalizes city/state with the shared name_utils helpers, buckets providers by
+ZIP and county (via an offline ZIP -> county crosswalk), marks statistical and
+ML flags, and computes spending, flag density and per-capita metrics for state,
+county, city and ZIP areas in a single GROUPING SETS aggregation.
+
+ZIP and county levels are only computed when their inputs exist: ZIPs need the
+zip column that gen30-nppes-ingest.py adds to npi_lookups_expanded.csv, counties
+additionally need zip_county_crosswalk.csv. Neither is in the tree yet, so the
+tiles currently carry states and cities only (no empty counties/zips lists).
+
+Inputs (reference-data/):
+  npi_lookups_expanded.csv   city / state / optional zip per NPI
+  zip_county_crosswalk.csv   zip,county_fips,county_name,state,population, built
+                             offline by scripts/build-zip-county-crosswalk.py from
+                             the Census ZCTA-to-county relationship file (county
+                             population is summed over its ZIP rows; a ZIP in
+                             several counties goes to its most populous part).
+  state_population.csv       state,population
+
+Outputs (public/data/):
+  geographic-risk.json       one row per state (flag counts, per-capita)
+  city-fraud-hotspots.json   top TOP_CITIES cities by flagged providers
+  geo/{STATE}.json           per-state tile: cities, plus counties / ZIPs when available
+
+Run: python3 scripts/gen21-geo-rollup.py
+"""
+import json, os, csv, glob, shutil, tempfile
+from duckdb_session import connect
+from name_utils import clean_city, clean_state, clean_zip
+from jsonout import write_json
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
+GEO_DIR = os.path.join(OUT, 'geo')
+NPI_CSV = os.path.join(REF, 'npi_lookups_expanded.csv')
+CROSSWALK_CSV = os.path.join(REF, 'zip_county_crosswalk.csv')
+POP_CSV = os.path.join(REF, 'state_population.csv')
+
+TOP_CITIES = 32
+TILE_LIMIT = 200  # max counties/cities/ZIPs per state tile
+os.makedirs(GEO_DIR, exist_ok=True)
+TMP_DIR = tempfile.mkdtemp(prefix='geo-rollup-')  # per run, so concurrent runs do not collide
+GEO_TMP = os.path.join(TMP_DIR, 'providers.csv')
+FLAG_TMP = os.path.join(TMP_DIR, 'flags.csv')
+
+# ============================================
+# Normalized provider locations
+# ============================================
+print("Normalizing provider locations...")
+has_zips = False
+with open(NPI_CSV) as f_in, open(GEO_TMP, 'w', newline='') as f_out:
+    w = csv.writer(f_out)
+    w.writerow(['npi', 'city', 'state', 'zip'])
+    for row in csv.DictReader(f_in):
+        zip5 = clean_zip(row.get('zip'))
+        has_zips = has_zips or bool(zip5)
+        w.writerow([row['npi'], clean_city((row.get('city') or '').strip()),
+                    clean_state(row.get('state')), zip5])
+
+has_crosswalk = has_zips and os.path.exists(CROSSWALK_CSV)
+if not has_zips:
+    print(f"  No zip column in {NPI_CSV}; skipping ZIP and county levels "
+          "(run scripts/gen30-nppes-ingest.py)")
+elif not has_crosswalk:
+    print(f"  No crosswalk at {CROSSWALK_CSV}; skipping county level "
+          "(build it with scripts/build-zip-county-crosswalk.py)")
+
+state_pop = {}
+with open(POP_CSV) as f:
+    for row in csv.DictReader(f):
+        state_pop[row['state']] = int(row['population'])
+
+# ============================================
+# Flagged NPIs: statistical tests vs ML model
+# ============================================
+print("Collecting flagged NPIs...")
+stat_npis = set()
+for path in ['smart-watchlist.json', 'expanded-watchlist.json'] + \
+        [os.path.basename(p) for p in glob.glob(os.path.join(OUT, 'fraud-*.json'))]:
+    full = os.path.join(OUT, path)
+    if not os.path.exists(full):
+        continue
+    with open(full) as f:
+        data = json.load(f)
+    stat_npis.update(str(d['npi']) for d in data if isinstance(d, dict) and d.get('npi'))
+
+ml_npis = set()
+ml_path = os.path.join(OUT, 'ml-scores.json')
+if os.path.exists(ml_path):
+    with open(ml_path) as f:
+        ml = json.load(f)
+    threshold = ml.get('threshold', 0.5)
+    ml_npis = {p['npi'] for p in ml.get('topProviders', []) if p.get('mlScore', 0) >= threshold}
+ml_npis -= stat_npis
+print(f"  {len(stat_npis):,} statistical flags, {len(ml_npis):,} ML-only flags")
+
+with open(FLAG_TMP, 'w', newline='') as f:
+    w = csv.writer(f)
+    w.writerow(['npi', 'kind'])
+    w.writerows([n, 'stat'] for n in sorted(stat_npis))
+    w.writerows([n, 'ml'] for n in sorted(ml_npis))
+
+# ============================================
+# One grouped aggregation over all providers
+# ============================================
+print("Rolling up providers by state / county / city / ZIP...")
+con = connect('scan')
+crosswalk_cte = f"""
+    SELECT zip,
+           arg_max(county_fips, TRY_CAST(population AS BIGINT)) AS county_fips,
+           arg_max(county_name, TRY_CAST(population AS BIGINT)) AS county_name
+    FROM read_csv('{CROSSWALK_CSV}', header = true, all_varchar = true)
+    GROUP BY zip
+""" if has_crosswalk else "SELECT NULL::VARCHAR AS zip, NULL::VARCHAR AS county_fips, NULL::VARCHAR AS county_name WHERE false"
+
+rows = con.execute(f"""
+    WITH providers AS (
+        SELECT
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            MODE(BILLING_PROVIDER_STATE_CD) AS state,
+            SUM(TOTAL_PAID) AS paid
+        FROM read_parquet('{PARQUET}')
+        GROUP BY 1
+    ),
+    geo AS (SELECT * FROM read_csv('{GEO_TMP}', header = true, all_varchar = true)),
+    flags AS (SELECT * FROM read_csv('{FLAG_TMP}', header = true, all_varchar = true)),
+    xwalk AS ({crosswalk_cte}),
+    located AS (
+        SELECT
+            p.npi, p.paid,
+            COALESCE(NULLIF(p.state, ''), NULLIF(g.state, ''), 'UNKNOWN') AS state,
+            NULLIF(g.city, '') AS city,
+            NULLIF(g.zip, '') AS zip,
+            x.county_fips, x.county_name,
+            f.kind
+        FROM providers p
+        LEFT JOIN geo g ON p.npi = g.npi
+        LEFT JOIN flags f ON p.npi = f.npi
+        LEFT JOIN xwalk x ON g.zip = x.zip
+    )
+    SELECT
+        GROUPING(city, county_fips, zip) AS grp,
+        state, city, county_fips, ANY_VALUE(county_name) AS county_name, zip,
+        COUNT(*) AS providers,
+        SUM(paid) AS total_paid,
+        COUNT(kind) AS flagged,
+        COUNT(*) FILTER (WHERE kind = 'stat') AS stat_flags,
+        COUNT(*) FILTER (WHERE kind = 'ml') AS ml_flags,
+        COALESCE(SUM(paid) FILTER (WHERE kind IS NOT NULL), 0) AS flagged_paid
+    FROM located
+    GROUP BY GROUPING SETS ((state), (state, city), (state, county_fips), (state, zip))
+""").fetchall()
+
+county_pop = {}
+if has_crosswalk:
+    for fips, pop in con.execute(f"""
+        SELECT county_fips, SUM(TRY_CAST(population AS BIGINT))
+        FROM read_csv('{CROSSWALK_CSV}', header = true, all_varchar = true)
+        GROUP BY 1
+    """).fetchall():
+        county_pop[fips] = int(pop or 0)
+con.close()
+shutil.rmtree(TMP_DIR)
+
+# GROUPING(city, county_fips, zip) bitmask: 7 = state only, 3 = city, 5 = county, 6 = zip
+LEVEL = {7: 'state', 3: 'city', 5: 'county', 6: 'zip'}
+
+
+def area_metrics(r, population):
+    providers, paid, flagged, stat, mlf, flagged_paid = int(r[6]), float(r[7] or 0), int(r[8]), int(r[9]), int(r[10]), float(r[11])
+    m = {
+        'providers': providers,
+        'allSpending': round(paid, 2),
+        'flaggedCount': flagged,
+        'statFlags': stat,
+        'mlFlags': mlf,
+        'flaggedSpending': round(flagged_paid, 2),
+        'flagDensity': round(flagged / providers * 1000, 2) if providers else 0.0,  # per 1,000 providers
+    }
+    if population:
+        m['population'] = population
+        m['flagsPerCapita'] = round(flagged / population * 100000, 2)
+        m['spendingPerCapita'] = round(paid / population)
+    return m
+
+
+states = {}
+for r in rows:
+    level = LEVEL.get(r[0])
+    state = r[1]
+    if state == 'UNKNOWN' or level is None:
+        continue
+    tile = states.setdefault(state, {'state': state, 'summary': None, 'cities': [],
+                                     **({'counties': []} if has_crosswalk else {}),
+                                     **({'zips': []} if has_zips else {})})
+    if level == 'state':
+        tile['summary'] = area_metrics(r, state_pop.get(state))
+    elif level == 'city' and r[2]:
+        tile['cities'].append({'city': r[2], **area_metrics(r, None)})
+    elif level == 'county' and r[3] and has_crosswalk:
+        tile['counties'].append({'countyFips': r[3], 'county': r[4], **area_metrics(r, county_pop.get(r[3]))})
+    elif level == 'zip' and r[5] and has_zips:
+        tile['zips'].append({'zip': r[5], **area_metrics(r, None)})
+
+# ============================================
+# Outputs
+# ============================================
+for state, tile in states.items():
+    for key in ('counties', 'cities', 'zips'):
+        if key not in tile:
+            continue
+        tile[key] = sorted(tile[key], key=lambda a: (-a['flaggedCount'], -a['allSpending']))[:TILE_LIMIT]
+    write_json(os.path.join(GEO_DIR, f'{state}.json'), tile)
+
+geo_risk = []
+for state, pop in state_pop.items():
+    s = (states.get(state) or {}).get('summary') or {}
+    flagged = s.get('flaggedCount', 0)
+    flagged_paid = s.get('flaggedSpending', 0)
+    geo_risk.append({
+        'state': state,
+        'flaggedCount': flagged,
+        'statFlags': s.get('statFlags', 0),
+        'mlFlags': s.get('mlFlags', 0),
+        'totalSpending': round(flagged_paid),
+        'population': pop,
+        'flagsPerCapita': round(flagged / pop * 100000, 2) if pop else 0.0,
+        'spendingPerCapita': round(flagged_paid / pop) if pop else 0,
+        'allSpending': s.get('allSpending', 0),
+        'allSpendingPerCapita': s.get('spendingPerCapita', 0),
+        'providers': s.get('providers', 0),
+        'flagDensity': s.get('flagDensity', 0.0),
+    })
+geo_risk.sort(key=lambda x: -x['flagsPerCapita'])
+write_json(os.path.join(OUT, 'geographic-risk.json'), geo_risk)
+
+hotspots = []
+for state, tile in states.items():
+    for c in tile['cities']:
+        if c['flaggedCount'] > 0:
+            hotspots.append({
+                'city': f"{c['city']}, {state}", 'state': state,
+                'flaggedCount': c['flaggedCount'],
+                'flaggedSpending': round(c['flaggedSpending']),
+                'providers': c['providers'],
+                'allSpending': round(c['allSpending']),
+                'flagDensity': c['flagDensity'],
+            })
+hotspots.sort(key=lambda x: (-x['flaggedCount'], -x['flaggedSpending']))
+write_json(os.path.join(OUT, 'city-fraud-hotspots.json'), hotspots[:TOP_CITIES])
+
+print(f"\nWrote {len(states)} state tiles to {GEO_DIR} "
+      f"(cities{', ZIPs' if has_zips else ''}{', counties' if has_crosswalk else ''})")
+print(f"geographic-risk.json: {len(geo_risk)} states; city-fraud-hotspots.json: {min(len(hotspots), TOP_CITIES)} cities")
+for h in hotspots[:10]:
+    print(f"  {h['city']}: {h['flaggedCount']} flagged, ${h['flaggedSpending']:,.0f}")
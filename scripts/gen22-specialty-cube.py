@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Specialty cube: one persisted rollup from which every specialty artifact is derived.
+
+The cube lives in CUBE_DIR as three parquet tables, all additive so a new month
+can be merged in without rescanning history:
+
+  cells.parquet      specialty x HCPCS_CODE x year: paid, claims, benes, rows
+  cpc_sketch.parquet same keys x log bucket: count of provider-month cost-per-claim
+                     values (DDSketch-style, relative error SKETCH_ALPHA); merging
+                     two sketches is a SUM over matching buckets
+  providers.parquet  specialty x NPI x year: paid, claims, benes
+  manifest.json      months already loaded (guards against double-appending)
+
+specialty is the billing NPI's taxonomy_description from npi_lookups_expanded.csv
+('Unknown' when missing), the same string the provider pages show, so
+specialty-benchmarks.json can be looked up by it. It is fixed when a month is
+scanned; rebuild the cube in full after the lookup file changes.
+
+Derived outputs (public/data/):
+  specialties.json, specialties/{slug}.json (directory rewritten each run),
+  specialty-benchmarks.json, specialty-spending.json, specialty-breakdown.json
+
+Run:
+  python3 scripts/gen22-specialty-cube.py                       # full build from PARQUET
+  python3 scripts/gen22-specialty-cube.py --append 2025-01.parquet  # merge new month(s)
+  python3 scripts/gen22-specialty-cube.py --derive-only         # rebuild JSON from cube
+"""
+import json, os, csv, re, argparse, shutil
+from duckdb_session import connect
+from name_utils import clean_name
+from jsonout import write_json
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+CUBE_DIR = os.path.expanduser("~/.openclaw/workspace/rollups/specialty-cube")
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+SPEC_DIR = os.path.join(OUT, 'specialties')
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+
+SKETCH_ALPHA = 0.01
+GAMMA = (1 + SKETCH_ALPHA) / (1 - SKETCH_ALPHA)
+ZERO_BUCKET = -(2 ** 31)  # cost per claim <= 0
+TOP_LIST = 10       # providers in specialties.json
+TOP_DETAIL = 100    # providers in specialties/{slug}.json
+TOP_CODES = 20      # codes in specialties/{slug}.json
+TOP_BREAKDOWN = 100
+TOP_SPENDERS = 50   # specialty-spending.json groups the top N providers nationally
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--append', metavar='PARQUET', help='merge rows from a new monthly parquet file into the cube')
+parser.add_argument('--derive-only', action='store_true', help='skip the scan, only rebuild JSON outputs')
+args = parser.parse_args()
+
+os.makedirs(CUBE_DIR, exist_ok=True)
+MANIFEST = os.path.join(CUBE_DIR, 'manifest.json')
+TABLES = {
+    'cells': ('specialty, code, year', 'SUM(paid) AS paid, SUM(claims) AS claims, SUM(benes) AS benes, SUM(n_rows) AS n_rows'),
+    'cpc_sketch': ('specialty, code, year, bucket', 'SUM(n) AS n'),
+    'providers': ('specialty, npi, year', 'SUM(paid) AS paid, SUM(claims) AS claims, SUM(benes) AS benes'),
+}
+
+
+def cube_path(name):
+    return os.path.join(CUBE_DIR, f'{name}.parquet')
+
+
+def load_manifest():
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST) as f:
+            return json.load(f)
+    return {'months': []}
+
+
+con = connect('scan')
+
+# ============================================
+# Scan: build cube slices from the source rows
+# ============================================
+if not args.derive_only:
+    source = args.append or PARQUET
+    manifest = load_manifest() if args.append else {'months': []}
+    months = [r[0] for r in con.execute(
+        f"SELECT DISTINCT CAST(CLAIM_FROM_MONTH AS VARCHAR) FROM read_parquet('{source}') ORDER BY 1").fetchall()]
+    overlap = sorted(set(months) & set(manifest['months']))
+    if overlap:
+        raise SystemExit(f"Cube already contains {overlap[0]}..{overlap[-1]}; refusing to double-count")
+
+    print(f"Scanning {source} ({len(months)} months)...")
+    con.execute(f"""
+        CREATE TEMP TABLE lookup AS
+        SELECT DISTINCT ON (npi) npi, NULLIF(TRIM(taxonomy_description), '') AS specialty
+        FROM read_csv('{NPI_CSV}', header = true, all_varchar = true)
+    """)
+    con.execute(f"""
+        CREATE TEMP TABLE src AS
+        SELECT
+            COALESCE(l.specialty, 'Unknown') AS specialty,
+            HCPCS_CODE AS code,
+            CAST(LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) AS INT) AS year,
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            CLAIM_FROM_MONTH AS month,
+            SUM(TOTAL_PAID) AS paid,
+            SUM(TOTAL_CLAIMS) AS claims,
+            SUM(TOTAL_UNIQUE_BENEFICIARIES) AS benes,
+            COUNT(*) AS n_rows
+        FROM read_parquet('{source}') c
+        LEFT JOIN lookup l ON l.npi = c.BILLING_PROVIDER_NPI_NUM
+        GROUP BY ALL
+    """)
+    slices = {
+        'cells': "SELECT specialty, code, year, SUM(paid) AS paid, SUM(claims) AS claims, SUM(benes) AS benes, SUM(n_rows) AS n_rows FROM src GROUP BY ALL",
+        'cpc_sketch': f"""
+            SELECT specialty, code, year,
+                   CASE WHEN claims > 0 AND paid > 0
+                        THEN CAST(CEIL(LN(paid / claims) / LN({GAMMA})) AS INT)
+                        ELSE {ZERO_BUCKET} END AS bucket,
+                   COUNT(*) AS n
+            FROM src GROUP BY ALL""",
+        'providers': "SELECT specialty, npi, year, SUM(paid) AS paid, SUM(claims) AS claims, SUM(benes) AS benes FROM src GROUP BY ALL",
+    }
+    for name, sql in slices.items():
+        path = cube_path(name)
+        if args.append and os.path.exists(path):
+            keys, aggs = TABLES[name]
+            sql = f"SELECT {keys}, {aggs} FROM (SELECT * FROM read_parquet('{path}') UNION ALL BY NAME {sql}) GROUP BY {keys}"
+        con.execute(f"COPY ({sql}) TO '{path}.tmp' (FORMAT PARQUET)")
+        os.replace(f'{path}.tmp', path)
+        print(f"  {name}: {con.execute(f'SELECT COUNT(*) FROM read_parquet(?)', [path]).fetchone()[0]:,} rows")
+    con.execute("DROP TABLE src")
+    con.execute("DROP TABLE lookup")
+
+    manifest['months'] = sorted(set(manifest['months']) | set(months))
+    with open(MANIFEST, 'w') as f:
+        json.dump(manifest, f)
+
+# ============================================
+# Roll-ups: every artifact comes from the cube
+# ============================================
+print("Deriving specialty artifacts from cube...")
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+
+
+def slugify(name):
+    return re.sub(r'^-|-$', '', re.sub(r'[^a-z0-9]+', '-', name.lower()))
+
+
+def provider_entry(npi):
+    info = npi_info.get(npi, {})
+    return {'npi': npi, 'name': clean_name(info.get('provider_name', '')) or f"Provider {npi}",
+            'state': info.get('state', '')}
+
+
+def bucket_value(b):
+    return 0.0 if b == ZERO_BUCKET else 2 * GAMMA ** b / (GAMMA + 1)
+
+
+con.execute(f"""
+    CREATE TEMP TABLE prov AS
+    SELECT specialty, npi, SUM(paid) AS paid, SUM(claims) AS claims, SUM(benes) AS benes
+    FROM read_parquet('{cube_path('providers')}') GROUP BY ALL
+""")
+
+spec_rows = con.execute("""
+    SELECT specialty, COUNT(*) AS providers, SUM(paid) AS paid, SUM(claims) AS claims,
+           QUANTILE_CONT(paid, [0.25, 0.5, 0.75, 0.9, 0.99]) AS q, AVG(paid) AS mean
+    FROM prov GROUP BY specialty ORDER BY paid DESC
+""").fetchall()
+
+top_rows = con.execute(f"""
+    SELECT specialty, npi, paid, claims, benes FROM prov
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY specialty ORDER BY paid DESC) <= {TOP_DETAIL}
+    ORDER BY specialty, paid DESC
+""").fetchall()
+
+code_rows = con.execute(f"""
+    WITH cells AS (
+        SELECT specialty, code, SUM(paid) AS paid, SUM(claims) AS claims
+        FROM read_parquet('{cube_path('cells')}') GROUP BY specialty, code
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY specialty ORDER BY SUM(paid) DESC) <= {TOP_CODES}
+    ),
+    hist AS (
+        SELECT s.specialty, s.code, s.bucket, SUM(s.n) AS n
+        FROM read_parquet('{cube_path('cpc_sketch')}') s
+        SEMI JOIN cells c ON s.specialty = c.specialty AND s.code = c.code
+        GROUP BY ALL
+    ),
+    cum AS (
+        SELECT *, SUM(n) OVER (PARTITION BY specialty, code ORDER BY bucket) AS cum,
+                  SUM(n) OVER (PARTITION BY specialty, code) AS tot
+        FROM hist
+    ),
+    q AS (
+        SELECT specialty, code,
+               MIN(bucket) FILTER (WHERE cum >= 0.5 * tot) AS b50,
+               MIN(bucket) FILTER (WHERE cum >= 0.9 * tot) AS b90
+        FROM cum GROUP BY ALL
+    )
+    SELECT c.specialty, c.code, c.paid, c.claims, q.b50, q.b90
+    FROM cells c JOIN q USING (specialty, code)
+    ORDER BY c.specialty, c.paid DESC
+""").fetchall()
+
+spenders = con.execute(f"""
+    SELECT specialty, COUNT(*), SUM(paid) FROM (
+        SELECT npi, ARG_MAX(specialty, paid) AS specialty, SUM(paid) AS paid
+        FROM prov GROUP BY npi ORDER BY paid DESC LIMIT {TOP_SPENDERS}
+    ) GROUP BY specialty ORDER BY 3 DESC
+""").fetchall()
+con.close()
+
+providers_by_spec, codes_by_spec = {}, {}
+for specialty, npi, paid, claims, benes in top_rows:
+    providers_by_spec.setdefault(specialty, []).append({
+        **provider_entry(str(npi)), 'totalPaid': round(float(paid), 2),
+        'totalClaims': int(claims), 'totalBeneficiaries': int(benes or 0),
+    })
+for specialty, code, paid, claims, b50, b90 in code_rows:
+    codes_by_spec.setdefault(specialty, []).append({
+        'code': code, 'totalPaid': round(float(paid), 2), 'totalClaims': int(claims),
+        'medianCostPerClaim': round(bucket_value(b50), 2), 'p90CostPerClaim': round(bucket_value(b90), 2),
+    })
+
+shutil.rmtree(SPEC_DIR, ignore_errors=True)  # drop pages of renamed/removed specialties
+os.makedirs(SPEC_DIR)
+index, benchmarks, breakdown = [], {}, []
+for specialty, n, paid, claims, q, mean in spec_rows:
+    slug = slugify(specialty)
+    provs = providers_by_spec.get(specialty, [])
+    index.append({
+        'slug': slug, 'name': specialty, 'providerCount': int(n), 'totalPaid': round(float(paid), 2),
+        'topProviders': [{k: p[k] for k in ('npi', 'name', 'state', 'totalPaid')} for p in provs[:TOP_LIST]],
+    })
+    write_json(os.path.join(SPEC_DIR, f'{slug}.json'), {
+        'slug': slug, 'name': specialty, 'providerCount': int(n), 'totalPaid': round(float(paid), 2),
+        'providers': provs, 'topCodes': codes_by_spec.get(specialty, [])})
+    benchmarks[specialty] = {
+        'count': int(n), 'median': round(q[1], 2), 'p25': round(q[0], 2), 'p75': round(q[2], 2),
+        'p90': round(q[3], 2), 'p99': round(q[4], 2), 'mean': round(float(mean), 2),
+    }
+    breakdown.append({'specialty': specialty, 'totalPaid': round(float(paid), 2),
+                      'providerCount': int(n), 'totalClaims': int(claims)})
+
+write_json(os.path.join(OUT, 'specialties.json'), index)
+write_json(os.path.join(OUT, 'specialty-benchmarks.json'), benchmarks)
+write_json(os.path.join(OUT, 'specialty-breakdown.json'), breakdown[:TOP_BREAKDOWN])
+write_json(os.path.join(OUT, 'specialty-spending.json'), [{'specialty': s, 'count': int(c), 'totalPaid': round(float(p), 2)} for s, c, p in spenders])
+
+print(f"\nDone! {len(index)} specialties, months in cube: {len(load_manifest()['months'])}")
+for s in breakdown[:5]:
+    print(f"  {s['specialty']}: ${s['totalPaid']:,.0f} across {s['providerCount']:,} providers")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Aggregated rollups for every billing provider, written next to the source parquet.
+
+One GROUPING SETS scan produces the tables under ROLLUP_DIR, each sorted by
+its leading NPI so point lookups only touch one row group:
+
+  provider.parquet             npi, state, specialty, totals, uniqueCodes, activeMonths
+  provider_code.parquet        npi x code totals
+  provider_month.parquet       npi x month totals
+  provider_code_month.parquet  npi x code x month totals plus claim lines and
+                               self-billed lines (servicing NPI = billing NPI);
+                               state / specialty are MAX over the lines, as
+                               feature_store.rollup_sql computes them;
+                               the input for as-of-month ML features
+                               (feature_store.feature_sql, ml-backtest.py)
+  servicing_billing_code_month.parquet
+                               servicingNpi x billingNpi x code x month totals,
+                               sorted by servicing NPI
+  servicing_provider.parquet   one detail record per servicing NPI, derived from
+                               the table above without rescanning: totals, the
+                               billing NPIs it bills through (top BILLED_THROUGH_TOP
+                               by paid), implied hours from hcpcs_unit_capacity.csv
+                               and the peak month by hours per calendar day (the
+                               peakHoursPerDay convention of gen20-impossible-volume.py)
+  provider_servicing.parquet   billing NPI x servicing NPI totals and implied
+                               hours, sorted by billing NPI (the clinicians
+                               behind each billing entity)
+
+These back scripts/query-service.py and any stage that needs per-provider
+aggregates without rescanning the 227M-row claims file; the servicing tables
+let query-service.py and the flag bundle (gen24-flag-bundle.py) show the
+clinicians behind a billing entity.
+
+Run: python3 scripts/gen23-rollups.py
+"""
+import os, time
+from duckdb_session import connect
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+ROLLUP_DIR = os.path.expanduser("~/.openclaw/workspace/rollups")
+CAPACITY_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'hcpcs_unit_capacity.csv')
+ROW_GROUP_SIZE = 16384  # small row groups keep single-NPI reads cheap
+BILLED_THROUGH_TOP = 20
+os.makedirs(ROLLUP_DIR, exist_ok=True)
+
+con = connect('scan')
+t0 = time.time()
+
+# GROUPING(snpi, code, month): 7 = provider, 5 = provider x code, 6 = provider x month,
+# 4 = provider x code x month, 0 = servicing x provider x code x month
+print("Aggregating billing provider levels and servicing x billing x code x month (single scan)...")
+con.execute(f"""
+    CREATE TEMP TABLE rollup AS
+    SELECT
+        GROUPING(snpi, code, month) AS grp,
+        snpi, npi, code, month,
+        SUM(paid) AS paid,
+        SUM(claims) AS claims,
+        SUM(benes) AS benes,
+        COUNT(*) AS lines,
+        COUNT(*) FILTER (WHERE self_billed) AS self_lines,
+        COUNT(DISTINCT code) AS codes,
+        COUNT(DISTINCT month) AS months,
+        MODE(state) AS state,
+        MODE(ptype) AS ptype,
+        MAX(raw_state) AS max_state,
+        MAX(raw_ptype) AS max_ptype
+    FROM (
+        SELECT
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            SERVICING_PROVIDER_NPI_NUM AS snpi,
+            HCPCS_CODE AS code,
+            CAST(CLAIM_FROM_MONTH AS VARCHAR) AS month,
+            TOTAL_PAID AS paid,
+            TOTAL_CLAIMS AS claims,
+            TOTAL_UNIQUE_BENEFICIARIES AS benes,
+            BILLING_PROVIDER_NPI_NUM = SERVICING_PROVIDER_NPI_NUM AS self_billed,
+            NULLIF(BILLING_PROVIDER_STATE_CD, '') AS state,
+            NULLIF(BILLING_PROVIDER_TYPE, '') AS ptype,
+            BILLING_PROVIDER_STATE_CD AS raw_state,
+            BILLING_PROVIDER_TYPE AS raw_ptype
+        FROM read_parquet('{PARQUET}')
+    )
+    GROUP BY GROUPING SETS ((npi), (npi, code), (npi, month), (npi, code, month), (snpi, npi, code, month))
+""")
+print(f"  {time.time() - t0:.1f}s")
+
+LEVELS = {
+    'provider': (7, """npi, state, ptype AS specialty, paid AS totalPaid, claims AS totalClaims,
+                       benes AS totalBeneficiaries, codes AS uniqueCodes, months AS activeMonths"""),
+    'provider_code': (5, "npi, code, paid AS totalPaid, claims AS totalClaims, benes AS uniqueBeneficiaries"),
+    'provider_month': (6, "npi, month, paid AS totalPaid, claims AS totalClaims, benes AS totalBeneficiaries"),
+    'provider_code_month': (4, """npi, code, month, max_state AS state, max_ptype AS specialty, paid AS totalPaid, claims AS totalClaims,
+                                  benes AS totalBeneficiaries, lines, self_lines AS selfLines"""),
+    'servicing_billing_code_month': (0, """snpi AS servicingNpi, npi AS billingNpi, code, month, paid AS totalPaid,
+                                           claims AS totalClaims, benes AS totalBeneficiaries, lines"""),
+}
+con.execute("DELETE FROM rollup WHERE grp = 0 AND snpi IS NULL")  # lines without a servicing NPI
+for name, (grp, cols) in LEVELS.items():
+    path = os.path.join(ROLLUP_DIR, f'{name}.parquet')
+    con.execute(f"""
+        COPY (SELECT {cols} FROM rollup WHERE grp = {grp} ORDER BY 1, 2)
+        TO '{path}.tmp' (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+    """)
+    os.replace(f'{path}.tmp', path)
+    n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [path]).fetchone()[0]
+    print(f"  {name}: {n:,} rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+print("Building servicing provider detail records...")
+path = os.path.join(ROLLUP_DIR, 'servicing_provider.parquet')
+con.execute(f"""
+    COPY (
+        WITH cap AS (
+            SELECT code, unit_minutes
+            FROM read_csv('{CAPACITY_CSV}', header = true, types = {{'code': 'VARCHAR', 'unit_minutes': 'DOUBLE'}})
+        ),
+        s AS (
+            SELECT r.snpi, r.npi, r.code, r.month, r.paid, r.claims, r.benes,
+                   r.claims * c.unit_minutes / 60.0 AS hours
+            FROM rollup r LEFT JOIN cap c USING (code)
+            WHERE r.grp = 0
+        ),
+        months AS (
+            SELECT snpi, month, SUM(hours) AS hours,
+                   SUM(hours) / DAY(LAST_DAY(CAST(month || '-01' AS DATE))) AS hours_per_day
+            FROM s GROUP BY snpi, month
+        ),
+        through AS (
+            SELECT snpi, npi, SUM(paid) AS paid, SUM(claims) AS claims, COUNT(DISTINCT month) AS months
+            FROM s GROUP BY snpi, npi
+        ),
+        ranked AS (
+            SELECT snpi,
+                   COUNT(*) AS billingNpis,
+                   list({{'npi': npi, 'totalPaid': paid, 'totalClaims': claims, 'activeMonths': months}}
+                        ORDER BY paid DESC)[:{BILLED_THROUGH_TOP}] AS billedThrough,
+                   bool_or(npi = snpi) AS selfBills
+            FROM through GROUP BY snpi
+        )
+        SELECT
+            s.snpi AS servicingNpi,
+            SUM(s.paid) AS totalPaid,
+            SUM(s.claims) AS totalClaims,
+            SUM(s.benes) AS totalBeneficiaries,
+            COUNT(DISTINCT s.code) AS uniqueCodes,
+            ANY_VALUE(r.billingNpis) AS billingNpis,
+            ANY_VALUE(r.selfBills) AS selfBills,
+            ANY_VALUE(r.billedThrough) AS billedThrough,
+            ANY_VALUE(m.activeMonths) AS activeMonths,
+            ANY_VALUE(m.impliedHours) AS impliedHours,
+            ANY_VALUE(m.peakMonth) AS peakMonth,
+            ANY_VALUE(m.peakHoursPerDay) AS peakHoursPerDay
+        FROM s
+        JOIN ranked r USING (snpi)
+        JOIN (
+            SELECT snpi, COUNT(*) AS activeMonths, SUM(hours) AS impliedHours,
+                   arg_max(month, hours_per_day) AS peakMonth, MAX(hours_per_day) AS peakHoursPerDay
+            FROM months GROUP BY snpi
+        ) m USING (snpi)
+        GROUP BY s.snpi
+        ORDER BY servicingNpi
+    ) TO '{path}.tmp' (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+""", label='servicing detail')
+os.replace(f'{path}.tmp', path)
+n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [path]).fetchone()[0]
+print(f"  servicing_provider: {n:,} rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+path = os.path.join(ROLLUP_DIR, 'provider_servicing.parquet')
+con.execute(f"""
+    COPY (
+        SELECT r.npi, r.snpi AS servicingNpi, SUM(r.paid) AS totalPaid, SUM(r.claims) AS totalClaims,
+               COUNT(DISTINCT r.month) AS activeMonths, SUM(r.claims * c.unit_minutes / 60.0) AS impliedHours
+        FROM rollup r
+        LEFT JOIN read_csv('{CAPACITY_CSV}', header = true, types = {{'code': 'VARCHAR', 'unit_minutes': 'DOUBLE'}}) c
+            USING (code)
+        WHERE r.grp = 0
+        GROUP BY r.npi, r.snpi
+        ORDER BY npi, totalPaid DESC
+    ) TO '{path}.tmp' (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+""", label='provider servicing')
+os.replace(f'{path}.tmp', path)
+n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [path]).fetchone()[0]
+print(f"  provider_servicing: {n:,} rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+con.close()
+
+print(f"\nDone in {time.time() - t0:.1f}s -> {ROLLUP_DIR}")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Per-NPI flag bundle for the provider pages.
+
+Merges the smart and expanded watchlists, every fraud-*.json, the advanced
+detector files, the ML score files and the LEIE matches into one record per
+NPI, sharded by the first SHARD_DIGITS digits of the NPI. A provider page reads
+one small shard (src/lib/flags.ts) instead of parsing every flag file.
+
+Record layout (missing sources are omitted):
+  {npi, flags: [...], smart, expanded, fraud: {file stem: [records]},
+   detectors: {impossibleVolume, benford, changePoints, suspiciousConcentration},
+   ml, mlHigh, mlColabScore, mlFactors, leie, leieIndex, servicing, servicingCount}
+
+servicing lists the top SERVICING_TOP clinicians (servicing NPIs other than the
+NPI itself) billed under a bundled NPI, from the gen23 rollups
+provider_servicing / servicing_provider: paid, implied hours and the
+clinician's peak hours per calendar day. Skipped when the rollups are missing.
+
+Keys that are not NPIs (ml-scores-colab.json carries some procedure codes, and
+'0000000000' placeholders turn up in several files) are dropped from every source.
+
+Outputs: public/data/flags/{prefix}.json  ({npi: record})
+
+Run after all flag generators: python3 scripts/gen24-flag-bundle.py
+"""
+import json, os, glob, re, shutil
+from collections import defaultdict
+from duckdb_session import connect
+from jsonout import write_json
+from name_utils import clean_name
+from npi_lookups import read_lookups
+
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+FLAG_DIR = os.path.join(OUT, 'flags')
+ROLLUP_DIR = os.path.expanduser("~/.openclaw/workspace/rollups")
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+SERVICING_TOP = 10
+SHARD_DIGITS = 5
+PRECISION = 6  # mlColabScore carries 6 decimals
+NPI_RE = re.compile(r'\d{10}')
+
+DETECTORS = {
+    'impossibleVolume': 'impossible-volume.json',
+    'benford': 'benford-flags.json',
+    'changePoints': 'change-points.json',
+    'suspiciousConcentration': 'suspicious-concentration.json',
+}
+
+
+def load(name, default=None):
+    path = os.path.join(OUT, name)
+    if not os.path.exists(path):
+        print(f"  (skipping missing {name})")
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+bundle = defaultdict(dict)
+skipped = set()
+
+
+def record(npi):
+    npi = str(npi)
+    if not NPI_RE.fullmatch(npi) or npi == '0000000000':
+        skipped.add(npi)
+        return {}  # not an NPI: whatever the caller stores is discarded
+    rec = bundle[npi]
+    rec.setdefault('npi', npi)
+    return rec
+
+
+print("Merging watchlists...")
+for p in load('smart-watchlist.json', []):
+    record(p['npi'])['smart'] = p
+for p in load('expanded-watchlist.json', []):
+    record(p['npi'])['expanded'] = p
+
+print("Merging fraud-*.json...")
+for path in sorted(glob.glob(os.path.join(OUT, 'fraud-*.json'))):
+    stem = os.path.basename(path)[len('fraud-'):-len('.json')]
+    for p in load(os.path.basename(path), []):
+        if isinstance(p, dict) and p.get('npi'):
+            record(p['npi']).setdefault('fraud', {}).setdefault(stem, []).append(p)
+
+print("Merging detector files...")
+for key, name in DETECTORS.items():
+    for p in load(name, []):
+        record(p['npi']).setdefault('detectors', {})[key] = p
+
+print("Merging ML scores...")
+for p in (load('ml-scores.json', {}) or {}).get('topProviders', []):
+    record(p['npi'])['ml'] = p
+ml_high = load('ml-all-high-scores.json', {}) or {}
+for key in ('topProviders', 'smallProviderFlags', 'mediumProviderFlags'):
+    for p in ml_high.get(key, []):
+        record(p['npi']).setdefault('mlHigh', p)
+for npi, score in (load('ml-scores-colab.json', {}) or {}).items():
+    record(npi)['mlColabScore'] = score
+for npi, expl in ((load('ml-explanations.json', {}) or {}).get('providers') or {}).items():
+    record(npi)['mlFactors'] = expl['topFactors']
+
+print("Merging LEIE matches...")
+for p in load('leie-matched.json', []):
+    if p.get('npi'):
+        record(p['npi'])['leie'] = p
+leie_index = load('leie-npi-index.json', {}) or {}
+for npi in list(bundle):
+    if npi in leie_index:
+        bundle[npi]['leieIndex'] = leie_index[npi]
+
+print("Merging servicing clinicians...")
+rollups = [os.path.join(ROLLUP_DIR, f'{name}.parquet') for name in ('provider_servicing', 'servicing_provider')]
+if all(os.path.exists(p) for p in rollups):
+    npi_info, _ = read_lookups(NPI_CSV)
+    con = connect('batch')
+    con.execute("CREATE TEMP TABLE wanted AS SELECT UNNEST(?::VARCHAR[]) AS npi", [list(bundle)])
+    rows = con.execute(f"""
+        SELECT ps.npi, COUNT(*),
+               list({{'npi': ps.servicingNpi, 'totalPaid': ps.totalPaid, 'impliedHours': ps.impliedHours,
+                     'peakMonth': sp.peakMonth, 'peakHoursPerDay': sp.peakHoursPerDay}}
+                    ORDER BY ps.totalPaid DESC)[:{SERVICING_TOP}]
+        FROM read_parquet('{rollups[0]}') ps
+        SEMI JOIN wanted w ON w.npi = ps.npi
+        LEFT JOIN read_parquet('{rollups[1]}') sp ON sp.servicingNpi = ps.servicingNpi
+        WHERE ps.servicingNpi <> ps.npi
+        GROUP BY ps.npi
+    """, label='servicing clinicians').fetchall()
+    con.close()
+    for npi, n, top in rows:
+        rec = record(npi)
+        rec['servicingCount'] = int(n)
+        rec['servicing'] = [{
+            'npi': s['npi'],
+            'name': clean_name(npi_info.get(s['npi'], {}).get('provider_name', '')),
+            'totalPaid': round(float(s['totalPaid']), 2),
+            'impliedHours': round(float(s['impliedHours'] or 0)),
+            'peakMonth': s['peakMonth'],
+            'peakHoursPerDay': round(float(s['peakHoursPerDay'] or 0), 1),
+        } for s in top]
+    print(f"  {len(rows):,} NPIs with servicing clinicians")
+else:
+    print(f"  (skipping: no servicing rollups in {ROLLUP_DIR}; run gen23-rollups.py)")
+
+# Union of flag names across sources
+for rec in bundle.values():
+    flags = list(rec.get('smart', {}).get('flags', []))
+    flags += rec.get('expanded', {}).get('flags', [])
+    for recs in rec.get('fraud', {}).values():
+        flags += [r['flag'] for r in recs if r.get('flag')]
+    if 'leie' in rec:
+        flags.append('leie_excluded')
+    rec['flags'] = list(dict.fromkeys(flags))
+
+shards = defaultdict(dict)
+for npi, rec in bundle.items():
+    shards[npi[:SHARD_DIGITS]][npi] = rec
+
+if os.path.exists(FLAG_DIR):
+    shutil.rmtree(FLAG_DIR)
+os.makedirs(FLAG_DIR)
+for prefix, recs in shards.items():
+    write_json(os.path.join(FLAG_DIR, f'{prefix}.json'), recs, precision=PRECISION)
+
+sizes = sorted(len(s) for s in shards.values())
+if skipped:
+    print(f"  skipped {len(skipped):,} keys that are not NPIs (e.g. {', '.join(sorted(skipped)[:3])})")
+print(f"\nDone! {len(bundle):,} NPIs in {len(shards):,} shards "
+      f"(median {sizes[len(sizes) // 2]} NPIs, max {sizes[-1]}) -> {FLAG_DIR}")
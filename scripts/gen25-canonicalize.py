@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Canonical, dictionary-encoded copy of the spending data.
+
+Rewrites the claims parquet so aggregations and joins run on fixed-width
+integers instead of VARCHARs:
+
+  billing_npi, servicing_npi  BIGINT (NULL when not a 10-digit NPI)
+  code_id                     INTEGER  -> codes.parquet (code_id, code)
+  ptype_id                    SMALLINT -> provider_types.parquet (ptype_id, ptype)
+  state_id                    SMALLINT -> states.parquet (state_id, state)
+  month_idx                   INTEGER months since MONTH_EPOCH -> months.parquet
+  year                        SMALLINT
+  paid, claims, benes
+
+Dictionary ids are stable: on re-runs existing ids are kept and new values are
+appended after the current maximum, so ids in downstream rollups stay valid.
+Rows are sorted by (billing_npi, month_idx) so per-provider reads prune row groups.
+
+Outputs in ~/.openclaw/workspace/canonical/ (see canonical.py for views).
+
+Run: python3 scripts/gen25-canonicalize.py
+"""
+import os, time
+from duckdb_session import connect
+from canonical import CANONICAL_DIR, MONTH_EPOCH, DICTIONARIES, register
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+ROW_GROUP_SIZE = 122880
+os.makedirs(CANONICAL_DIR, exist_ok=True)
+
+con = connect('scan')
+con.execute(f"CREATE VIEW raw AS SELECT * FROM read_parquet('{PARQUET}')")
+
+# ============================================
+# Dictionaries (stable ids, new values appended)
+# ============================================
+SOURCES = {
+    'codes': "HCPCS_CODE",
+    'provider_types': "COALESCE(NULLIF(BILLING_PROVIDER_TYPE, ''), 'Unknown')",
+    'states': "COALESCE(NULLIF(BILLING_PROVIDER_STATE_CD, ''), 'UNKNOWN')",
+}
+for name, expr in SOURCES.items():
+    id_col, value_col, id_type = DICTIONARIES[name]
+    path = os.path.join(CANONICAL_DIR, f'{name}.parquet')
+    existing = f"SELECT * FROM read_parquet('{path}')" if os.path.exists(path) else \
+        f"SELECT NULL::{id_type} AS {id_col}, NULL::VARCHAR AS {value_col} WHERE false"
+    con.execute(f"""
+        COPY (
+            WITH old AS ({existing}),
+            new AS (
+                SELECT DISTINCT {expr} AS {value_col} FROM raw
+                WHERE {expr} IS NOT NULL AND {expr} NOT IN (SELECT {value_col} FROM old)
+            )
+            SELECT {id_col}, {value_col} FROM old
+            UNION ALL
+            SELECT CAST((SELECT COALESCE(MAX({id_col}), -1) FROM old)
+                        + ROW_NUMBER() OVER (ORDER BY {value_col}) AS {id_type}), {value_col}
+            FROM new
+            ORDER BY 1
+        ) TO '{path}.tmp' (FORMAT PARQUET)
+    """, label=f'dictionary {name}')
+    os.replace(f'{path}.tmp', path)
+    n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [path]).fetchone()[0]
+    print(f"  {name}: {n:,} ids")
+
+months_path = os.path.join(CANONICAL_DIR, 'months.parquet')
+epoch_year, epoch_month = (int(x) for x in MONTH_EPOCH.split('-'))
+con.execute(f"""
+    COPY (
+        SELECT DISTINCT
+            CAST((CAST(LEFT(m, 4) AS INT) - {epoch_year}) * 12 + CAST(RIGHT(m, 2) AS INT) - {epoch_month} AS INTEGER) AS month_idx,
+            m AS month,
+            CAST(LEFT(m, 4) AS SMALLINT) AS year
+        FROM (SELECT CAST(CLAIM_FROM_MONTH AS VARCHAR) AS m FROM raw)
+        ORDER BY 1
+    ) TO '{months_path}' (FORMAT PARQUET)
+""", label='dictionary months')
+
+# ============================================
+# Encoded claims
+# ============================================
+print("Writing encoded claims...")
+t0 = time.time()
+claims_path = os.path.join(CANONICAL_DIR, 'claims.parquet')
+con.execute(f"""
+    COPY (
+        SELECT
+            TRY_CAST(r.BILLING_PROVIDER_NPI_NUM AS BIGINT) AS billing_npi,
+            TRY_CAST(r.SERVICING_PROVIDER_NPI_NUM AS BIGINT) AS servicing_npi,
+            c.code_id, p.ptype_id, s.state_id, m.month_idx, m.year,
+            r.TOTAL_PAID AS paid,
+            r.TOTAL_CLAIMS AS claims,
+            r.TOTAL_UNIQUE_BENEFICIARIES AS benes
+        FROM raw r
+        LEFT JOIN read_parquet('{os.path.join(CANONICAL_DIR, 'codes.parquet')}') c ON r.HCPCS_CODE = c.code
+        LEFT JOIN read_parquet('{os.path.join(CANONICAL_DIR, 'provider_types.parquet')}') p
+            ON COALESCE(NULLIF(r.BILLING_PROVIDER_TYPE, ''), 'Unknown') = p.ptype
+        LEFT JOIN read_parquet('{os.path.join(CANONICAL_DIR, 'states.parquet')}') s
+            ON COALESCE(NULLIF(r.BILLING_PROVIDER_STATE_CD, ''), 'UNKNOWN') = s.state
+        LEFT JOIN read_parquet('{months_path}') m ON CAST(r.CLAIM_FROM_MONTH AS VARCHAR) = m.month
+        ORDER BY billing_npi, month_idx
+    ) TO '{claims_path}.tmp' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+""", label='encode claims')
+os.replace(f'{claims_path}.tmp', claims_path)
+
+raw_rows, bad_npis = con.execute(
+    "SELECT COUNT(*), COUNT(*) FILTER (WHERE TRY_CAST(BILLING_PROVIDER_NPI_NUM AS BIGINT) IS NULL) FROM raw").fetchone()
+enc_rows = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [claims_path]).fetchone()[0]
+if enc_rows != raw_rows:
+    raise SystemExit(f"Row count mismatch: {raw_rows:,} raw vs {enc_rows:,} encoded")
+print(f"  {enc_rows:,} rows in {time.time() - t0:.1f}s; {bad_npis:,} non-numeric billing NPIs stored as NULL")
+
+# ============================================
+# Size and a sample aggregation, raw vs canonical
+# ============================================
+register(con)
+raw_mb, enc_mb = os.path.getsize(PARQUET) / 1e6, os.path.getsize(claims_path) / 1e6
+print(f"\nSize: {raw_mb:,.0f}MB raw -> {enc_mb:,.0f}MB canonical")
+for name, sql in [
+    ('raw', "SELECT BILLING_PROVIDER_NPI_NUM, LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4), SUM(TOTAL_PAID) FROM raw GROUP BY 1, 2"),
+    ('canonical', "SELECT billing_npi, year, SUM(paid) FROM claims GROUP BY 1, 2"),
+]:
+    t = time.time()
+    con.execute(f"SELECT COUNT(*) FROM ({sql})", label=f'provider x year ({name})').fetchone()
+    print(f"  provider x year aggregation, {name}: {time.time() - t:.2f}s")
+con.close()
+print(f"\nDone -> {CANONICAL_DIR}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+HyperLogLog distinct-count sketches for the rollup cube (see hll.py).
+
+Sketches live in HLL_DIR, one parquet per sketch, rows = key columns + (reg, rank):
+
+  providers.parquet        code x state x specialty x year -> billing NPIs
+  providers_month.parquet  month x state -> billing NPIs
+  servicing.parquet        billing npi -> servicing NPIs
+  codes.parquet            state x specialty x year -> HCPCS codes
+  manifest.json            months already loaded
+
+Any union of cells is answered by merging registers, e.g. providers billing
+99213 in TX in 2023, or in TX across all years and codes, without rescanning
+claims. Sketches are idempotent under re-adding a value, so --append merges a
+new month in place (the manifest still refuses months already loaded, to keep
+the record straight).
+
+Run:
+  python3 scripts/gen26-hll-sketches.py                         # full build from PARQUET
+  python3 scripts/gen26-hll-sketches.py --append 2025-01.parquet  # merge new month(s)
+"""
+import json, os, time, argparse
+import hll
+from duckdb_session import connect
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+HLL_DIR = os.path.expanduser("~/.openclaw/workspace/rollups/hll")
+MANIFEST = os.path.join(HLL_DIR, 'manifest.json')
+
+# sketch -> (key columns, distinct value)
+SKETCHES = {
+    'providers': (['code', 'state', 'specialty', 'year'], 'npi'),
+    'providers_month': (['month', 'state'], 'npi'),
+    'servicing': (['npi'], 'servicing_npi'),
+    'codes': (['state', 'specialty', 'year'], 'code'),
+}
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--append', metavar='PARQUET', help='merge rows from a new monthly parquet file into the sketches')
+args = parser.parse_args()
+os.makedirs(HLL_DIR, exist_ok=True)
+
+manifest = {'months': [], 'precision': hll.P}
+if args.append and os.path.exists(MANIFEST):
+    with open(MANIFEST) as f:
+        manifest = json.load(f)
+    if manifest.get('precision') != hll.P:
+        raise SystemExit(f"Sketches were built with P={manifest.get('precision')}, hll.P is {hll.P}; rebuild without --append")
+
+con = connect('scan')
+source = args.append or PARQUET
+months = [r[0] for r in con.execute(
+    f"SELECT DISTINCT CAST(CLAIM_FROM_MONTH AS VARCHAR) FROM read_parquet('{source}') ORDER BY 1").fetchall()]
+overlap = sorted(set(months) & set(manifest['months']))
+if overlap:
+    raise SystemExit(f"Sketches already contain {overlap[0]}..{overlap[-1]}")
+
+t0 = time.time()
+print(f"Scanning {source} ({len(months)} months)...")
+con.execute(f"""
+    CREATE TEMP VIEW src AS
+    SELECT
+        BILLING_PROVIDER_NPI_NUM AS npi,
+        NULLIF(SERVICING_PROVIDER_NPI_NUM, '') AS servicing_npi,
+        HCPCS_CODE AS code,
+        CAST(CLAIM_FROM_MONTH AS VARCHAR) AS month,
+        CAST(LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) AS SMALLINT) AS year,
+        COALESCE(NULLIF(BILLING_PROVIDER_STATE_CD, ''), 'UNKNOWN') AS state,
+        COALESCE(NULLIF(BILLING_PROVIDER_TYPE, ''), 'Unknown') AS specialty
+    FROM read_parquet('{source}')
+""")
+for name, (keys, value) in SKETCHES.items():
+    path = os.path.join(HLL_DIR, f'{name}.parquet')
+    sql = hll.build_sql('src', keys, value)
+    if args.append and os.path.exists(path):
+        sql = hll.merge_sql(f"SELECT * FROM read_parquet('{path}') UNION ALL BY NAME {sql}", keys)
+    con.execute(f"COPY ({sql} ORDER BY {', '.join(keys)}) TO '{path}.tmp' (FORMAT PARQUET)", label=f'sketch {name}')
+    os.replace(f'{path}.tmp', path)
+    n_cells, n_rows = con.execute(
+        f"SELECT COUNT(DISTINCT ({', '.join(keys)})), COUNT(*) FROM read_parquet(?)", [path]).fetchone()
+    print(f"  {name}: {n_cells:,} cells, {n_rows:,} register rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+manifest['months'] = sorted(set(manifest['months']) | set(months))
+with open(MANIFEST, 'w') as f:
+    json.dump(manifest, f)
+
+# Spot-check against the exact count on a full build
+if not args.append:
+    approx = hll.estimate(con, f"read_parquet('{os.path.join(HLL_DIR, 'providers.parquet')}')")
+    exact = con.execute("SELECT COUNT(DISTINCT npi) FROM src").fetchone()[0]
+    print(f"\nBilling NPIs: exact {exact:,}, sketch {approx:,} (standard error {hll.standard_error():.1%})")
+con.close()
+print(f"Done in {time.time() - t0:.1f}s -> {HLL_DIR}")
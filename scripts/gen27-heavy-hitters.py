@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Heavy-hitter summaries (top billing NPIs by paid) for the rollup cube; see heavy_hitters.py.
+
+One scan aggregates code x state x month x npi, then three summaries are kept
+in HH_DIR, each holding the top K NPIs per cell plus a per-cell error bound:
+
+  code_state_year.parquet  code x state x year   (K = 50)
+  code_month.parquet       code x month          (K = 50)
+  state_month.parquet      state x month         (K = 100)
+  manifest.json            months already loaded
+
+A full build reads the canonical dataset (gen25-canonicalize.py) when it is at
+least as new as PARQUET: the scan groups integer ids and only the aggregate is
+decoded. --append, or a missing/stale canonical copy, reads the parquet file.
+
+Top-K for any code / state / month / year slice merges the matching cells
+(scripts/query-service.py: GET /top?code=&state=&month=&year=). --append folds
+new months in place: month cells are added, year cells are merged and
+re-truncated with their error bounds summed.
+
+Run:
+  python3 scripts/gen27-heavy-hitters.py                          # full build from PARQUET
+  python3 scripts/gen27-heavy-hitters.py --append 2025-01.parquet   # merge new month(s)
+"""
+import json, os, time, argparse
+import heavy_hitters as hh
+import canonical
+from duckdb_session import connect
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+HH_DIR = os.path.expanduser("~/.openclaw/workspace/rollups/heavy-hitters")
+MANIFEST = os.path.join(HH_DIR, 'manifest.json')
+
+# summary -> (cell keys, K)
+SUMMARIES = {
+    'code_state_year': (['code', 'state', 'year'], 50),
+    'code_month': (['code', 'month'], 50),
+    'state_month': (['state', 'month'], 100),
+}
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--append', metavar='PARQUET', help='merge rows from a new monthly parquet file into the summaries')
+args = parser.parse_args()
+os.makedirs(HH_DIR, exist_ok=True)
+
+manifest = {'months': [], 'k': {name: k for name, (_, k) in SUMMARIES.items()}}
+if args.append and os.path.exists(MANIFEST):
+    with open(MANIFEST) as f:
+        manifest = json.load(f)
+
+con = connect('scan')
+source = args.append or PARQUET
+use_canonical = not args.append and canonical.available(PARQUET)
+if use_canonical:
+    canonical.register(con)
+    months = [r[0] for r in con.execute("SELECT month FROM months ORDER BY 1").fetchall()]
+else:
+    months = [r[0] for r in con.execute(
+        f"SELECT DISTINCT CAST(CLAIM_FROM_MONTH AS VARCHAR) FROM read_parquet('{source}') ORDER BY 1").fetchall()]
+overlap = sorted(set(months) & set(manifest['months']))
+if overlap:
+    raise SystemExit(f"Summaries already contain {overlap[0]}..{overlap[-1]}; refusing to double-count")
+
+t0 = time.time()
+print(f"Scanning {canonical.CANONICAL_DIR if use_canonical else source} ({len(months)} months)...")
+con.execute("""
+    CREATE TEMP TABLE src AS
+    WITH agg AS (
+        SELECT code_id, state_id, month_idx, billing_npi, SUM(paid) AS paid, SUM(claims) AS claims
+        FROM claims GROUP BY ALL
+    )
+    SELECT c.code, s.state, m.month, m.year, CAST(a.billing_npi AS VARCHAR) AS npi, a.paid, a.claims
+    FROM agg a
+    LEFT JOIN codes c USING (code_id)
+    LEFT JOIN states s USING (state_id)
+    LEFT JOIN months m USING (month_idx)
+""" if use_canonical else f"""
+    CREATE TEMP TABLE src AS
+    SELECT
+        HCPCS_CODE AS code,
+        COALESCE(NULLIF(BILLING_PROVIDER_STATE_CD, ''), 'UNKNOWN') AS state,
+        CAST(CLAIM_FROM_MONTH AS VARCHAR) AS month,
+        CAST(LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) AS SMALLINT) AS year,
+        BILLING_PROVIDER_NPI_NUM AS npi,
+        SUM(TOTAL_PAID) AS paid,
+        SUM(TOTAL_CLAIMS) AS claims
+    FROM read_parquet('{source}')
+    GROUP BY ALL
+""", label='scan code x state x month x npi')
+
+for name, (keys, k) in SUMMARIES.items():
+    path = os.path.join(HH_DIR, f'{name}.parquet')
+    inp = hh.exact_input_sql('src', keys)
+    if args.append and os.path.exists(path):
+        if manifest['k'].get(name) != k:
+            raise SystemExit(f"{name} was built with K={manifest['k'].get(name)}, now {k}; rebuild without --append")
+        inp = f"SELECT *, 'old' AS src FROM read_parquet('{path}') UNION ALL BY NAME {inp}"
+    sql = hh.summarize_sql(inp, keys, k)
+    con.execute(f"COPY ({sql} ORDER BY {', '.join(keys)}, paid DESC) TO '{path}.tmp' (FORMAT PARQUET)",
+                label=f'summary {name}')
+    os.replace(f'{path}.tmp', path)
+    n_cells, n_rows, n_exact = con.execute(f"""
+        SELECT COUNT(DISTINCT ({', '.join(keys)})), COUNT(*),
+               COUNT(DISTINCT ({', '.join(keys)})) FILTER (WHERE cell_error = 0)
+        FROM read_parquet(?)""", [path]).fetchone()
+    print(f"  {name}: {n_cells:,} cells ({n_exact:,} exact), {n_rows:,} rows "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+con.execute("DROP TABLE src")
+
+manifest['months'] = sorted(set(manifest['months']) | set(months))
+with open(MANIFEST, 'w') as f:
+    json.dump(manifest, f)
+con.close()
+print(f"\nDone in {time.time() - t0:.1f}s -> {HH_DIR}")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Robust peer-cohort statistics for every billing provider.
+
+ml-v3-retrain.py compares providers to specialty and state peers with mean and
+STDDEV, which a handful of very large billers drag around. This ranks each
+provider within four cohorts -- specialty, state, specialty x state and primary
+HCPCS code (the code it was paid most for) -- on four metrics, all in one
+multi-window DuckDB query over the gen23 rollups:
+
+  {metric}Pct{Cohort}   percent_rank within the cohort (0 = lowest, 1 = highest)
+  {metric}RobustZ{Cohort}
+                        (x - cohort median) / (1.4826 * cohort MAD); NULL when
+                        the MAD is 0
+  peers{Cohort}         cohort size
+
+metrics: paid, costPerClaim, costPerBene, claimsPerBene. Cohorts with fewer
+than MIN_PEERS providers (with a value for the metric) get NULL.
+
+Output: ROLLUP_DIR/peer_stats.parquet, one row per NPI, sorted by npi. Read by
+query-service.py (/providers/{npi}/peers) and available as a feature table.
+
+Run after gen23-rollups.py: python3 scripts/gen28-peer-stats.py
+"""
+import os, time
+from duckdb_session import connect
+
+ROLLUP_DIR = os.path.expanduser("~/.openclaw/workspace/rollups")
+OUT = os.path.join(ROLLUP_DIR, 'peer_stats.parquet')
+ROW_GROUP_SIZE = 16384
+MIN_PEERS = 5
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normal data
+
+METRICS = {
+    'paid': 'totalPaid',
+    'costPerClaim': 'totalPaid / NULLIF(totalClaims, 0)',
+    'costPerBene': 'totalPaid / NULLIF(totalBeneficiaries, 0)',
+    'claimsPerBene': 'totalClaims / NULLIF(totalBeneficiaries, 0)',
+}
+COHORTS = {
+    'Specialty': 'specialty',
+    'State': 'state',
+    'SpecialtyState': 'specialty, state',
+    'Code': 'primaryCode',
+}
+
+for name in ('provider', 'provider_code'):
+    if not os.path.exists(os.path.join(ROLLUP_DIR, f'{name}.parquet')):
+        raise SystemExit(f"Missing {name}.parquet in {ROLLUP_DIR}; run scripts/gen23-rollups.py first")
+
+# One window per (cohort, metric) for the median / MAD / count, and one per
+# (cohort, metric) ordered by the metric for percent_rank; NULL metrics are
+# partitioned off so they do not take the top ranks.
+windows, cols = [], []
+for cohort, keys in COHORTS.items():
+    known = ' AND '.join(f"{k.strip()} IS NOT NULL" for k in keys.split(','))  # no cohort of unknowns
+    cols.append(f"CASE WHEN {known} THEN COUNT(*) OVER (PARTITION BY {keys}) END AS peers{cohort}")
+    for metric in METRICS:
+        w, wr = f"w_{metric}_{cohort}", f"r_{metric}_{cohort}"
+        windows.append(f"{w} AS (PARTITION BY {keys}, {metric} IS NULL)")
+        windows.append(f"{wr} AS (PARTITION BY {keys}, {metric} IS NULL ORDER BY {metric})")
+        ok = f"{known} AND {metric} IS NOT NULL AND COUNT(*) OVER {w} >= {MIN_PEERS}"
+        cols.append(f"CASE WHEN {ok} THEN percent_rank() OVER {wr} END AS {metric}Pct{cohort}")
+        cols.append(f"CASE WHEN {ok} THEN ({metric} - median({metric}) OVER {w}) "
+                    f"/ NULLIF({MAD_SCALE} * mad({metric}) OVER {w}, 0) END AS {metric}RobustZ{cohort}")
+
+con = connect('scan')
+t0 = time.time()
+print(f"Ranking providers in {len(COHORTS)} cohorts x {len(METRICS)} metrics (single window pass)...")
+con.execute(f"""
+    COPY (
+        WITH primary_code AS (
+            SELECT npi, arg_max(code, totalPaid) AS primaryCode
+            FROM read_parquet('{os.path.join(ROLLUP_DIR, 'provider_code.parquet')}')
+            GROUP BY npi
+        ),
+        m AS (
+            SELECT p.npi, p.specialty, p.state, c.primaryCode,
+                   {', '.join(f'CAST({expr} AS DOUBLE) AS {metric}' for metric, expr in METRICS.items())}
+            FROM read_parquet('{os.path.join(ROLLUP_DIR, 'provider.parquet')}') p
+            LEFT JOIN primary_code c USING (npi)
+            WHERE p.totalPaid > 0
+        )
+        SELECT npi, specialty, state, primaryCode, {', '.join(METRICS)},
+               {(',' + chr(10) + '               ').join(cols)}
+        FROM m
+        WINDOW {', '.join(windows)}
+        ORDER BY npi
+    ) TO '{OUT}.tmp' (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+""", label='peer stats')
+os.replace(f'{OUT}.tmp', OUT)
+
+n, ranked = con.execute(f"SELECT COUNT(*), COUNT(paidPctSpecialty) FROM read_parquet('{OUT}')").fetchone()
+print(f"  {n:,} providers, {ranked:,} with a specialty rank ({os.path.getsize(OUT) / 1e6:.1f} MB)")
+z = con.execute(f"""
+    SELECT COUNT(*) FILTER (WHERE paidRobustZSpecialty > 3.5),
+           COUNT(*) FILTER (WHERE costPerClaimRobustZSpecialtyState > 3.5)
+    FROM read_parquet('{OUT}')
+""").fetchone()
+print(f"  robust z > 3.5: {z[0]:,} on paid vs specialty, {z[1]:,} on cost per claim vs specialty x state")
+con.close()
+
+print(f"\nDone in {time.time() - t0:.1f}s -> {OUT}")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Billing while excluded: Medicaid payments to NPIs inside their LEIE exclusion window.
+
+Each LEIE row with an NPI becomes a month interval [start, end): start is the
+first calendar month that begins on or after EXCLDATE and end the month of
+REINDATE (open-ended when not reinstated), so only months wholly inside the
+exclusion count. Overlapping intervals for the same NPI are merged first
+(gaps-and-islands) so no month is counted twice.
+
+One scan of the claims file aggregates billing NPI x month and servicing
+NPI x month, restricted to excluded NPIs by a semi-join, and the result is
+range-joined to the intervals (npi equality plus month >= start AND month < end;
+DuckDB hashes on npi and applies the range per match, never a cross product).
+
+Outputs:
+  public/data/leie-billing-after-exclusion.json  summary + top TOP_N providers
+  public/data/fraud-billed-while-excluded.json   all flags (smart-watchlist format)
+  public/data/smart-watchlist.json               billed_while_excluded flag merged in
+
+Run: python3 scripts/gen29-leie-billing.py
+"""
+import os, csv
+from duckdb_session import connect
+from jsonout import write_json
+from watchlist import merge_flag
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+
+FLAG = 'billed_while_excluded'
+MIN_PAID = 0.0  # any payment inside the window is flagged
+TOP_N = 500
+
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+
+con = connect('scan')
+
+print("Building exclusion intervals from LEIE...")
+con.execute(f"""
+    CREATE TEMP TABLE excl AS
+    WITH leie AS (
+        SELECT
+            TRIM(NPI) AS npi,
+            TRIM(EXCLTYPE) AS excl_type,
+            TRY_STRPTIME(TRIM(EXCLDATE), '%Y%m%d')::DATE AS excl_date,
+            TRY_STRPTIME(TRIM(REINDATE), '%Y%m%d')::DATE AS rein_date,
+            TRY_STRPTIME(TRIM(WAIVERDATE), '%Y%m%d')::DATE AS waiver_date,
+            COALESCE(NULLIF(TRIM(BUSNAME), ''), TRIM(LASTNAME) || ', ' || TRIM(FIRSTNAME)) AS leie_name
+        FROM read_csv('{OIG_CSV}', header = true, all_varchar = true)
+        WHERE regexp_full_match(TRIM(NPI), '[0-9]{{10}}') AND TRIM(NPI) <> '0000000000'
+    ),
+    iv AS (
+        SELECT *,
+            strftime(date_trunc('month', excl_date - INTERVAL 1 DAY) + INTERVAL 1 MONTH, '%Y-%m') AS start_month,
+            COALESCE(strftime(rein_date, '%Y-%m'), '9999-12') AS end_month
+        FROM leie
+        WHERE excl_date IS NOT NULL
+    ),
+    ordered AS (
+        SELECT *, MAX(end_month) OVER (PARTITION BY npi ORDER BY start_month, end_month
+                                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS prev_end
+        FROM iv
+        WHERE start_month < end_month
+    ),
+    islands AS (
+        SELECT *, SUM(CASE WHEN prev_end IS NULL OR start_month > prev_end THEN 1 ELSE 0 END)
+                  OVER (PARTITION BY npi ORDER BY start_month, end_month ROWS UNBOUNDED PRECEDING) AS island
+        FROM ordered
+    )
+    SELECT
+        npi, island,
+        MIN(start_month) AS start_month,
+        MAX(end_month) AS end_month,
+        arg_min(excl_type, excl_date) AS excl_type,
+        MIN(excl_date) AS excl_date,
+        MAX(rein_date) AS rein_date,
+        MAX(waiver_date) AS waiver_date,
+        ANY_VALUE(leie_name) AS leie_name
+    FROM islands
+    GROUP BY npi, island
+""")
+n_iv, n_npi = con.execute("SELECT COUNT(*), COUNT(DISTINCT npi) FROM excl").fetchone()
+print(f"  {n_iv:,} intervals for {n_npi:,} NPIs")
+
+print("Joining billing and servicing months to exclusion windows (single scan)...")
+rows = con.execute(f"""
+    WITH hit AS (
+        SELECT
+            BILLING_PROVIDER_NPI_NUM AS billing_npi,
+            SERVICING_PROVIDER_NPI_NUM AS servicing_npi,
+            CAST(CLAIM_FROM_MONTH AS VARCHAR)[:7] AS month,
+            TOTAL_PAID AS paid,
+            TOTAL_CLAIMS AS claims
+        FROM read_parquet('{PARQUET}')
+        WHERE BILLING_PROVIDER_NPI_NUM IN (SELECT npi FROM excl)
+           OR SERVICING_PROVIDER_NPI_NUM IN (SELECT npi FROM excl)
+    ),
+    role_month AS (
+        SELECT billing_npi AS npi, 'billing' AS role, month, SUM(paid) AS paid, SUM(claims) AS claims
+        FROM hit GROUP BY ALL
+        UNION ALL
+        SELECT servicing_npi, 'servicing', month, SUM(paid), SUM(claims)
+        FROM hit WHERE servicing_npi IS NOT NULL GROUP BY ALL
+    )
+    SELECT
+        m.npi, m.role,
+        arg_min(e.excl_type, e.excl_date) AS excl_type,
+        MIN(e.excl_date) AS excl_date,
+        MAX(e.rein_date) AS rein_date,
+        MAX(e.waiver_date) AS waiver_date,
+        ANY_VALUE(e.leie_name) AS leie_name,
+        COUNT(*) AS months,
+        MIN(m.month) AS first_month,
+        MAX(m.month) AS last_month,
+        SUM(m.paid) AS paid,
+        SUM(m.claims) AS claims
+    FROM role_month m
+    JOIN excl e ON m.npi = e.npi AND m.month >= e.start_month AND m.month < e.end_month
+    GROUP BY m.npi, m.role
+    HAVING SUM(m.paid) > {MIN_PAID}
+""", label='exclusion range join').fetchall()
+con.close()
+
+flags = {}
+for npi, role, excl_type, excl_date, rein_date, waiver_date, leie_name, months, first, last, paid, claims in rows:
+    info = npi_info.get(npi, {})
+    fl = flags.setdefault(npi, {
+        'npi': npi,
+        'name': info.get('provider_name', '') or leie_name or '',
+        'specialty': info.get('taxonomy_description', ''),
+        'city': info.get('city', ''),
+        'state': info.get('state', ''),
+        'exclType': excl_type,
+        'exclDate': excl_date.strftime('%Y%m%d'),
+        'reinDate': rein_date.strftime('%Y%m%d') if rein_date else None,
+        'waiver': waiver_date is not None,
+        'billedPaid': 0.0, 'billedClaims': 0, 'billedMonths': 0,
+        'servicedPaid': 0.0, 'servicedClaims': 0, 'servicedMonths': 0,
+        'firstMonth': first, 'lastMonth': last,
+        'flag': FLAG,
+    })
+    key = 'billed' if role == 'billing' else 'serviced'
+    fl[f'{key}Paid'] = round(float(paid), 2)
+    fl[f'{key}Claims'] = int(claims)
+    fl[f'{key}Months'] = int(months)
+    fl['firstMonth'] = min(fl['firstMonth'], first)
+    fl['lastMonth'] = max(fl['lastMonth'], last)
+for fl in flags.values():
+    # self-billed rows appear under both roles, so the larger side is the exposure, not the sum
+    fl['totalPaid'] = max(fl['billedPaid'], fl['servicedPaid'])
+    fl['role'] = ('both' if fl['billedMonths'] and fl['servicedMonths']
+                  else 'billing' if fl['billedMonths'] else 'servicing')
+flags = sorted(flags.values(), key=lambda x: -x['totalPaid'])
+print(f"  {len(flags):,} excluded NPIs paid inside their exclusion window")
+
+write_json(os.path.join(OUT, 'leie-billing-after-exclusion.json'), {
+    'excludedNpis': n_npi,
+    'exclusionIntervals': n_iv,
+    'providersPaidWhileExcluded': len(flags),
+    'billedPaid': round(sum(f['billedPaid'] for f in flags), 2),
+    'servicedPaid': round(sum(f['servicedPaid'] for f in flags), 2),
+    'withWaiver': sum(f['waiver'] for f in flags),
+    'providers': flags[:TOP_N],
+})
+write_json(os.path.join(OUT, f'fraud-{FLAG.replace("_", "-")}.json'), flags)
+
+# ============================================
+# Merge into smart watchlist (re-runs replace the previous billed_while_excluded flag)
+# ============================================
+print("Merging into smart-watchlist.json...")
+watchlist = merge_flag(OUT, FLAG, flags)
+
+print(f"\nWrote {min(len(flags), TOP_N)} to leie-billing-after-exclusion.json, {len(flags)} to "
+      f"fraud-{FLAG.replace('_', '-')}.json; smart watchlist now {len(watchlist)} providers")
+for p in flags[:10]:
+    print(f"  NPI {p['npi']} ({p['exclType']}, excluded {p['exclDate']}): ${p['totalPaid']:,.0f} "
+          f"{p['firstMonth']}..{p['lastMonth']} as {p['role']}")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Offline NPPES ingest: every NPI from the CMS bulk file, no registry API calls.
+
+gen6/gen12/lookup-missing-names.py fetch names one NPI at a time from
+npiregistry.cms.hhs.gov, so only a few thousand providers ever get enriched.
+This reads the NPPES full dissemination file (npidata_pfile_*.csv, ~10GB, 330
+columns) from local disk instead. DuckDB's CSV reader streams it in buffer-sized
+chunks and only the columns in COLUMNS are materialized; the result is written
+as a directory of parquet files (FILE_SIZE_BYTES each) plus meta.json:
+
+  NPPES_DIR/npi_*.parquet   npi, entityType (NPI-1/NPI-2), name, orgName,
+                            lastName, firstName, middleName, credential,
+                            taxonomyCode, taxonomyDescription (primary taxonomy),
+                            address, city, state, zip (5-digit), enumerationDate,
+                            lastUpdate, deactivationDate
+  NPPES_DIR/meta.json       source file, size, row count, build time
+
+Taxonomy descriptions come from the NUCC code set CSV (--taxonomy, Classification
+plus Specialization, as the registry API reports them); without it only the code
+is kept in the parquet, and the enrich step keeps an NPI's existing
+taxonomy_description rather than replacing it with the bare code.
+
+Unless --no-enrich is given, every distinct billing and servicing NPI in the
+claims file is then hash-joined to the parquet and reference-data/
+npi_lookups_expanded.csv is rewritten with all of them (plus a zip column for
+gen21-geo-rollup.py). NPIs missing from NPPES keep their existing row, so the
+API scripts only have leftovers to look up.
+
+Run: python3 scripts/gen30-nppes-ingest.py npidata_pfile_YYYYMMDD-YYYYMMDD.csv [--taxonomy nucc_taxonomy.csv]
+"""
+import argparse, json, os, shutil, time
+from duckdb_session import connect
+from npi_lookups import read_lookups, write_lookups
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+NPPES_DIR = os.path.expanduser("~/.openclaw/workspace/nppes")
+REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
+NPI_CSV = os.path.join(REF, 'npi_lookups_expanded.csv')
+FILE_SIZE_BYTES = '256MB'
+ROW_GROUP_SIZE = 65536
+N_TAXONOMY = 15  # NPPES repeats taxonomy columns _1 .. _15
+
+# output column -> NPPES header
+COLUMNS = {
+    'npi': 'NPI',
+    'entity': 'Entity Type Code',
+    'orgName': 'Provider Organization Name (Legal Business Name)',
+    'lastName': 'Provider Last Name (Legal Name)',
+    'firstName': 'Provider First Name',
+    'middleName': 'Provider Middle Name',
+    'credential': 'Provider Credential Text',
+    'address': 'Provider First Line Business Practice Location Address',
+    'city': 'Provider Business Practice Location Address City Name',
+    'state': 'Provider Business Practice Location Address State Name',
+    'postal': 'Provider Business Practice Location Address Postal Code',
+    'enumerationDate': 'Provider Enumeration Date',
+    'lastUpdate': 'Last Update Date',
+    'deactivationDate': 'NPI Deactivation Date',
+    **{f'tax{k}': f'Healthcare Provider Taxonomy Code_{k}' for k in range(1, N_TAXONOMY + 1)},
+    **{f'primary{k}': f'Healthcare Provider Primary Taxonomy Switch_{k}' for k in range(1, N_TAXONOMY + 1)},
+}
+
+parser = argparse.ArgumentParser(description='Ingest the NPPES bulk file into parquet and enrich NPI lookups')
+parser.add_argument('nppes_csv', help='NPPES full dissemination CSV (npidata_pfile_*.csv)')
+parser.add_argument('--taxonomy', default=os.path.join(REF, 'nucc_taxonomy.csv'),
+                    help='NUCC taxonomy code set CSV (Code, Classification, Specialization)')
+parser.add_argument('--no-enrich', action='store_true', help='only write the parquet directory')
+args = parser.parse_args()
+
+t0 = time.time()
+con = connect('scan')
+
+
+def q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def nz(col):
+    return f"NULLIF(TRIM({col}), '')"
+
+
+has_taxonomy = os.path.exists(args.taxonomy)
+con.execute(f"""
+    CREATE TEMP TABLE taxonomy AS
+    SELECT TRIM(Code) AS code,
+           TRIM(Classification) || COALESCE(', ' || NULLIF(TRIM(Specialization), ''), '') AS description
+    FROM read_csv('{args.taxonomy}', header = true, all_varchar = true)
+""" if has_taxonomy else "CREATE TEMP TABLE taxonomy (code VARCHAR, description VARCHAR)")
+print(f"Taxonomy descriptions: {con.execute('SELECT COUNT(*) FROM taxonomy').fetchone()[0]:,}"
+      + ('' if has_taxonomy else f" ({args.taxonomy} not found; codes only)"))
+
+# primary taxonomy: the slot switched 'Y', else the first one filled in
+primary = ('CASE ' + ' '.join(f"WHEN primary{k} = 'Y' THEN {nz(f'tax{k}')}" for k in range(1, N_TAXONOMY + 1))
+           + f" ELSE {nz('tax1')} END")
+date = "TRY_STRPTIME(NULLIF(TRIM({}), ''), '%m/%d/%Y')::DATE"
+
+stage = NPPES_DIR + '.tmp'
+shutil.rmtree(stage, ignore_errors=True)
+print(f"Streaming {args.nppes_csv} ({os.path.getsize(args.nppes_csv) / 1e9:.1f} GB) -> {NPPES_DIR}...")
+con.execute(f"""
+    COPY (
+        WITH raw AS (
+            SELECT {', '.join(f'{q(src)} AS {col}' for col, src in COLUMNS.items())}
+            FROM read_csv('{args.nppes_csv}', header = true, all_varchar = true)
+        ),
+        p AS (
+            SELECT *, {primary} AS taxonomyCode FROM raw
+        )
+        SELECT
+            TRIM(p.npi) AS npi,
+            CASE TRIM(entity) WHEN '1' THEN 'NPI-1' WHEN '2' THEN 'NPI-2' END AS entityType,
+            COALESCE({nz('orgName')}, NULLIF(CONCAT_WS(' ', {nz('firstName')}, {nz('middleName')}, {nz('lastName')}), '')) AS name,
+            {nz('orgName')} AS orgName,
+            {nz('lastName')} AS lastName,
+            {nz('firstName')} AS firstName,
+            {nz('middleName')} AS middleName,
+            {nz('credential')} AS credential,
+            taxonomyCode,
+            t.description AS taxonomyDescription,
+            {nz('address')} AS address,
+            {nz('city')} AS city,
+            {nz('state')} AS state,
+            NULLIF(LEFT(TRIM(postal), 5), '') AS zip,
+            {date.format('enumerationDate')} AS enumerationDate,
+            {date.format('lastUpdate')} AS lastUpdate,
+            {date.format('deactivationDate')} AS deactivationDate
+        FROM p LEFT JOIN taxonomy t ON t.code = p.taxonomyCode
+    ) TO '{stage}' (FORMAT PARQUET, FILE_SIZE_BYTES '{FILE_SIZE_BYTES}', ROW_GROUP_SIZE {ROW_GROUP_SIZE},
+                    FILENAME_PATTERN 'npi_{{i}}')
+""", label='nppes ingest')
+
+n, n_org, n_deact = con.execute(f"""
+    SELECT COUNT(*), COUNT(*) FILTER (WHERE entityType = 'NPI-2'), COUNT(deactivationDate)
+    FROM read_parquet('{stage}/*.parquet')
+""").fetchone()
+with open(os.path.join(stage, 'meta.json'), 'w') as f:
+    json.dump({
+        'source': os.path.abspath(args.nppes_csv),
+        'sourceBytes': os.path.getsize(args.nppes_csv),
+        'sourceMtime': os.path.getmtime(args.nppes_csv),
+        'taxonomy': os.path.abspath(args.taxonomy) if has_taxonomy else None,
+        'nProviders': n,
+        'nOrganizations': n_org,
+        'nDeactivated': n_deact,
+        'builtAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }, f, indent=2)
+if os.path.exists(NPPES_DIR):
+    shutil.rmtree(NPPES_DIR)
+os.replace(stage, NPPES_DIR)
+size = sum(os.path.getsize(os.path.join(NPPES_DIR, fn)) for fn in os.listdir(NPPES_DIR))
+print(f"  {n:,} NPIs ({n_org:,} organizations, {n_deact:,} deactivated), {size / 1e6:.0f} MB "
+      f"in {time.time() - t0:.1f}s")
+
+if not args.no_enrich:
+    print("Enriching every billing and servicing NPI (hash join against NPPES)...")
+    existing, fields = read_lookups(NPI_CSV)
+    rows = con.execute(f"""
+        WITH claims AS (
+            SELECT DISTINCT npi FROM (
+                SELECT BILLING_PROVIDER_NPI_NUM AS npi FROM read_parquet('{PARQUET}')
+                UNION ALL
+                SELECT SERVICING_PROVIDER_NPI_NUM FROM read_parquet('{PARQUET}')
+            ) WHERE npi IS NOT NULL AND npi <> ''
+        )
+        SELECT c.npi, n.name, n.entityType, n.taxonomyDescription, n.taxonomyCode, n.city, n.state, n.zip
+        FROM claims c JOIN read_parquet('{NPPES_DIR}/*.parquet') n ON n.npi = c.npi
+    """, label='nppes enrich').fetchall()
+
+    found = 0
+    for npi, name, entity, tax_desc, tax_code, city, state, zip5 in rows:
+        old = existing.get(npi, {})
+        if not name and old:
+            continue  # deactivated in NPPES (fields blanked); keep the name we already have
+        # a code without a NUCC description would overwrite a registry description; keep the old one
+        existing[npi] = {**old, 'npi': npi, 'provider_name': name, 'entity_type': entity or '',
+                         'taxonomy_description': tax_desc or old.get('taxonomy_description') or tax_code or '',
+                         'city': city or '', 'state': state or '', 'zip': zip5 or ''}
+        found += 1
+    write_lookups(NPI_CSV, [existing[npi] for npi in sorted(existing)], fields)
+    print(f"  {found:,} NPIs from NPPES; npi_lookups_expanded.csv now {len(existing):,} rows")
+
+con.close()
+print(f"\nDone in {time.time() - t0:.1f}s -> {NPPES_DIR}")
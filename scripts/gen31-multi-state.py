@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Multi-state billing: NPIs paid by Medicaid in several states at once or hopping between them.
+
+ml-v3-retrain.py keeps MAX(BILLING_PROVIDER_STATE_CD) per NPI, so a provider
+billing in three states looks like a one-state provider. One GROUPING SETS
+scan of the claims file builds provider x state x month totals for both roles
+(billing NPI and servicing NPI; the state is always the billing provider's
+state on the claim line) and writes them to ROLLUP_DIR/provider_state_month.parquet.
+The detector then works off that small table:
+
+  concurrent month  the NPI was paid in >= 2 states that month, each with at least
+                    MIN_STATE_SHARE of the month's paid (keeps a stray border
+                    claim from counting)
+  state hop         the state with the most paid changes from one active month
+                    to the next
+
+An NPI/role is flagged with >= MIN_CONCURRENT_MONTHS concurrent months or
+>= MIN_HOPS hops, and at least MIN_PAID paid overall.
+
+Outputs:
+  ~/.openclaw/workspace/rollups/provider_state_month.parquet
+                                           role, npi, state, month, totals
+  public/data/multi-state-billing.json     top TOP_N flagged NPIs + per-state counts
+  public/data/fraud-multi-state-billing.json
+                                           all flags (smart-watchlist format; one
+                                           record per NPI and role)
+  public/data/smart-watchlist.json         multi_state_billing flag merged in
+  public/data/geographic-risk.json         multiStateProviders / multiStatePaid per state
+
+Run: python3 scripts/gen31-multi-state.py
+"""
+import json, os, csv
+from collections import defaultdict
+from duckdb_session import connect
+from jsonout import write_json
+from watchlist import merge_flag
+
+PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
+ROLLUP_DIR = os.path.expanduser("~/.openclaw/workspace/rollups")
+ROLLUP = os.path.join(ROLLUP_DIR, 'provider_state_month.parquet')
+OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+ROW_GROUP_SIZE = 16384
+
+FLAG = 'multi_state_billing'
+MIN_STATE_SHARE = 0.05
+MIN_CONCURRENT_MONTHS = 3
+MIN_HOPS = 3
+MIN_PAID = 10000
+TOP_N = 500
+os.makedirs(ROLLUP_DIR, exist_ok=True)
+
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+
+con = connect('scan')
+
+print("Aggregating billing and servicing NPI x state x month (single scan)...")
+con.execute(f"""
+    COPY (
+        SELECT
+            CASE WHEN GROUPING(npi) = 0 THEN 'billing' ELSE 'servicing' END AS role,
+            COALESCE(npi, snpi) AS npi,
+            state, month,
+            SUM(paid) AS totalPaid,
+            SUM(claims) AS totalClaims
+        FROM (
+            SELECT
+                BILLING_PROVIDER_NPI_NUM AS npi,
+                SERVICING_PROVIDER_NPI_NUM AS snpi,
+                BILLING_PROVIDER_STATE_CD AS state,
+                CAST(CLAIM_FROM_MONTH AS VARCHAR) AS month,
+                TOTAL_PAID AS paid,
+                TOTAL_CLAIMS AS claims
+            FROM read_parquet('{PARQUET}')
+            WHERE NULLIF(BILLING_PROVIDER_STATE_CD, '') IS NOT NULL
+        )
+        GROUP BY GROUPING SETS ((npi, state, month), (snpi, state, month))
+        HAVING COALESCE(npi, snpi) IS NOT NULL
+        ORDER BY 2, 1, 4, 3  -- npi, role, month, state
+    ) TO '{ROLLUP}.tmp' (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+""", label='provider state month')
+os.replace(f'{ROLLUP}.tmp', ROLLUP)
+n = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [ROLLUP]).fetchone()[0]
+print(f"  provider_state_month: {n:,} rows ({os.path.getsize(ROLLUP) / 1e6:.1f} MB)")
+
+print("Detecting concurrent multi-state months and state hops...")
+rows = con.execute(f"""
+    WITH psm AS (
+        SELECT *, totalPaid / NULLIF(SUM(totalPaid) OVER (PARTITION BY role, npi, month), 0) AS share
+        FROM read_parquet('{ROLLUP}')
+    ),
+    monthly AS (
+        SELECT role, npi, month,
+               COUNT(*) FILTER (WHERE share >= {MIN_STATE_SHARE}) AS states,
+               arg_max(state, totalPaid) AS top_state
+        FROM psm GROUP BY role, npi, month
+    ),
+    hops AS (
+        SELECT role, npi,
+               COUNT(*) FILTER (WHERE states >= 2) AS concurrent_months,
+               COUNT(*) FILTER (WHERE prev_state IS NOT NULL AND top_state <> prev_state) AS hops,
+               MAX(states) AS max_states,
+               COUNT(*) AS active_months
+        FROM (
+            SELECT *, LAG(top_state) OVER (PARTITION BY role, npi ORDER BY month) AS prev_state
+            FROM monthly
+        )
+        GROUP BY role, npi
+    ),
+    by_state AS (
+        SELECT role, npi, state, SUM(totalPaid) AS paid, COUNT(*) AS months
+        FROM psm GROUP BY role, npi, state
+    )
+    SELECT h.role, h.npi, h.concurrent_months, h.hops, h.max_states, h.active_months,
+           SUM(s.paid) AS total_paid,
+           list({{'state': s.state, 'totalPaid': s.paid, 'months': s.months}} ORDER BY s.paid DESC) AS states
+    FROM hops h JOIN by_state s USING (role, npi)
+    WHERE h.concurrent_months >= {MIN_CONCURRENT_MONTHS} OR h.hops >= {MIN_HOPS}
+    GROUP BY ALL
+    HAVING SUM(s.paid) >= {MIN_PAID}
+""", label='multi-state detector').fetchall()
+con.close()
+
+flags = []
+for role, npi, concurrent, hops, max_states, active, total_paid, states in rows:
+    info = npi_info.get(npi, {})
+    flags.append({
+        'npi': npi,
+        'name': info.get('provider_name', ''),
+        'specialty': info.get('taxonomy_description', ''),
+        'city': info.get('city', ''),
+        'state': states[0]['state'],  # state with the most paid
+        'role': role,
+        'statesCount': len(states),
+        'maxStatesInMonth': int(max_states),
+        'concurrentMonths': int(concurrent),
+        'stateHops': int(hops),
+        'activeMonths': int(active),
+        'totalPaid': round(float(total_paid), 2),
+        'states': [{'state': s['state'], 'totalPaid': round(float(s['totalPaid']), 2), 'months': int(s['months'])}
+                   for s in states],
+        'flag': FLAG,
+    })
+flags.sort(key=lambda x: (-x['concurrentMonths'], -x['totalPaid']))
+print(f"  {len(flags):,} flags ({sum(f['role'] == 'billing' for f in flags):,} billing, "
+      f"{sum(f['role'] == 'servicing' for f in flags):,} servicing)")
+
+# per-state view: flagged NPIs (either role, counted once) that were paid in the state
+state_npis, state_paid = defaultdict(set), defaultdict(float)
+for fl in flags:
+    for s in fl['states']:
+        if fl['npi'] not in state_npis[s['state']]:
+            state_npis[s['state']].add(fl['npi'])
+            state_paid[s['state']] += s['totalPaid']
+
+write_json(os.path.join(OUT, 'multi-state-billing.json'), {
+    'flaggedNpis': len({f['npi'] for f in flags}),
+    'billingFlags': sum(f['role'] == 'billing' for f in flags),
+    'servicingFlags': sum(f['role'] == 'servicing' for f in flags),
+    'thresholds': {'minStateShare': MIN_STATE_SHARE, 'minConcurrentMonths': MIN_CONCURRENT_MONTHS,
+                   'minHops': MIN_HOPS, 'minPaid': MIN_PAID},
+    'byState': sorted(({'state': st, 'providers': len(npis), 'totalPaid': round(state_paid[st], 2)}
+                       for st, npis in state_npis.items()), key=lambda x: -x['providers']),
+    'providers': flags[:TOP_N],
+})
+write_json(os.path.join(OUT, f'fraud-{FLAG.replace("_", "-")}.json'), flags)
+
+# ============================================
+# Merge into smart watchlist (re-runs replace the previous multi_state_billing flag)
+# ============================================
+print("Merging into smart-watchlist.json...")
+watchlist = merge_flag(OUT, FLAG, flags)
+
+geo_path = os.path.join(OUT, 'geographic-risk.json')
+if os.path.exists(geo_path):
+    with open(geo_path) as f:
+        geo_risk = json.load(f)
+    for g in geo_risk:
+        g['multiStateProviders'] = len(state_npis.get(g['state'], ()))
+        g['multiStatePaid'] = round(state_paid.get(g['state'], 0))
+    write_json(geo_path, geo_risk)
+    print(f"  geographic-risk.json: multi-state counts on {len(geo_risk)} states")
+else:
+    print("  (skipping missing geographic-risk.json)")
+
+print(f"\nWrote {min(len(flags), TOP_N)} to multi-state-billing.json, {len(flags)} to "
+      f"fraud-{FLAG.replace('_', '-')}.json; smart watchlist now {len(watchlist)} providers")
+for p in flags[:10]:
+    print(f"  NPI {p['npi']} ({p['role']}): {p['statesCount']} states, {p['concurrentMonths']} concurrent months, "
+          f"{p['stateHops']} hops, ${p['totalPaid']:,.0f}")
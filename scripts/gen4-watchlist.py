@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Step 4: Watchlist data"""
-import duckdb, json, os, csv
+import os, csv
+from duckdb_session import connect
+from jsonout import write_json
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), "..", "public", "data")
 REF = os.path.join(os.path.dirname(__file__), "..", "reference-data")
@@ -17,7 +19,7 @@ with open(os.path.join(REF,"5_multi_flag_providers.csv")) as f:
         multi_flags.append(row)
 print(f"Loaded {len(multi_flags)} flagged providers")
 print(f"Sample row: {multi_flags[0]}")
-con = duckdb.connect()
+con = connect('scan')
 watchlist = []
 for mf in multi_flags:
     npi = mf.get("npi") or mf.get("BILLING_PROVIDER_NPI_NUM") or list(mf.values())[0]
@@ -34,5 +36,5 @@ for mf in multi_flags:
     print(f"  {npi}: ${r[0]:,.0f}" if r[0] else f"  {npi}: no data")
 con.close()
 watchlist.sort(key=lambda x: (-x["flagCount"], -x["totalPaid"]))
-with open(os.path.join(OUT,"watchlist.json"),"w") as f: json.dump(watchlist,f)
+write_json(os.path.join(OUT,"watchlist.json"), watchlist)
 print(f"Done: {len(watchlist)} watchlist entries")
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Step 5: Provider detail files for top + watchlist NPIs"""
-import duckdb, json, os, csv
+import json, os, csv
+from duckdb_session import connect
+from jsonout import write_json
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), "..", "public", "data", "providers")
 REF = os.path.join(os.path.dirname(__file__), "..", "reference-data")
@@ -19,14 +21,14 @@ with open(os.path.join(os.path.dirname(__file__),"..","public","data","watchlist
     for p in json.load(f): npis.add(p["npi"])
 print(f"Processing {len(npis)} providers...")
 
-con = duckdb.connect()
+con = connect('scan')
 for npi in npis:
     try:
         rows = con.execute(f"SELECT HCPCS_CODE, SUM(TOTAL_PAID), SUM(TOTAL_CLAIMS), SUM(TOTAL_UNIQUE_BENEFICIARIES) FROM read_parquet('{PARQUET}') WHERE BILLING_PROVIDER_NPI_NUM = '{npi}' GROUP BY 1 ORDER BY 2 DESC LIMIT 10").fetchall()
         info = npi_info.get(npi, {})
         detail = {"npi":npi,"name":info.get("name","Provider "+npi),"specialty":info.get("specialty",""),"city":info.get("city",""),"state":info.get("state",""),"entityType":info.get("entityType",""),
             "topProcedures":[{"code":r[0],"paid":r[1],"claims":r[2],"benes":r[3]} for r in rows]}
-        with open(os.path.join(OUT,f"{npi}.json"),"w") as f: json.dump(detail,f)
+        write_json(os.path.join(OUT,f"{npi}.json"), detail)
     except Exception as e:
         print(f"  Error {npi}: {e}")
 con.close()
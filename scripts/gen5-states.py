@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
-"""Generate state-level stats by joining parquet data with NPI lookups."""
-import duckdb
-import json
+"""
+Generate state-level stats for every provider from BILLING_PROVIDER_STATE_CD.
+
+One GROUPING SETS scan over the parquet aggregates all rows by state x provider,
+state x code, state x specialty, state x month and state, plus the national
+yearly totals. Per-state top-N lists are then cut with a window over that
+small result, so there are no per-state queries and no dependency on which
+providers happen to be in the NPI lookups.
+"""
+from duckdb_session import connect
 import csv
 import os
+from name_utils import clean_name, clean_city
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
 OUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'states')
+STATE_PROV_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'state-providers')
 OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
 os.makedirs(OUT_DIR, exist_ok=True)
+os.makedirs(STATE_PROV_DIR, exist_ok=True)
+
+TOP_PROVIDERS = 50
+TOP_PROCEDURES = 20
+TOP_SPECIALTIES = 20
 
-# Load NPI lookups
+# Load NPI lookups (names/cities for the top providers only)
 npi_info = {}
 csv_path = os.path.join(REF, 'npi_lookups_expanded.csv')
 with open(csv_path) as f:
@@ -20,152 +35,139 @@ with open(csv_path) as f:
 
 print(f"Loaded {len(npi_info)} NPI lookups")
 
-con = duckdb.connect()
-
-# Get per-NPI totals for top 1000
-print("Getting top 1000 provider totals...")
-top_npis = con.execute(f"""
-    SELECT 
-        BILLING_PROVIDER_NPI_NUM as npi,
-        SUM(TOTAL_PAID) as total_payments,
-        SUM(TOTAL_CLAIMS) as total_claims,
-        SUM(TOTAL_UNIQUE_BENEFICIARIES) as total_benes,
-        COUNT(DISTINCT HCPCS_CODE) as proc_count,
-        COUNT(DISTINCT LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4)) as active_years,
-        MIN(CLAIM_FROM_MONTH) as first_month,
-        MAX(CLAIM_FROM_MONTH) as last_month
-    FROM read_parquet('{PARQUET}')
-    GROUP BY 1
-    ORDER BY 2 DESC
-    LIMIT 1000
-""").fetchall()
-
-# Build state aggregation from NPI lookups
-state_totals = {}
-providers_by_state = {}
-
-for row in top_npis:
-    npi = str(row[0])
-    info = npi_info.get(npi, {})
-    state = info.get('state', 'UNKNOWN')
-    if not state:
-        state = 'UNKNOWN'
-    
-    prov = {
-        'npi': npi,
-        'name': info.get('provider_name', ''),
-        'specialty': info.get('taxonomy_description', ''),
-        'city': info.get('city', ''),
-        'state': state,
-        'total_payments': round(float(row[1]), 2),
-        'total_claims': int(row[2]),
-        'total_benes': int(row[3]) if row[3] else 0,
-        'proc_count': int(row[4]),
-        'active_years': int(row[5]),
-        'first_month': str(row[6]),
-        'last_month': str(row[7]),
-        'cost_per_claim': round(float(row[1]) / max(int(row[2]), 1), 2),
-        'cost_per_bene': round(float(row[1]) / max(int(row[3]) if row[3] else 1, 1), 2),
-        'claims_per_bene': round(int(row[2]) / max(int(row[3]) if row[3] else 1, 1), 1)
-    }
-    
-    if state not in state_totals:
-        state_totals[state] = {'total_payments': 0, 'total_claims': 0, 'total_benes': 0, 'provider_count': 0}
-    state_totals[state]['total_payments'] += prov['total_payments']
-    state_totals[state]['total_claims'] += prov['total_claims']
-    state_totals[state]['total_benes'] += prov['total_benes']
-    state_totals[state]['provider_count'] += 1
-    
-    if state not in providers_by_state:
-        providers_by_state[state] = []
-    providers_by_state[state].append(prov)
-
-# Now get FULL state-level stats from parquet (no NPI join needed for this)
-print("Getting full state-level yearly trends...")
-# We can't get state from parquet directly, but we CAN get overall yearly trends
-yearly_overall = con.execute(f"""
-    SELECT 
-        LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) as year,
-        SUM(TOTAL_PAID) as payments,
-        SUM(TOTAL_CLAIMS) as claims,
-        COUNT(DISTINCT BILLING_PROVIDER_NPI_NUM) as providers
-    FROM read_parquet('{PARQUET}')
-    GROUP BY 1 ORDER BY 1
-""").fetchall()
-
-# Get top procedures per state using NPI mapping
-# For each state, get the NPIs in that state and query their procedures
-print("Getting per-state procedure breakdowns...")
-for state, provs in providers_by_state.items():
-    if state == 'UNKNOWN' or len(provs) == 0:
-        continue
-    
-    npi_list = [p['npi'] for p in provs[:50]]  # top 50 by spending
-    npi_str = ",".join([f"'{n}'" for n in npi_list])
-    
-    procs = con.execute(f"""
-        SELECT 
-            HCPCS_CODE as code,
-            SUM(TOTAL_PAID) as payments,
-            SUM(TOTAL_CLAIMS) as claims,
-            COUNT(DISTINCT BILLING_PROVIDER_NPI_NUM) as prov_count
-        FROM read_parquet('{PARQUET}')
-        WHERE CAST(BILLING_PROVIDER_NPI_NUM AS VARCHAR) IN ({npi_str})
-        GROUP BY 1
-        ORDER BY 2 DESC
-        LIMIT 20
-    """).fetchall()
-    
-    top_procs = [{'code': r[0], 'payments': round(float(r[1]),2), 
-                  'claims': int(r[2]), 'provider_count': int(r[3])} for r in procs]
-    
-    # Yearly trends for this state's providers
-    yearly = con.execute(f"""
-        SELECT 
-            LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) as year,
-            SUM(TOTAL_PAID) as payments,
-            SUM(TOTAL_CLAIMS) as claims
+con = connect('scan')
+
+# GROUPING(state, npi, code, ptype, month, yr) sets a bit for every column the
+# row is NOT grouped by (state is the high bit); the constants below name them.
+print("Aggregating all rows by state (single scan)...")
+con.execute(f"""
+    CREATE TEMP TABLE state_rollup AS
+    WITH src AS (
+        SELECT
+            COALESCE(NULLIF(BILLING_PROVIDER_STATE_CD, ''), 'UNKNOWN') AS state,
+            BILLING_PROVIDER_NPI_NUM AS npi,
+            HCPCS_CODE AS code,
+            COALESCE(NULLIF(BILLING_PROVIDER_TYPE, ''), 'Unknown') AS ptype,
+            CLAIM_FROM_MONTH AS month,
+            LEFT(CAST(CLAIM_FROM_MONTH AS VARCHAR), 4) AS yr,
+            TOTAL_PAID, TOTAL_CLAIMS, TOTAL_UNIQUE_BENEFICIARIES
         FROM read_parquet('{PARQUET}')
-        WHERE CAST(BILLING_PROVIDER_NPI_NUM AS VARCHAR) IN ({npi_str})
-        GROUP BY 1 ORDER BY 1
+    )
+    SELECT
+        GROUPING(state, npi, code, ptype, month, yr) AS grp,
+        state, npi, code, ptype, month, yr,
+        SUM(TOTAL_PAID) AS payments,
+        SUM(TOTAL_CLAIMS) AS claims,
+        SUM(TOTAL_UNIQUE_BENEFICIARIES) AS benes,
+        COUNT(DISTINCT npi) AS providers,
+        COUNT(DISTINCT code) AS codes,
+        COUNT(DISTINCT yr) AS years,
+        MIN(month) AS first_month,
+        MAX(month) AS last_month,
+        ANY_VALUE(ptype) AS any_ptype
+    FROM src
+    GROUP BY GROUPING SETS ((state, npi), (state, code), (state, ptype), (state, month), (state), (yr))
+""")
+
+LEVEL_NPI, LEVEL_CODE, LEVEL_PTYPE, LEVEL_MONTH, LEVEL_STATE, LEVEL_YEAR = 0b001111, 0b010111, 0b011011, 0b011101, 0b011111, 0b111110
+
+
+def top_n(level, n):
+    return con.execute(f"""
+        SELECT * FROM state_rollup
+        WHERE grp = {level}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY state ORDER BY payments DESC) <= {n}
+        ORDER BY state, payments DESC
     """).fetchall()
-    
-    yearly_trends = [{'year': r[0], 'payments': round(float(r[1]),2), 'claims': int(r[2])} for r in yearly]
-    
-    state_detail = {
-        'state': state,
+
+
+def level_rows(level, order):
+    return con.execute(f"SELECT * FROM state_rollup WHERE grp = {level} ORDER BY {order}").fetchall()
+
+# Row layout: grp, state, npi, code, ptype, month, yr, payments, claims, benes,
+#             providers, codes, years, first_month, last_month, any_ptype
+states = {}
+for r in level_rows(LEVEL_STATE, 'payments DESC'):
+    states[r[1]] = {
+        'state': r[1],
         'summary': {
-            'total_payments': round(state_totals[state]['total_payments'], 2),
-            'total_claims': state_totals[state]['total_claims'],
-            'total_benes': state_totals[state]['total_benes'],
-            'provider_count': state_totals[state]['provider_count']
+            'total_payments': round(float(r[7]), 2),
+            'total_claims': int(r[8]),
+            'total_benes': int(r[9] or 0),
+            'provider_count': int(r[10]),
+            'code_count': int(r[11]),
         },
-        'top_providers': sorted(provs, key=lambda x: x['total_payments'], reverse=True)[:50],
-        'top_procedures': top_procs,
-        'yearly_trends': yearly_trends
+        'top_providers': [], 'top_procedures': [], 'top_specialties': [],
+        'yearly_trends': [], 'monthly_trends': [],
     }
-    
-    with open(os.path.join(OUT_DIR, f'{state}.json'), 'w') as f:
-        json.dump(state_detail, f)
-    print(f"  {state}: {len(provs)} providers, ${state_totals[state]['total_payments']:,.0f}")
 
-# State summary list
-state_list = []
-for state, totals in sorted(state_totals.items(), key=lambda x: x[1]['total_payments'], reverse=True):
+for r in top_n(LEVEL_NPI, TOP_PROVIDERS):
+    npi, paid, claims, benes = str(r[2]), float(r[7]), int(r[8]), int(r[9] or 0)
+    info = npi_info.get(npi, {})
+    states[r[1]]['top_providers'].append({
+        'npi': npi,
+        'name': clean_name(info.get('provider_name', '')),
+        'specialty': info.get('taxonomy_description') or r[15],
+        'city': clean_city(info.get('city', '')),
+        'state': r[1],
+        'total_payments': round(paid, 2),
+        'total_claims': claims,
+        'total_benes': benes,
+        'proc_count': int(r[11]),
+        'active_years': int(r[12]),
+        'first_month': str(r[13]),
+        'last_month': str(r[14]),
+        'cost_per_claim': round(paid / max(claims, 1), 2),
+        'cost_per_bene': round(paid / max(benes, 1), 2),
+        'claims_per_bene': round(claims / max(benes, 1), 1),
+    })
+
+for r in top_n(LEVEL_CODE, TOP_PROCEDURES):
+    states[r[1]]['top_procedures'].append({
+        'code': r[3], 'payments': round(float(r[7]), 2),
+        'claims': int(r[8]), 'provider_count': int(r[10]),
+    })
+
+for r in top_n(LEVEL_PTYPE, TOP_SPECIALTIES):
+    states[r[1]]['top_specialties'].append({
+        'specialty': r[4], 'payments': round(float(r[7]), 2),
+        'claims': int(r[8]), 'provider_count': int(r[10]),
+    })
+
+yearly = {}
+for r in level_rows(LEVEL_MONTH, 'state, month'):
+    st = states[r[1]]
+    st['monthly_trends'].append({
+        'month': str(r[5]), 'payments': round(float(r[7]), 2),
+        'claims': int(r[8]), 'providers': int(r[10]),
+    })
+    y = yearly.setdefault((r[1], str(r[5])[:4]), [0.0, 0])
+    y[0] += float(r[7])
+    y[1] += int(r[8])
+for (state, year), (payments, claims) in sorted(yearly.items()):
+    states[state]['yearly_trends'].append({'year': year, 'payments': round(payments, 2), 'claims': claims})
+
+yearly_overall = level_rows(LEVEL_YEAR, 'yr')
+con.close()
+
+# Per-state files
+for state, detail in states.items():
     if state == 'UNKNOWN':
         continue
-    state_list.append({
-        'state': state,
-        **{k: round(v, 2) if isinstance(v, float) else v for k, v in totals.items()}
-    })
+    write_json(os.path.join(OUT_DIR, f'{state}.json'), detail)
+    write_json(os.path.join(STATE_PROV_DIR, f'{state}.json'), [{
+        'npi': p['npi'], 'name': p['name'], 'city': p['city'], 'specialty': p['specialty'],
+        'totalPaid': p['total_payments'], 'totalClaims': p['total_claims'], 'totalBenes': p['total_benes'],
+    } for p in detail['top_providers']])
+    print(f"  {state}: {detail['summary']['provider_count']:,} providers, ${detail['summary']['total_payments']:,.0f}")
 
-with open(os.path.join(OUT, 'states-summary.json'), 'w') as f:
-    json.dump(state_list, f)
+# State summary list
+state_list = [{'state': s, **{k: v for k, v in d['summary'].items() if k != 'code_count'}}
+              for s, d in states.items() if s != 'UNKNOWN']
+write_json(os.path.join(OUT, 'states-summary.json'), state_list)
 
 # Overall yearly trends
-with open(os.path.join(OUT, 'yearly-trends.json'), 'w') as f:
-    json.dump([{'year': r[0], 'payments': round(float(r[1]),2), 
-                'claims': int(r[2]), 'providers': int(r[3])} for r in yearly_overall], f)
+write_json(os.path.join(OUT, 'yearly-trends.json'), [{'year': r[6], 'payments': round(float(r[7]), 2),
+                                                     'claims': int(r[8]), 'providers': int(r[10])} for r in yearly_overall])
 
-print(f"\nDone! {len(state_list)} states, {len(top_npis)} providers")
-con.close()
+print(f"\nDone! {len(state_list)} states, {sum(d['summary']['provider_count'] for d in states.values()):,} state-provider pairs")
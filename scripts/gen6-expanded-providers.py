@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Generate expanded provider data: top 1000 with computed fields."""
-import duckdb
-import json
+from duckdb_session import connect
 import os
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
 
-con = duckdb.connect()
+con = connect('scan')
 
 # Top 1000 providers with computed fields
 print("Generating top 1000 providers with computed fields...")
@@ -60,8 +60,7 @@ for row in providers:
     npi_list.append(str(d['npi']))
 
 # Save top 1000 list
-with open(os.path.join(OUT, 'top-providers-1000.json'), 'w') as f:
-    json.dump(prov_list, f)
+write_json(os.path.join(OUT, 'top-providers-1000.json'), prov_list)
 print(f"  Saved {len(prov_list)} providers to top-providers-1000.json")
 
 # Generate detail JSON for each of the top 1000
@@ -151,8 +150,7 @@ for batch_start in range(0, len(npi_list), 50):
             'procedures': proc_by_npi.get(npi, [])[:20]  # top 20 procedures
         }
         
-        with open(os.path.join(detail_dir, f'{npi}.json'), 'w') as f:
-            json.dump(detail, f)
+        write_json(os.path.join(detail_dir, f'{npi}.json'), detail)
 
 print("Done with expanded providers!")
 con.close()
@@ -1,30 +1,30 @@
 #!/usr/bin/env python3
 """Look up top 1000 NPIs from CMS NPI Registry API and save to CSV."""
-import duckdb
+from duckdb_session import connect
 import json
 import csv
 import os
 import time
 import urllib.request
+from npi_lookups import read_lookups, write_lookups
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
 EXISTING = os.path.join(REF, 'npi_lookups.csv')
 OUTPUT = os.path.join(REF, 'npi_lookups_expanded.csv')
 
-# Load existing lookups
-existing_npis = set()
-existing_rows = []
+# Load existing lookups (the expanded file wins; it may hold NPPES rows from gen30)
+existing, fields = read_lookups(OUTPUT)
 if os.path.exists(EXISTING):
     with open(EXISTING) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            existing_npis.add(row['npi'])
-            existing_rows.append(row)
+        for row in csv.DictReader(f):
+            existing.setdefault(row['npi'], row)
+existing_npis = set(existing)
+existing_rows = list(existing.values())
 print(f"Existing lookups: {len(existing_npis)}")
 
 # Get top 1000 NPIs by total spending
-con = duckdb.connect()
+con = connect('scan')
 top_npis = con.execute(f"""
     SELECT BILLING_PROVIDER_NPI_NUM as npi, SUM(TOTAL_PAID) as total
     FROM read_parquet('{PARQUET}')
@@ -73,6 +73,7 @@ for i, (npi, total) in enumerate(to_lookup):
             
             city = practice_addr.get('city', '') if practice_addr else ''
             state = practice_addr.get('state', '') if practice_addr else ''
+            zip5 = practice_addr.get('postal_code', '')[:5] if practice_addr else ''
             
             # Get taxonomy
             taxonomies = result.get('taxonomies', [])
@@ -84,7 +85,8 @@ for i, (npi, total) in enumerate(to_lookup):
                 'entity_type': entity,
                 'taxonomy_description': taxonomy,
                 'city': city,
-                'state': state
+                'state': state,
+                'zip': zip5
             })
         else:
             new_rows.append({
@@ -105,11 +107,7 @@ for i, (npi, total) in enumerate(to_lookup):
 
 # Combine and write
 all_rows = existing_rows + new_rows
-fieldnames = ['npi', 'provider_name', 'entity_type', 'taxonomy_description', 'city', 'state']
-with open(OUTPUT, 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(all_rows)
+write_lookups(OUTPUT, all_rows, fields)
 
 print(f"\nDone! Total lookups: {len(all_rows)} (wrote to {OUTPUT})")
 print(f"  Existing: {len(existing_rows)}")
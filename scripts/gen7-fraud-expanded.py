@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Expanded fraud analysis with 5 new tests using correct column names."""
-import duckdb
-import json
+from duckdb_session import connect
 import os
 from collections import defaultdict
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
-con = duckdb.connect()
+con = connect('scan')
 
 # Columns: BILLING_PROVIDER_NPI_NUM, SERVICING_PROVIDER_NPI_NUM, HCPCS_CODE,
 #           CLAIM_FROM_MONTH (YYYY-MM format?), TOTAL_UNIQUE_BENEFICIARIES, TOTAL_CLAIMS, TOTAL_PAID
@@ -165,15 +165,13 @@ for npi, data in flag_counts.items():
     })
 expanded_watchlist.sort(key=lambda x: x['flag_count'], reverse=True)
 
-with open(os.path.join(OUT, 'expanded-watchlist.json'), 'w') as f:
-    json.dump(expanded_watchlist, f)
+write_json(os.path.join(OUT, 'expanded-watchlist.json'), expanded_watchlist)
 
 # Save per-test files
 for name, flags in [('explosive-growth', growth_flags), ('instant-volume', instant_flags),
                      ('procedure-concentration', conc_flags), ('billing-consistency', cons_flags),
                      ('beneficiary-stuffing-extreme', stuff_flags)]:
-    with open(os.path.join(OUT, f'fraud-{name}.json'), 'w') as f:
-        json.dump(flags, f)
+    write_json(os.path.join(OUT, f'fraud-{name}.json'), flags)
 
 multi = sum(1 for p in expanded_watchlist if p['flag_count'] >= 2)
 print(f"\n=== RESULTS ===")
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Generate detail JSON for top 1000 providers."""
-import duckdb
+from duckdb_session import connect
 import json
 import csv
 import os
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 REF = os.path.join(os.path.dirname(__file__), '..', 'reference-data')
@@ -35,7 +36,7 @@ if os.path.exists(orig_path):
 
 print(f"NPI lookups: {len(npi_info)}, Expanded flags: {len(watchlist_flags)}, Original flags: {len(orig_wl)}")
 
-con = duckdb.connect()
+con = connect('scan')
 
 # Get top 1000 NPIs
 print("Getting top 1000 providers...")
@@ -147,8 +148,7 @@ for batch_start in range(0, len(npi_list), 100):
             'procedures': procs_by_npi.get(npi, [])[:30]
         }
         
-        with open(os.path.join(DETAIL_DIR, f'{npi}.json'), 'w') as f:
-            json.dump(detail, f)
+        write_json(os.path.join(DETAIL_DIR, f'{npi}.json'), detail)
 
 # Update top-providers list (top 1000 instead of 50)
 top_list = []
@@ -175,8 +175,7 @@ for r in top:
         'flagCount': len(all_fl)
     })
 
-with open(os.path.join(OUT, 'top-providers-1000.json'), 'w') as f:
-    json.dump(top_list, f)
+write_json(os.path.join(OUT, 'top-providers-1000.json'), top_list)
 
 print(f"\nDone! {len(npi_list)} provider details + top-providers-1000.json")
 con.close()
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Generate per-code benchmarks: national avg, median, deciles, state averages."""
-import duckdb
-import json
+from duckdb_session import connect
 import os
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
 
-con = duckdb.connect()
+con = connect('scan')
 
 # 1. National benchmarks per HCPCS code
 print("Generating national code benchmarks...")
@@ -63,8 +63,7 @@ for r in benchmarks:
         'stddevCpc': round(float(r[14]), 2) if r[14] else None
     }
 
-with open(os.path.join(OUT, 'code-benchmarks.json'), 'w') as f:
-    json.dump(code_benchmarks, f)
+write_json(os.path.join(OUT, 'code-benchmarks.json'), code_benchmarks)
 print(f"  {len(code_benchmarks)} code benchmarks generated")
 
 # 2. State-level benchmarks per code (top 200 codes only to keep size reasonable)
@@ -112,8 +111,7 @@ for r in state_benchmarks:
         'medianCpc': round(float(r[4]), 2) if r[4] else None
     }
 
-with open(os.path.join(OUT, 'state-code-benchmarks.json'), 'w') as f:
-    json.dump(state_code_benchmarks, f)
+write_json(os.path.join(OUT, 'state-code-benchmarks.json'), state_code_benchmarks)
 print(f"  State benchmarks for {len(state_code_benchmarks)} codes")
 
 print("Done!")
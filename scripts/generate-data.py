@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """Generate JSON data files for the Medicaid Money Tracker site."""
-import duckdb
+from duckdb_session import connect
 import json
 import os
 import csv
+from jsonout import write_json
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = os.path.join(os.path.dirname(__file__), "..", "public", "data")
 REF = os.path.join(os.path.dirname(__file__), "..", "reference-data")
 os.makedirs(OUT, exist_ok=True)
 
-con = duckdb.connect()
+con = connect('scan')
 
 print("1. Global stats...")
 r = con.execute(f"""
@@ -25,8 +26,7 @@ stats = {
     "records": r[0], "totalPaid": r[1], "providers": r[2], "procedures": r[3],
     "minMonth": str(r[4]), "maxMonth": str(r[5]), "totalClaims": r[6], "totalBenes": r[7]
 }
-with open(os.path.join(OUT, "stats.json"), "w") as f:
-    json.dump(stats, f)
+write_json(os.path.join(OUT, "stats.json"), stats)
 print(f"   Records: {r[0]:,}, Total: ${r[1]:,.0f}")
 
 print("2. Top 50 providers by spending...")
@@ -38,8 +38,7 @@ rows = con.execute(f"""
     GROUP BY 1 ORDER BY 2 DESC LIMIT 50
 """).fetchall()
 providers = [{"npi":r[0],"totalPaid":r[1],"totalClaims":r[2],"totalBenes":r[3],"procCount":r[4]} for r in rows]
-with open(os.path.join(OUT, "top-providers.json"), "w") as f:
-    json.dump(providers, f)
+write_json(os.path.join(OUT, "top-providers.json"), providers)
 print(f"   Done ({len(providers)} providers)")
 
 print("3. Top 50 procedures by spending...")
@@ -51,8 +50,7 @@ rows = con.execute(f"""
     GROUP BY 1 ORDER BY 2 DESC LIMIT 50
 """).fetchall()
 procs = [{"code":r[0],"totalPaid":r[1],"totalClaims":r[2],"providerCount":r[3],"avgCostPerClaim":r[4]} for r in rows]
-with open(os.path.join(OUT, "top-procedures.json"), "w") as f:
-    json.dump(procs, f)
+write_json(os.path.join(OUT, "top-procedures.json"), procs)
 print(f"   Done ({len(procs)} procedures)")
 
 print("4. State summary...")
@@ -120,8 +118,7 @@ for mf in multi_flags:
     watchlist.append(entry)
 
 watchlist.sort(key=lambda x: x["flagCount"], reverse=True)
-with open(os.path.join(OUT, "watchlist.json"), "w") as f:
-    json.dump(watchlist, f)
+write_json(os.path.join(OUT, "watchlist.json"), watchlist)
 print(f"   Done ({len(watchlist)} flagged providers)")
 
 print("6. Monthly data for top 10 watchlist providers...")
@@ -130,8 +127,7 @@ os.makedirs(os.path.join(OUT, "provider-monthly"), exist_ok=True)
 with open(os.path.join(REF, "top10_monthly.json")) as f:
     monthly = json.load(f)
 for npi, data in monthly.items():
-    with open(os.path.join(OUT, "provider-monthly", f"{npi}.json"), "w") as f:
-        json.dump(data, f)
+    write_json(os.path.join(OUT, "provider-monthly", f"{npi}.json"), data)
 print(f"   Done ({len(monthly)} providers)")
 
 print("7. Provider details for top 50 + watchlist NPIs...")
@@ -162,8 +158,7 @@ for npi in all_npis:
             "entityType": info.get("entityType", ""),
             "topProcedures": [{"code":r[0],"paid":r[1],"claims":r[2],"benes":r[3]} for r in rows]
         }
-        with open(os.path.join(OUT, "providers", f"{npi}.json"), "w") as f:
-            json.dump(detail, f)
+        write_json(os.path.join(OUT, "providers", f"{npi}.json"), detail)
     except Exception as e:
         print(f"   Error for {npi}: {e}")
 
@@ -183,8 +178,7 @@ for p in providers[:20]:
             GROUP BY 1 ORDER BY 1
         """).fetchall()
         data = [{"month":str(r[0])[:7],"paid":r[1],"claims":r[2],"benes":r[3]} for r in rows]
-        with open(os.path.join(OUT, "provider-monthly", f"{npi}.json"), "w") as f:
-            json.dump(data, f)
+        write_json(os.path.join(OUT, "provider-monthly", f"{npi}.json"), data)
     except Exception as e:
         print(f"   Error for {npi}: {e}")
 print("   Done")
@@ -197,7 +191,6 @@ for p in providers:
     p["specialty"] = info.get("specialty", "")
     p["city"] = info.get("city", "")
     p["state"] = info.get("state", "")
-with open(os.path.join(OUT, "top-providers.json"), "w") as f:
-    json.dump(providers, f)
+write_json(os.path.join(OUT, "top-providers.json"), providers)
 
 print("\n✅ All data generated!")
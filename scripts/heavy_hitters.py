@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Mergeable top-K (Space-Saving style) summaries stored as DuckDB/parquet rows.
+
+A summary keeps, per cell (e.g. code x month), the K heaviest items with their
+weights plus one cell_error: an upper bound on the weight of any item not kept.
+Built from exact per-cell totals, cell_error is the (K+1)-th weight; merging two
+summaries of the same cell sums counters, adds both errors and re-truncates, so
+a new month can be folded into an existing year cell in place.
+
+A top-K query over any set of cells reports, per item, a lower bound (sum of
+kept weights) and an upper bound (lower + errorBound, the sum of the cell
+errors). The error of every cell counts even where the item is kept: after a
+merge an item new to a cell's list carries only its new weight, and its old
+weight (at most the old cell_error) is missing from lower. An unlisted item can
+exceed neither the last listed lower + errorBound nor its own upper.
+
+Rows: key columns..., npi, paid, claims, cell_error
+"""
+
+
+def summarize_sql(input_sql, keys, k):
+    """Truncate (key..., npi, paid, claims, cell_error, src) rows to k items per cell.
+    Rows for the same cell and npi are summed; cell errors of different srcs add up."""
+    cols = ', '.join(keys)
+    return f"""
+        WITH inp AS ({input_sql}),
+        errs AS (
+            SELECT {cols}, SUM(cell_error) AS cell_error
+            FROM (SELECT DISTINCT {cols}, src, cell_error FROM inp) GROUP BY {cols}
+        ),
+        items AS (
+            SELECT {cols}, npi, SUM(paid) AS paid, SUM(claims) AS claims,
+                   ROW_NUMBER() OVER (PARTITION BY {cols} ORDER BY SUM(paid) DESC, npi) AS rn
+            FROM inp GROUP BY {cols}, npi
+        ),
+        dropped AS (SELECT {cols}, MAX(paid) AS dropped FROM items WHERE rn > {k} GROUP BY {cols})
+        SELECT {cols}, i.npi, i.paid, i.claims,
+               e.cell_error + COALESCE(d.dropped, 0) AS cell_error
+        FROM items i JOIN errs e USING ({cols}) LEFT JOIN dropped d USING ({cols})
+        WHERE i.rn <= {k}"""
+
+
+def exact_input_sql(source_sql, keys, src='new'):
+    """Exact per-cell totals from rows with key columns, npi, paid, claims (cell_error 0)."""
+    cols = ', '.join(keys)
+    return f"""
+        SELECT {cols}, npi, SUM(paid) AS paid, SUM(claims) AS claims,
+               0.0 AS cell_error, '{src}' AS src
+        FROM {source_sql} GROUP BY {cols}, npi"""
+
+
+def topk_sql(table_sql, keys, where='', limit=50):
+    """Merged top-K over every cell matching where: npi, lower, upper, claims, error bound."""
+    cols = ', '.join(keys)
+    where = f'WHERE {where}' if where else ''
+    return f"""
+        WITH t AS (SELECT * FROM {table_sql} {where}),
+        total AS (SELECT COALESCE(SUM(cell_error), 0) AS err FROM (SELECT DISTINCT {cols}, cell_error FROM t)),
+        items AS (SELECT npi, SUM(paid) AS lower, SUM(claims) AS claims FROM t GROUP BY npi)
+        SELECT npi, lower, lower + total.err AS upper, claims, total.err AS error_bound
+        FROM items, total
+        ORDER BY lower DESC, npi
+        LIMIT {int(limit)}"""
+
+
+def topk(con, table_sql, keys, where='', params=None, limit=50):
+    """List of (npi, lower, upper, claims, error_bound) rows."""
+    sql = topk_sql(table_sql, keys, where, limit)
+    return con.execute(sql, params).fetchall() if params else con.execute(sql).fetchall()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+HyperLogLog distinct-count sketches stored as plain DuckDB/parquet rows.
+
+A sketch is a set of (reg, rank) rows per key: reg is the low P bits of
+hash(value), rank the position of the lowest set bit in the remaining bits.
+Only non-empty registers are stored, so a cell with a handful of values costs
+a handful of rows. Sketches merge with MAX(rank) per register, which makes a
+union across months / codes / states a GROUP BY, and re-adding a value a no-op.
+
+Relative standard error is about 1.04 / sqrt(2**P) (1.6% at P = 12); small
+cells fall back to linear counting and are near-exact.
+
+Usage:
+  import hll
+  con.execute(f"COPY ({hll.build_sql(src_sql, ['code', 'state'], 'npi')}) TO 'x.parquet'")
+  hll.estimate(con, "read_parquet('x.parquet')", where="code = ?", params=['99213'])
+"""
+import math
+
+P = 12
+M = 2 ** P
+ALPHA = 0.7213 / (1 + 1.079 / M)
+MAX_RANK = 64 - P + 1  # remaining bits all zero
+
+
+def register_sql(value_expr):
+    """SELECT fragment producing reg, rank for value_expr."""
+    h = f"hash({value_expr})"
+    w = f"({h} >> {P})"
+    return (f"CAST({h} & {M - 1} AS SMALLINT) AS reg, "
+            f"CAST(CASE WHEN {w} = 0 THEN {MAX_RANK} "
+            f"ELSE log2({w} & ~({w} - 1)) + 1 END AS TINYINT) AS rank")
+
+
+def build_sql(source_sql, keys, value_expr):
+    """Sketch of DISTINCT value_expr per keys over source_sql (a query or table expression)."""
+    cols = ''.join(f'{k}, ' for k in keys)
+    return f"""
+        SELECT {cols}reg, MAX(rank) AS rank
+        FROM (SELECT {cols}{register_sql(value_expr)} FROM {source_sql} WHERE {value_expr} IS NOT NULL)
+        GROUP BY {cols}reg"""
+
+
+def merge_sql(tables_sql, keys):
+    """Union of sketches (e.g. 'old UNION ALL BY NAME new') re-grouped on keys."""
+    cols = ''.join(f'{k}, ' for k in keys)
+    return f"SELECT {cols}reg, MAX(rank) AS rank FROM ({tables_sql}) GROUP BY {cols}reg"
+
+
+def estimate_sql(table_sql, group_by=(), where=''):
+    """Query returning group_by columns + estimate, merging every sketch row that matches where.
+    With no group_by and no matching rows the aggregate still returns one row; its estimate is 0."""
+    cols = ''.join(f'{k}, ' for k in group_by)
+    group = f"GROUP BY {cols}reg" if cols else "GROUP BY reg"
+    outer = f"GROUP BY {cols.rstrip(', ')}" if cols else ""
+    return f"""
+        WITH r AS (
+            SELECT {cols}reg, MAX(rank) AS rank FROM {table_sql}
+            {f'WHERE {where}' if where else ''} {group}
+        ), s AS (
+            SELECT {cols}COUNT(*) AS nonzero, SUM(POW(2.0, -rank)) AS inv FROM r {outer}
+        )
+        SELECT {cols}COALESCE(CAST(ROUND(CASE
+            WHEN raw <= 2.5 * {M} AND nonzero < {M} THEN {M} * LN({M} / ({M} - nonzero))
+            ELSE raw END) AS BIGINT), 0) AS estimate
+        FROM (SELECT *, {ALPHA * M * M!r}::DOUBLE / (inv + {M} - nonzero) AS raw FROM s)"""
+
+
+def estimate(con, table_sql, where='', params=None, group_by=()):
+    """Approximate distinct count (int) or, with group_by, a list of (*keys, estimate) rows."""
+    sql = estimate_sql(table_sql, group_by, where)
+    rows = con.execute(sql, params).fetchall() if params else con.execute(sql).fetchall()
+    if group_by:
+        return rows
+    return (rows[0][0] or 0) if rows else 0
+
+
+def standard_error():
+    return 1.04 / math.sqrt(M)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Shared JSON output writer for the generators.
+
+write_json() emits compact JSON (no whitespace, floats rounded to a fixed number
+of decimals, NaN/inf as null) and, next to each file, .gz and .br sidecars
+(.br only when the optional `brotli` package is installed). Lists of records
+under the keys passed as `columnar` are stored as {"columns": [...], "rows": [[...]]};
+the frontend reads both forms through expandColumns() in src/lib/format.ts.
+
+Byte counts (default json.dump size vs compact vs compressed) are tallied per
+output directory and printed when the generator exits.
+
+Usage:
+  from jsonout import write_json
+  write_json(path, obj)                                   # precision 4
+  write_json(path, detail, precision=2, columnar=('monthlyTrend', 'procedures'))
+
+Run as a script to re-encode an existing tree in place and print the report:
+  python3 scripts/jsonout.py public/data/providers [--columnar monthlyTrend,procedures]
+"""
+import json, os, gzip, math, sys, atexit
+from collections import defaultdict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRECISION = 4
+SIDECARS = [s for s in os.environ.get('JSONOUT_SIDECARS', 'gz,br').split(',') if s]
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+_stats = defaultdict(lambda: defaultdict(int))
+
+
+def _compact(obj, precision, columnar):
+    if isinstance(obj, float):
+        if math.isnan(obj) or math.isinf(obj):
+            return None
+        return round(obj, precision)
+    if isinstance(obj, dict):
+        out = {}
+        for k, v in obj.items():
+            if k in columnar and isinstance(v, list) and v and all(isinstance(r, dict) for r in v):
+                cols = list(dict.fromkeys(c for r in v for c in r))
+                v = {'columns': cols, 'rows': [[r.get(c) for c in cols] for r in v]}
+            out[k] = _compact(v, precision, columnar)
+        return out
+    if isinstance(obj, (list, tuple)):
+        return [_compact(v, precision, columnar) for v in obj]
+    if hasattr(obj, 'item'):  # numpy scalars
+        return _compact(obj.item(), precision, columnar)
+    return obj
+
+
+def encode(obj, precision=PRECISION, columnar=()):
+    """Compact JSON text for obj."""
+    return json.dumps(_compact(obj, precision, frozenset(columnar)), separators=(',', ':'),
+                      ensure_ascii=False, allow_nan=False)
+
+
+def _write_bytes(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_json(path, obj, precision=PRECISION, columnar=(), sidecars=None, baseline=None):
+    """Write obj to path as compact JSON plus compressed sidecars; returns compact byte size."""
+    data = encode(obj, precision, columnar).encode('utf-8')
+    _write_bytes(path, data)
+    if baseline is None:
+        baseline = len(json.dumps(obj, default=lambda o: o.item()).encode('utf-8'))
+
+    stats = _stats[os.path.dirname(os.path.abspath(path))]
+    stats['files'] += 1
+    stats['default'] += baseline
+    stats['compact'] += len(data)
+    for kind in (SIDECARS if sidecars is None else sidecars):
+        if kind == 'gz':
+            blob = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        elif kind == 'br' and brotli is not None:
+            blob = brotli.compress(data, quality=BROTLI_QUALITY)
+        else:
+            continue
+        _write_bytes(f'{path}.{kind}', blob)
+        stats[kind] += len(blob)
+    return len(data)
+
+
+def report(file=sys.stdout):
+    """Print bytes saved per output directory since the process started."""
+    if not _stats:
+        return
+    print(f"\n{'directory':<40} {'files':>7} {'json.dump':>11} {'compact':>11} {'gz':>11} {'br':>11}", file=file)
+    mb = lambda n: f"{n / 1e6:9.1f}MB" if n else f"{'-':>11}"
+    for d, s in sorted(_stats.items()):
+        name = os.path.relpath(d)
+        print(f"{name[-40:]:<40} {s['files']:>7} {mb(s['default'])} {mb(s['compact'])} {mb(s['gz'])} {mb(s['br'])}", file=file)
+        saved = s['default'] - s['compact']
+        if s['default']:
+            smallest = min(v for k, v in s.items() if k in ('compact', 'gz', 'br') and v)
+            print(f"{'':<40} saved {saved / 1e6:.1f}MB compact ({saved / s['default']:.0%}), "
+                  f"{1 - smallest / s['default']:.0%} over the wire", file=file)
+
+
+atexit.register(report)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Re-encode existing JSON outputs compactly with sidecars')
+    parser.add_argument('paths', nargs='+', help='JSON files or directories')
+    parser.add_argument('--precision', type=int, default=PRECISION)
+    parser.add_argument('--columnar', default='', help='comma-separated keys to store as columns/rows')
+    args = parser.parse_args()
+    columnar = tuple(k for k in args.columnar.split(',') if k)
+
+    files = []
+    for p in args.paths:
+        if os.path.isdir(p):
+            files += sorted(os.path.join(p, f) for f in os.listdir(p) if f.endswith('.json'))
+        else:
+            files.append(p)
+    for i, path in enumerate(files, 1):
+        raw = os.path.getsize(path)
+        with open(path) as f:
+            obj = json.load(f)
+        write_json(path, obj, args.precision, columnar, baseline=raw)
+        if i % 5000 == 0:
+            print(f"  {i:,}/{len(files):,} files...")
@@ -2,6 +2,7 @@
 """Look up missing provider names from CMS NPI Registry and update provider JSON files."""
 import json, os, time, csv
 import urllib.request, urllib.error
+from jsonout import write_json
 
 PROJ = os.path.expanduser("~/Projects/medicaid-tracker-app")
 PROVIDERS_DIR = os.path.join(PROJ, "public/data/providers")
@@ -71,8 +72,7 @@ for i, npi in enumerate(need_lookup):
                 pdata['state'] = state
                 pdata['specialty'] = tax_desc
                 pdata['entityType'] = entity
-                with open(ppath, 'w') as f:
-                    json.dump(pdata, f, indent=2)
+                write_json(ppath, pdata)
             
             results.append({'npi': npi, 'name': name, 'city': city, 'state': state, 'taxonomy_desc': tax_desc, 'entity_type': entity})
             
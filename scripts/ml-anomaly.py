@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unsupervised anomaly scores for every provider (isolation forest).
+
+OIG labels cover a few hundred fraud NPIs; this scores the whole population
+without them. An IsolationForest is fitted on a FIT_SAMPLE-row random sample of
+the feature store (same FEAT_COLS as ml-v3-retrain.py, signed log1p), then every
+provider is scored in CHUNK-row slices across worker processes that memory-map
+the store. The anomaly percentile is the provider's rank among all providers
+(100 = most anomalous).
+
+Outputs:
+  ~/.openclaw/workspace/ml/anomaly.npz   npi, score, percentile for every provider
+  public/data/anomaly-scores.json        top ANOMALY_TOP providers + distribution
+  public/data/composite-scores.json      (if present) anomalyPercentile on every
+                                         entry; hasAnomaly, +1 component and up to
+                                         ANOMALY_POINTS for percentile >= ANOMALY_FLAG_PCT
+  ml reports: anomaly.json               AUC / precision@k against the OIG labels
+
+Run: python3 scripts/ml-anomaly.py [--sample 100000] [--chunk 100000] [--workers N]
+"""
+import argparse, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from jsonout import write_json
+from feature_store import open_store, signed_log1p
+from ml_eval import evaluate, write_report
+
+OUT_DIR = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
+ANOMALY_PATH = os.path.expanduser("~/.openclaw/workspace/ml/anomaly.npz")
+SEED = 42
+N_TREES = 200
+ANOMALY_TOP = 1000
+ANOMALY_FLAG_PCT = 99.0  # composite signal threshold
+ANOMALY_POINTS = 10.0    # composite points at the 100th percentile, 0 at ANOMALY_FLAG_PCT
+
+_w = {}
+
+
+def init_worker(model):
+    _w['model'], _w['store'] = model, open_store()
+
+
+def score_chunk(bounds):
+    lo, hi = bounds
+    X = signed_log1p(np.asarray(_w['store'].X[lo:hi], dtype=np.float64))
+    return lo, -_w['model'].score_samples(X)  # higher = more anomalous
+
+
+def blend_composite(npi_index, percentile):
+    """Fold the anomaly percentile into composite-scores.json; re-runs replace the previous blend."""
+    path = os.path.join(OUT_DIR, 'composite-scores.json')
+    if not os.path.exists(path):
+        print("  (skipping missing composite-scores.json)")
+        return
+    with open(path) as f:
+        composite = json.load(f)
+    flagged = 0
+    for p in composite:
+        if p.get('hasAnomaly'):
+            p['components'] -= 1
+        p['compositeScore'] = round(p['compositeScore'] - p.pop('anomalyPoints', 0), 1)
+        i = npi_index.get(p['npi'])
+        pct = float(percentile[i]) if i is not None else None
+        p['anomalyPercentile'] = round(pct, 2) if pct is not None else None
+        p['hasAnomaly'] = pct is not None and pct >= ANOMALY_FLAG_PCT
+        if p['hasAnomaly']:
+            points = round(ANOMALY_POINTS * (pct - ANOMALY_FLAG_PCT) / (100 - ANOMALY_FLAG_PCT), 1)
+            p['components'] += 1
+            p['compositeScore'] = round(p['compositeScore'] + points, 1)
+            p['anomalyPoints'] = points
+            flagged += 1
+    composite.sort(key=lambda p: -p['compositeScore'])
+    write_json(path, composite)
+    print(f"  composite-scores.json: {flagged} of {len(composite)} entries gain the anomaly signal")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Isolation-forest anomaly scores for all providers')
+    parser.add_argument('--sample', type=int, default=100000, help='rows to fit the forest on')
+    parser.add_argument('--chunk', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    t0 = time.time()
+    store = open_store()
+    rng = np.random.default_rng(SEED)
+    sample = np.sort(rng.choice(len(store), size=min(args.sample, len(store)), replace=False))
+    model = IsolationForest(n_estimators=N_TREES, max_samples=256, random_state=SEED, n_jobs=1)
+    model.fit(signed_log1p(np.asarray(store.X[sample], dtype=np.float64)))
+    print(f"Fitted {N_TREES} trees on {len(sample):,} of {len(store):,} providers in {time.time() - t0:.1f}s")
+
+    t1 = time.time()
+    chunks = list(store.chunks(args.chunk))
+    workers = max(1, min(args.workers, len(chunks)))
+    scores = np.empty(len(store))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(model,)) as pool:
+        for lo, s in pool.map(score_chunk, chunks):
+            scores[lo:lo + len(s)] = s
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores, kind='stable')] = np.arange(1, len(scores) + 1)
+    percentile = 100.0 * ranks / len(scores)
+    print(f"Scored in {time.time() - t1:.1f}s ({workers} workers, {len(chunks)} chunks)")
+
+    os.makedirs(os.path.dirname(ANOMALY_PATH), exist_ok=True)
+    np.savez(ANOMALY_PATH + '.tmp.npz', npi=store.npi, score=scores, percentile=percentile)
+    os.replace(ANOMALY_PATH + '.tmp.npz', ANOMALY_PATH)
+
+    labels = store.labels()
+    metrics = evaluate(labels['fraud'], scores)
+    print(f"Against OIG fraud labels: AUC {metrics['auc']}, precision@k {metrics['precisionAtK']}")
+
+    F = {c: j for j, c in enumerate(store.feat_cols)}
+    top = np.argsort(-scores, kind='stable')[:ANOMALY_TOP]
+    write_json(os.path.join(OUT_DIR, 'anomaly-scores.json'), {
+        'method': 'isolation_forest',
+        'params': {'nEstimators': N_TREES, 'maxSamples': 256, 'fitSample': int(len(sample)),
+                   'transform': 'signed_log1p', 'randomState': SEED},
+        'totalProviders': len(store),
+        'featuresUsed': store.feat_cols,
+        'oigFraudAuc': metrics['auc'],
+        'topProviders': [{
+            'npi': store.npi_str(i),
+            'anomalyScore': round(float(scores[i]), 4),
+            'anomalyPercentile': round(float(percentile[i]), 3),
+            'totalPaid': round(float(store.X[i, F['total_paid']]), 2),
+            'totalClaims': int(store.X[i, F['total_claims']]),
+            'costPerClaim': round(float(store.X[i, F['cost_per_claim']]), 2),
+            'activeMonths': int(store.X[i, F['active_months']]),
+            'isExcluded': bool(labels['any'][i]),
+            'isFraudExcluded': bool(labels['fraud'][i]),
+        } for i in top],
+        'scoreDistribution': {f'p{str(q).replace(".", "")}': round(float(np.percentile(scores, q)), 4)
+                              for q in (50, 75, 90, 95, 99, 99.9)},
+    })
+
+    blend_composite({store.npi_str(i): i for i in range(len(store))}, percentile)
+    write_report('anomaly', {'seed': SEED, 'fitSample': int(len(sample)), 'nEstimators': N_TREES,
+                             'workers': workers, 'elapsedSeconds': round(time.time() - t0, 2),
+                             'featureStore': store.meta, **metrics})
+    print(f"\nDone in {time.time() - t0:.1f}s -> {ANOMALY_PATH}, anomaly-scores.json")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Rolling-origin backtest of the fraud model.
+
+For each origin (a cutoff month C) the model only sees what was known at C:
+
+  features  feature_store.feature_sql() over months < C, read from the gen23
+            provider_code_month rollup (not the raw claims file)
+  train     every provider outside the holdout; positive if excluded for fraud
+            before C (or undated), as the OIG list stood at C
+  test      holdout providers (a fixed ~30% by NPI hash, the same for every
+            origin) not yet excluded at C; positive if first excluded for fraud
+            in [C, C + HORIZON months)
+
+Each origin trains and evaluates in its own process. As-of feature matrices are
+cached in CACHE_DIR per cutoff, keyed on the rollup file, so re-runs and added
+origins only compute what is new. AUC and precision@k per origin go to the ml
+reports directory (backtest-{backend}.json).
+
+Run: python3 scripts/ml-backtest.py [--origins 2021-01,2022-01] [--horizon 12]
+                                    [--backend rf|hgb] [--workers N]
+Requires: scripts/gen23-rollups.py output, the OIG exclusions CSV
+"""
+import argparse, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+from duckdb_session import connect
+from feature_store import FEAT_COLS, FRAUD_EXCL_TYPES, feature_sql, load_oig
+from ml_eval import evaluate, write_report
+from ml_models import BACKENDS, make_model, fit, is_scaled, training_config, SEED
+
+ROLLUP = os.path.expanduser("~/.openclaw/workspace/rollups/provider_code_month.parquet")
+CACHE_DIR = os.path.expanduser("~/.openclaw/workspace/ml/backtest-cache")
+N_ORIGINS = 10
+ORIGIN_STEP = 6        # months between default origins
+MIN_HISTORY = 12       # months of billing before the first origin
+HOLDOUT_PER_MILLE = 300
+RF_NEG_SAMPLE = 10000  # v3 recipe: all positives + sampled negatives
+
+
+def add_months(month, n):
+    y, m = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + n, 12)
+    return f"{y:04d}-{m + 1:02d}"
+
+
+def rollup_key():
+    st = os.stat(ROLLUP)
+    return {'rollup': ROLLUP, 'size': st.st_size, 'mtime': int(st.st_mtime), 'featCols': FEAT_COLS}
+
+
+def asof_features(cutoff, workers, threads):
+    """(npi int64[n], X float32[n, len(FEAT_COLS)], cached) for billing before cutoff."""
+    path = os.path.join(CACHE_DIR, f'features-{cutoff}.npz')
+    key = json.dumps(rollup_key(), sort_keys=True)
+    if os.path.exists(path):
+        z = np.load(path)
+        if str(z['key']) == key:
+            return z['npi'], z['X'], True
+    con = connect('ml', threads=threads, memory_fraction=0.35 / workers)  # one session per worker process
+    cols = ', '.join(f'CAST({c} AS DOUBLE) AS {c}' for c in FEAT_COLS)
+    res = con.execute(f"""
+        SELECT CAST(npi AS BIGINT) AS npi, {cols}
+        FROM ({feature_sql(f"read_parquet('{ROLLUP}')", cutoff=cutoff)})
+        ORDER BY 1""", label=f'features as of {cutoff}').fetchnumpy()
+    X = np.empty((len(res['npi']), len(FEAT_COLS)), np.float32)
+    for j, c in enumerate(FEAT_COLS):
+        v = res[c]
+        v = np.ma.filled(v, np.nan) if np.ma.isMaskedArray(v) else v
+        X[:, j] = np.nan_to_num(v.astype(np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    npi = np.asarray(res['npi'], np.int64)
+    np.savez(f'{path}.tmp.npz', npi=npi, X=X, key=np.array(key))
+    os.replace(f'{path}.tmp.npz', path)
+    return npi, X, False
+
+
+def holdout(npi):
+    """Fixed pseudo-random ~30% of providers, independent of the origin."""
+    return (npi.astype(np.uint64) * np.uint64(2654435761) >> np.uint64(7)) % np.uint64(1000) < HOLDOUT_PER_MILLE
+
+
+def run_origin(cutoff, horizon, backend, workers, threads):
+    t0 = time.time()
+    npi, X, cached = asof_features(cutoff, workers, threads)
+    feat_s = time.time() - t0
+
+    end = add_months(cutoff, horizon)
+    fraud = {int(n): m for n, (types, m) in load_oig().items() if types & FRAUD_EXCL_TYPES}
+    known = np.zeros(len(npi), bool)   # excluded by the origin (undated counts as known)
+    future = np.zeros(len(npi), bool)  # first excluded within the horizon
+    for i, n in enumerate(npi.tolist()):
+        if n in fraud:
+            m = fraud[n]
+            known[i] = m is None or m < cutoff
+            future[i] = m is not None and cutoff <= m < end
+    test = holdout(npi) & ~known
+    train = ~holdout(npi)
+    y_train, y_test = known[train].astype(np.int8), future[test].astype(np.int8)
+    result = {'origin': cutoff, 'horizonEnd': end, 'providers': int(len(npi)),
+              'trainRows': int(train.sum()), 'trainPositives': int(y_train.sum()),
+              'featureSeconds': round(feat_s, 2), 'featuresCached': cached}
+    if y_train.sum() < 2 or not y_test.any():
+        return {**result, 'skipped': 'too few positives', 'testPositives': int(y_test.sum())}
+
+    t0 = time.time()
+    rs = np.random.RandomState(SEED)
+    tr = np.flatnonzero(train)
+    if backend == 'rf':
+        neg = tr[~known[tr]]
+        tr = np.sort(np.concatenate([tr[known[tr]], rs.choice(neg, size=min(RF_NEG_SAMPLE, len(neg)), replace=False)]))
+    Xtr, Xte = X[tr], X[test]
+    if is_scaled(backend):
+        scaler = StandardScaler().fit(Xtr)
+        Xtr, Xte = scaler.transform(Xtr), scaler.transform(Xte)
+    with threadpool_limits(threads):
+        mdl = fit(make_model(backend), Xtr, known[tr].astype(np.int8))
+        scores = mdl.predict_proba(Xte)[:, 1]
+    return {**result, 'fitSeconds': round(time.time() - t0, 2), 'trainingConfig': training_config(mdl, backend),
+            **evaluate(y_test, scores)}
+
+
+def default_origins(horizon):
+    con = connect('ml')
+    first, last = con.execute(f"SELECT MIN(month), MAX(month) FROM read_parquet('{ROLLUP}')").fetchone()
+    con.close()
+    latest = add_months(last[:7], 1 - horizon)  # the last origin whose horizon is fully observed
+    origins = [add_months(latest, -ORIGIN_STEP * i) for i in range(N_ORIGINS)]
+    return sorted(o for o in origins if o >= add_months(first[:7], MIN_HISTORY))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest of the fraud model')
+    parser.add_argument('--origins', help='comma-separated cutoff months (YYYY-MM); default: '
+                        f'{N_ORIGINS} origins {ORIGIN_STEP} months apart ending one horizon before the data')
+    parser.add_argument('--horizon', type=int, default=12, help='months after the origin that count as test positives')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='rf')
+    parser.add_argument('--workers', type=int, default=min(N_ORIGINS, os.cpu_count()))
+    args = parser.parse_args()
+
+    if not os.path.exists(ROLLUP):
+        raise SystemExit(f"{ROLLUP} not found; run scripts/gen23-rollups.py first")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    origins = args.origins.split(',') if args.origins else default_origins(args.horizon)
+    workers = max(1, min(args.workers, len(origins)))
+    threads = max(1, os.cpu_count() // workers)
+    print(f"Backtest: {len(origins)} origins ({origins[0]} .. {origins[-1]}), horizon {args.horizon} months, "
+          f"backend {args.backend}, {workers} workers x {threads} threads")
+
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_origin, origins, [args.horizon] * len(origins),
+                                [args.backend] * len(origins), [workers] * len(origins),
+                                [threads] * len(origins)))
+    elapsed = time.time() - t0
+
+    print(f"\n{'origin':8s} {'train+':>6s} {'test+':>6s} {'AUC':>7s}  {'feat s':>6s} {'fit s':>6s}  precision@k")
+    for r in results:
+        if 'skipped' in r:
+            print(f"{r['origin']:8s} {r['trainPositives']:6d} {r['testPositives']:6d}  skipped ({r['skipped']})")
+        else:
+            print(f"{r['origin']:8s} {r['trainPositives']:6d} {r['positives']:6d} {r['auc'] or 0:7.4f}  "
+                  f"{r['featureSeconds']:6.1f} {r['fitSeconds']:6.1f}  {r['precisionAtK']}")
+    aucs = [r['auc'] for r in results if r.get('auc') is not None]
+    path = write_report(f'backtest-{args.backend}', {
+        'seed': SEED,
+        'backend': args.backend,
+        'horizonMonths': args.horizon,
+        'holdoutFraction': HOLDOUT_PER_MILLE / 1000,
+        'source': rollup_key(),
+        'workers': workers,
+        'elapsedSeconds': round(elapsed, 2),
+        'meanAuc': round(float(np.mean(aucs)), 4) if aucs else None,
+        'origins': results,
+    })
+    print(f"\nMean AUC {np.mean(aucs) if aucs else float('nan'):.4f} over {len(aucs)} origins, "
+          f"{elapsed:.1f}s -> {path}")
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Build the on-disk ML feature store (see feature_store.py).
+
+Computes FEAT_COLS for every billing provider and writes a memory-mappable
+float32 matrix plus NPI index to ~/.openclaw/workspace/ml/feature-store/.
+Training (ml-incremental.py) and scoring read from it in chunks instead of
+re-running the feature queries.
+
+Run: python3 scripts/ml-build-feature-store.py
+"""
+import os, time
+import numpy as np
+from duckdb_session import connect
+from feature_store import build, open_store, STORE_DIR
+
+t0 = time.time()
+con = connect('ml')
+meta = build(con)
+con.close()
+
+store = open_store()
+print(f"\n{meta['nProviders']:,} providers x {len(meta['featCols'])} features "
+      f"({os.path.getsize(os.path.join(STORE_DIR, 'X.npy')) / 1e6:,.0f} MB) in {time.time() - t0:.1f}s")
+if os.path.exists(os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")):
+    labels = store.labels()
+    print(f"Labels: {int(labels['fraud'].sum())} fraud, {int(labels['borderline'].sum())} borderline, "
+          f"{int(labels['any'].sum())} any exclusion; {int(np.isfinite(labels['excl_year']).sum())} with dates")
+print(f"Done -> {STORE_DIR}")
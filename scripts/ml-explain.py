@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Per-provider explanations for the top-scored providers.
+
+Scores every provider with a saved model artifact (LATEST by default, as in
+ml-score.py), takes the top --top NPIs and splits each score into per-feature
+contributions: TreeSHAP when the shap package is installed, otherwise
+decision-path attribution (ml_models.path_contributions, exact additive but not
+Shapley-averaged). Rows are split across worker processes that memory-map the
+feature store; only the TOP_FACTORS largest positive contributions per NPI are
+kept.
+
+Outputs (public/data/):
+  ml-explanations.json   {method, units, baseValue, artifactVersion,
+                          providers: {npi: {mlScore, topFactors: [{feature, value, contribution}]}}}
+  ml-scores.json, ml-all-high-scores.json
+                         topFactors added to each provider entry that was explained
+
+Contributions are probability points for rf and log-odds for hgb ("units").
+gen24-flag-bundle.py picks the factors up as mlFactors.
+
+Run: python3 scripts/ml-explain.py [--top 10000] [--model VERSION_OR_DIR] [--workers N]
+"""
+import argparse, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from jsonout import write_json
+from feature_store import open_store
+from ml_models import load_artifact, tree_paths, path_contributions
+
+OUT_DIR = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
+TOP_FACTORS = 5
+SCORE_CHUNK = 100000
+
+_w = {}  # per-process model, store and explainer (set up once by init_worker)
+
+
+def model_input(rows):
+    X = np.asarray(_w['store'].X[rows][:, _w['cols']], dtype=np.float64)
+    if _w['scaler'] is not None:
+        X = (X - _w['scaler'][0]) / _w['scaler'][1]
+    return X.astype(np.float32)  # the dtype sklearn's trees compare thresholds in
+
+
+def init_worker(version, method):
+    model, art = load_artifact(version)
+    store = open_store()
+    _w.update(model=model, art=art, store=store, method=method,
+              cols=[store.feat_cols.index(c) for c in art['featCols']],
+              scaler=(np.asarray(art['scaler']['mean']), np.asarray(art['scaler']['scale'])) if art.get('scaler') else None)
+    if method == 'treeshap':
+        import shap
+        _w['explainer'] = shap.TreeExplainer(model)
+    else:
+        _w['paths'] = tree_paths(model)
+
+
+def base_value():
+    if _w['method'] == 'treeshap':
+        ev = np.ravel(_w['explainer'].expected_value)
+        return float(ev[-1])
+    return float(_w['paths'][2])
+
+
+def explain(rows):
+    """(rows, top feature indices [n, TOP_FACTORS], their contributions) for store rows."""
+    X = model_input(rows)
+    if _w['method'] == 'treeshap':
+        sv = _w['explainer'].shap_values(X, check_additivity=False)
+        sv = sv[1] if isinstance(sv, list) else sv
+        contrib = sv[..., 1] if sv.ndim == 3 else sv
+    else:
+        contrib = path_contributions(_w['paths'], X)
+    top = np.argsort(-contrib, axis=1, kind='stable')[:, :TOP_FACTORS]
+    return rows, top, np.take_along_axis(contrib, top, axis=1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-provider feature contributions for the top-scored providers')
+    parser.add_argument('--top', type=int, default=10000, help='number of top-scored providers to explain')
+    parser.add_argument('--model', help='artifact version or directory; default LATEST')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    try:
+        import shap  # noqa: F401
+        method = 'treeshap'
+    except ImportError:
+        method = 'decision-path'
+
+    t0 = time.time()
+    init_worker(args.model, method)
+    model, art, store = _w['model'], _w['art'], _w['store']
+    scores = np.empty(len(store))
+    for lo, hi in store.chunks(SCORE_CHUNK):
+        scores[lo:hi] = model.predict_proba(model_input(np.arange(lo, hi)))[:, 1]
+    order = np.argsort(-scores, kind='stable')[:args.top]
+    print(f"Model {art['version']} ({art['backend']}); scored {len(store):,} providers in {time.time() - t0:.1f}s; "
+          f"explaining top {len(order):,} with {method}")
+
+    t1 = time.time()
+    workers = max(1, min(args.workers, len(order) // 500 or 1))
+    # workers reload the exact artifact: its directory when --model was a path, else the resolved version
+    model_ref = args.model if args.model and os.path.isdir(args.model) else art['version']
+    parts = np.array_split(order, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(model_ref, method)) as pool:
+        results = list(pool.map(explain, parts))
+    print(f"  {workers} workers, {time.time() - t1:.1f}s")
+
+    feats = art['featCols']
+    F = {c: j for j, c in enumerate(store.feat_cols)}
+    providers = {}
+    for rows, top, contrib in results:
+        for i, idx, vals in zip(rows, top, contrib):
+            providers[store.npi_str(i)] = {
+                'mlScore': round(float(scores[i]), 6),
+                'topFactors': [{'feature': feats[j], 'value': round(float(store.X[i, F[feats[j]]]), 4),
+                                'contribution': round(float(c), 4)} for j, c in zip(idx, vals) if c > 0],
+            }
+    write_json(os.path.join(OUT_DIR, 'ml-explanations.json'), {
+        'method': method,
+        'units': 'probability' if art['backend'] == 'rf' else 'log-odds',
+        'baseValue': round(base_value(), 6),
+        'modelType': art.get('modelType', art['backend']),
+        'artifactVersion': art['version'],
+        'topFactors': TOP_FACTORS,
+        'providers': providers,
+    })
+
+    for name, keys in (('ml-scores.json', ('topProviders',)),
+                       ('ml-all-high-scores.json', ('topProviders', 'smallProviderFlags', 'mediumProviderFlags'))):
+        path = os.path.join(OUT_DIR, name)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        n = 0
+        for key in keys:
+            for p in data.get(key, []):
+                if p['npi'] in providers:
+                    p['topFactors'] = providers[p['npi']]['topFactors']
+                    n += 1
+        write_json(path, data, precision=6)
+        print(f"  {name}: topFactors on {n:,} entries")
+
+    print(f"\nDone in {time.time() - t0:.1f}s -> ml-explanations.json ({len(providers):,} providers)")
@@ -3,8 +3,7 @@
 ML Fraud Detection — Memory-safe version
 Extracts features in separate small queries, then trains model.
 """
-import duckdb
-import json
+from duckdb_session import connect
 import os
 import csv
 import numpy as np
@@ -14,7 +13,7 @@ OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig
 OUT_DIR = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
 FEATURES_CSV = '/tmp/provider_features.csv'
 
-con = duckdb.connect()
+con = connect('ml')
 
 # Query 1: Basic totals per provider
 print("Query 1/4: Basic totals...")
@@ -41,6 +40,7 @@ print("  Done")
 
 # Load features
 import pandas as pd
+from jsonout import write_json
 features = pd.read_csv(FEATURES_CSV)
 print(f"  {len(features):,} providers")
 
@@ -221,8 +221,7 @@ output = {
     }
 }
 
-with open(os.path.join(OUT_DIR, 'ml-scores.json'), 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(os.path.join(OUT_DIR, 'ml-scores.json'), output, precision=6)
 
 print(f"\n=== RESULTS ===")
 print(f"Model: {model_type}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Histogram gradient boosting vs the v3 Random Forest on the same feature matrix.
+
+Both backends (ml_models.py) train on the feature store with a temporal split
+by OIG exclusion date:
+
+  train  positives excluded before VALID_YEAR (or undated), 70% of negatives
+  valid  positives excluded VALID_YEAR..TEST_YEAR-1, 10% of negatives
+         (HGB early-stops on this set)
+  test   positives excluded from TEST_YEAR on, 20% of negatives
+
+The RF keeps its v3 recipe (StandardScaler, 10K sampled negatives, n_jobs=1); HGB
+trains on every training row with all cores. Fit/score wall-clock, AUC and
+precision@k on the test set go to the ml reports directory, and both fitted
+models are saved as artifacts (ml_models.save_artifact).
+
+Run: python3 scripts/ml-hgb-benchmark.py
+Requires: scikit-learn >= 1.7 (X_val in HistGradientBoostingClassifier.fit)
+"""
+import time
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from feature_store import open_store
+from ml_eval import temporal_split, evaluate, write_report, TRAIN, VALID, TEST
+from ml_models import make_model, fit, save_artifact, training_config, SEED
+
+VALID_YEAR = 2023
+TEST_YEAR = 2024
+RF_NEG_SAMPLE = 10000
+
+store = open_store()
+labels = store.labels()
+y = labels['fraud']
+split = temporal_split(y, labels['excl_year'], VALID_YEAR, TEST_YEAR, seed=SEED)
+for name, code in (('train', TRAIN), ('valid', VALID), ('test', TEST)):
+    m = split == code
+    print(f"  {name}: {int(m.sum()):,} rows, {int(y[m].sum())} positive")
+if not y[split == TEST].any():
+    raise SystemExit(f"No positives excluded in {TEST_YEAR} or later; nothing to evaluate")
+
+X = np.asarray(store.X)  # float32; the two models need it in memory anyway
+train_idx = np.flatnonzero(split == TRAIN)
+valid_idx = np.flatnonzero(split == VALID)
+test_idx = np.flatnonzero(split == TEST)
+results, artifacts = [], []
+
+# ============================================
+# Random Forest (v3 recipe)
+# ============================================
+print("\nRandom Forest (v3: scaled, 10K sampled negatives, n_jobs=1)...")
+rs = np.random.RandomState(SEED)
+neg = train_idx[y[train_idx] == 0]
+sub = np.sort(np.concatenate([train_idx[y[train_idx] == 1],
+                              rs.choice(neg, size=min(RF_NEG_SAMPLE, len(neg)), replace=False)]))
+t0 = time.time()
+scaler = StandardScaler().fit(X[sub])
+rf = make_model('rf')
+fit(rf, scaler.transform(X[sub]), y[sub])
+rf_fit = time.time() - t0
+t0 = time.time()
+rf_scores = rf.predict_proba(scaler.transform(X[test_idx]))[:, 1]
+rf_score = time.time() - t0
+results.append({'backend': 'rf', 'trainRows': int(len(sub)), 'fitSeconds': round(rf_fit, 2),
+                'scoreSeconds': round(rf_score, 2), 'trainingConfig': training_config(rf, 'rf'),
+                **evaluate(y[test_idx], rf_scores)})
+print(f"  fit {rf_fit:.1f}s, AUC {results[-1]['auc']}, precision@k {results[-1]['precisionAtK']}")
+artifacts.append(save_artifact(rf, 'rf', store.feat_cols, scaler=scaler, metrics=results[-1],
+                               extra={'split': 'temporal'}))
+
+# ============================================
+# Histogram gradient boosting
+# ============================================
+print("\nHistGradientBoosting (all training rows, early stopping on temporal validation)...")
+t0 = time.time()
+hgb = make_model('hgb')
+fit(hgb, X[train_idx], y[train_idx], X_val=X[valid_idx], y_val=y[valid_idx])
+hgb_fit = time.time() - t0
+t0 = time.time()
+hgb_scores = hgb.predict_proba(X[test_idx])[:, 1]
+hgb_score = time.time() - t0
+results.append({'backend': 'hgb', 'trainRows': int(len(train_idx)), 'fitSeconds': round(hgb_fit, 2),
+                'scoreSeconds': round(hgb_score, 2), 'trainingConfig': training_config(hgb, 'hgb'),
+                **evaluate(y[test_idx], hgb_scores)})
+print(f"  fit {hgb_fit:.1f}s ({hgb.n_iter_} iterations), AUC {results[-1]['auc']}, "
+      f"precision@k {results[-1]['precisionAtK']}")
+artifacts.append(save_artifact(hgb, 'hgb', store.feat_cols, metrics=results[-1], extra={'split': 'temporal'}))
+
+path = write_report('hgb-vs-rf', {
+    'seed': SEED,
+    'split': {'method': 'temporal by OIG exclusion year', 'validYear': VALID_YEAR, 'testYear': TEST_YEAR,
+              'rows': {name: int((split == code).sum()) for name, code in (('train', TRAIN), ('valid', VALID), ('test', TEST))},
+              'positives': {name: int(y[split == code].sum()) for name, code in (('train', TRAIN), ('valid', VALID), ('test', TEST))}},
+    'featureStore': store.meta,
+    'results': results,
+    'artifacts': artifacts,
+})
+print(f"\n{'backend':8s} {'fit s':>8s} {'score s':>8s} {'AUC':>7s}  precision@k")
+for r in results:
+    print(f"{r['backend']:8s} {r['fitSeconds']:8.2f} {r['scoreSeconds']:8.2f} {r['auc'] or 0:7.4f}  {r['precisionAtK']}")
+print(f"\nReport -> {path}")
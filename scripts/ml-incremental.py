@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Out-of-core fraud model: incremental logistic regression over every provider.
+
+ml-v3-retrain.py and ml-step2-micro.py train a Random Forest on all positives
+plus a 10K reservoir sample of negatives. This streams the full feature store
+(feature_store.py) in CHUNK-row slices through SGDClassifier.partial_fit with
+'balanced' class weights applied as sample weights, so memory stays at one chunk
+regardless of population size.
+
+Features get a signed log1p before scaling (dollar and count columns span 8+
+orders of magnitude, which a linear model cannot absorb); the scaler is fitted
+in a streaming first pass.
+
+The same stratified holdout is scored by both the incremental model and the
+v3-style subsample Random Forest, and the comparison (AUC, precision@k,
+wall-clock, peak RSS) is written to the ml reports directory.
+
+Run: python3 scripts/ml-incremental.py [--epochs 5] [--chunk 50000] [--skip-rf]
+"""
+import argparse, resource, time
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import RandomForestClassifier
+from feature_store import open_store, signed_log1p
+from ml_eval import holdout_mask, evaluate, write_report
+
+SEED = 42
+RF_NEG_SAMPLE = 10000  # as in ml-v3-retrain.py
+
+parser = argparse.ArgumentParser(description='Out-of-core incremental fraud model vs subsample RF')
+parser.add_argument('--epochs', type=int, default=5)
+parser.add_argument('--chunk', type=int, default=50000, help='rows per partial_fit call')
+parser.add_argument('--alpha', type=float, default=1e-4, help='L2 regularization strength')
+parser.add_argument('--skip-rf', action='store_true', help='skip the Random Forest baseline')
+args = parser.parse_args()
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+store = open_store()
+y = store.labels()['fraud']
+test = holdout_mask(y, seed=SEED)
+train_idx, test_idx = np.flatnonzero(~test), np.flatnonzero(test)
+n_pos = int(y[train_idx].sum())
+print(f"{len(store):,} providers; train {len(train_idx):,} ({n_pos} positive), test {len(test_idx):,}")
+if n_pos == 0:
+    raise SystemExit("No positive labels in the training split")
+
+# 'balanced' weights: n / (2 * n_class)
+w_pos = len(train_idx) / (2 * n_pos)
+w_neg = len(train_idx) / (2 * (len(train_idx) - n_pos))
+
+
+def train_chunks(rng):
+    """Shuffled slices of the training rows, read from the memmap one chunk at a time."""
+    order = rng.permutation(train_idx)
+    for lo in range(0, len(order), args.chunk):
+        idx = np.sort(order[lo:lo + args.chunk])  # sorted reads stay sequential on disk
+        yield idx, signed_log1p(np.asarray(store.X[idx], dtype=np.float64))
+
+
+def score(model, idx, transform):
+    out = np.empty(len(idx))
+    for lo in range(0, len(idx), args.chunk):
+        part = idx[lo:lo + args.chunk]
+        out[lo:lo + len(part)] = model(transform(np.asarray(store.X[part], dtype=np.float64)))
+    return out
+
+
+# ============================================
+# Incremental model
+# ============================================
+print(f"\nIncremental SGD (log loss), {args.epochs} epochs x {args.chunk:,}-row chunks...")
+t0 = time.time()
+rng = np.random.default_rng(SEED)
+scaler = StandardScaler()
+for _, Xc in train_chunks(rng):
+    scaler.partial_fit(Xc)
+
+sgd = SGDClassifier(loss='log_loss', penalty='l2', alpha=args.alpha, learning_rate='optimal',
+                    average=True, random_state=SEED)
+for epoch in range(args.epochs):
+    for idx, Xc in train_chunks(rng):
+        yc = y[idx]
+        sgd.partial_fit(scaler.transform(Xc), yc, classes=[0, 1], sample_weight=np.where(yc == 1, w_pos, w_neg))
+    print(f"  epoch {epoch + 1}: {time.time() - t0:.1f}s")
+sgd_fit = time.time() - t0
+t1 = time.time()
+sgd_scores = score(lambda X: sgd.decision_function(X), test_idx, lambda X: scaler.transform(signed_log1p(X)))
+sgd_result = {
+    'model': 'sgd_logistic_incremental',
+    'params': {'epochs': args.epochs, 'chunk': args.chunk, 'alpha': args.alpha, 'averaged': True,
+               'classWeight': 'balanced', 'transform': 'signed_log1p + standard'},
+    'trainRows': int(len(train_idx)),
+    'fitSeconds': round(sgd_fit, 2),
+    'scoreSeconds': round(time.time() - t1, 2),
+    'peakRssMb': round(peak_rss_mb()),
+    **evaluate(y[test_idx], sgd_scores),
+}
+print(f"  AUC {sgd_result['auc']}, precision@k {sgd_result['precisionAtK']}, fit {sgd_fit:.1f}s")
+
+# ============================================
+# Baseline: v3 subsample Random Forest
+# ============================================
+rf_result = None
+if not args.skip_rf:
+    print(f"\nRandom Forest baseline (all train positives + {RF_NEG_SAMPLE:,} sampled negatives)...")
+    t0 = time.time()
+    rs = np.random.RandomState(SEED)
+    pos_idx = train_idx[y[train_idx] == 1]
+    neg_idx = train_idx[y[train_idx] == 0]
+    sub = np.sort(np.concatenate([pos_idx, rs.choice(neg_idx, size=min(RF_NEG_SAMPLE, len(neg_idx)), replace=False)]))
+    rf_scaler = StandardScaler().fit(store.X[sub])
+    rf = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=SEED, n_jobs=1,
+                                max_depth=12, max_features='sqrt', min_samples_leaf=3)
+    rf.fit(rf_scaler.transform(store.X[sub]), y[sub])
+    rf_fit = time.time() - t0
+    t1 = time.time()
+    rf_scores = score(lambda X: rf.predict_proba(X)[:, 1], test_idx, lambda X: rf_scaler.transform(X.astype(np.float32)))
+    rf_result = {
+        'model': 'random_forest_subsample',
+        'params': {'nEstimators': 100, 'maxDepth': 12, 'minSamplesLeaf': 3, 'negSubsampleSize': RF_NEG_SAMPLE,
+                   'classWeight': 'balanced'},
+        'trainRows': int(len(sub)),
+        'fitSeconds': round(rf_fit, 2),
+        'scoreSeconds': round(time.time() - t1, 2),
+        'peakRssMb': round(peak_rss_mb()),
+        **evaluate(y[test_idx], rf_scores),
+    }
+    print(f"  AUC {rf_result['auc']}, precision@k {rf_result['precisionAtK']}, fit {rf_fit:.1f}s")
+
+path = write_report('incremental-vs-rf', {
+    'seed': SEED,
+    'featureStore': store.meta,
+    'split': {'method': 'stratified holdout', 'testFraction': 0.2, 'trainRows': int(len(train_idx)),
+              'testRows': int(len(test_idx)), 'testPositives': int(y[test_idx].sum())},
+    'results': [r for r in (sgd_result, rf_result) if r],
+})
+print(f"\nReport -> {path}")
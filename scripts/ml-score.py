@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Score every provider with a saved model artifact, without retraining.
+
+Loads an artifact from ml_models.py (LATEST by default, i.e. the model last
+promoted by ml-v3-retrain.py / ml-v3-step2-lean.py), memory-maps the feature
+store, applies the artifact's scaler and scores all providers in CHUNK-row
+vectorized slices. Columns are matched by name, so artifacts trained with a
+different column order still line up.
+
+Outputs (public/data/):
+  ml-scores.json            same shape as ml-v3-retrain.py (top 1,000 + distribution)
+  ml-all-high-scores.json   top 500 overall plus the top 300 small ($10K-$1M)
+                            and top 200 medium ($1M-$10M) provider flags
+
+Run: python3 scripts/ml-score.py [--model VERSION_OR_DIR] [--chunk 100000]
+"""
+import os, time, argparse
+import numpy as np
+from jsonout import write_json
+from duckdb_session import connect
+from feature_store import open_store
+from ml_models import load_artifact
+
+OUT_DIR = os.path.expanduser("~/Projects/medicaid-tracker-app/public/data")
+TOP_SCORES = 1000
+TOP_HIGH = 500
+# band -> (min paid, max paid, entries kept), as in the published ml-all-high-scores.json
+SIZE_BANDS = {'smallProviderFlags': (10_000, 1_000_000, 300), 'mediumProviderFlags': (1_000_000, 10_000_000, 200)}
+
+parser = argparse.ArgumentParser(description='Batch-score all providers from a saved model artifact')
+parser.add_argument('--model', help='artifact version (e.g. rf-20250101-120000) or directory; default LATEST')
+parser.add_argument('--chunk', type=int, default=100000)
+args = parser.parse_args()
+
+t0 = time.time()
+model, art = load_artifact(args.model)
+store = open_store()
+missing = [c for c in art['featCols'] if c not in store.feat_cols]
+if missing:
+    raise SystemExit(f"Feature store lacks {missing}; rebuild it (ml-build-feature-store.py)")
+cols = [store.feat_cols.index(c) for c in art['featCols']]
+mean = np.asarray(art['scaler']['mean'], np.float64) if art.get('scaler') else None
+scale = np.asarray(art['scaler']['scale'], np.float64) if art.get('scaler') else None
+if hasattr(model, 'n_jobs'):
+    model.n_jobs = os.cpu_count()
+print(f"Model {art['version']} ({art['backend']}), {len(store):,} providers; loaded in {time.time() - t0:.1f}s")
+
+t1 = time.time()
+scores = np.empty(len(store))
+for lo, hi in store.chunks(args.chunk):
+    X = np.asarray(store.X[lo:hi][:, cols], dtype=np.float64)
+    if mean is not None:
+        X = (X - mean) / scale
+    scores[lo:hi] = model.predict_proba(X.astype(np.float32))[:, 1]
+print(f"Scored in {time.time() - t1:.1f}s")
+
+labels = store.labels()
+F = {c: j for j, c in enumerate(store.feat_cols)}
+order = np.argsort(-scores, kind='stable')
+paid = store.X[:, F['total_paid']]
+
+bands = {}
+for key, (lo, hi, size) in SIZE_BANDS.items():
+    in_band = order[(paid[order] > lo) & (paid[order] < hi)]
+    bands[key] = in_band[:size]
+needed = np.unique(np.concatenate([order[:max(TOP_SCORES, TOP_HIGH)], *bands.values()]))
+
+con = connect('ml')
+info = {npi: (specialty or '', state or '') for npi, specialty, state in con.execute(
+    f"SELECT npi, specialty, state FROM read_parquet(?) WHERE CAST(npi AS BIGINT) IN "
+    f"({','.join(str(int(store.npi[i])) for i in needed)})", [store.providers_path]).fetchall()}
+con.close()
+
+
+def num(i, col, digits=None):
+    v = float(store.X[i, F[col]])
+    return round(v, digits) if digits is not None else v
+
+
+def entry(i):
+    npi = store.npi_str(i)
+    specialty, state = info.get(npi, ('', ''))
+    return {
+        'npi': npi,
+        'mlScore': round(float(scores[i]), 6),
+        'totalPaid': num(i, 'total_paid'),
+        'totalClaims': int(num(i, 'total_claims')),
+        'totalBeneficiaries': int(num(i, 'total_benes')),
+        'codeCount': int(num(i, 'code_count')),
+        'activeMonths': int(num(i, 'active_months')),
+        'costPerClaim': num(i, 'cost_per_claim', 2),
+        'selfBillingRatio': num(i, 'self_bill_ratio', 3),
+        'topCodeConcentration': num(i, 'top_code_conc', 3),
+        'paidPerMonth': num(i, 'paid_per_month', 0),
+        'paidZSpecialty': num(i, 'paid_z_specialty', 2),
+        'cpcZSpecialty': num(i, 'cpc_z_specialty', 2),
+        'paidZState': num(i, 'paid_z_state', 2),
+        'specialty': specialty,
+        'state': state,
+        'isExcluded': bool(labels['any'][i]),
+        'isFraudExcluded': bool(labels['fraud'][i]),
+    }
+
+
+distribution = {f'p{str(q).replace(".", "")}': round(float(np.percentile(scores, q)), 6)
+                for q in (50, 75, 90, 95, 99, 99.9)}
+metrics = art.get('metrics', {})
+model_type = art.get('modelType', art['backend'])
+
+write_json(os.path.join(OUT_DIR, 'ml-scores.json'), {
+    'modelType': model_type,
+    'modelVersion': art.get('modelVersion', art['version']),
+    'artifactVersion': art['version'],
+    'modelAuc': metrics.get('auc'),
+    'modelPrecision': metrics.get('precision'),
+    'modelRecall': metrics.get('recall'),
+    'modelF1': metrics.get('f1'),
+    'threshold': metrics.get('threshold', 0.5),
+    'totalProviders': len(store),
+    'positiveLabels': int(labels['fraud'].sum()),
+    'labelSource': art.get('labelSource', ''),
+    'featuresUsed': art['featCols'],
+    'featureImportances': art.get('featureImportances', {}),
+    'topProviders': [entry(i) for i in order[:TOP_SCORES]],
+    'scoreDistribution': distribution,
+    'trainingConfig': art.get('trainingConfig', {}),
+}, precision=6)
+
+write_json(os.path.join(OUT_DIR, 'ml-all-high-scores.json'), {
+    'modelType': model_type,
+    'modelAuc': metrics.get('auc'),
+    'artifactVersion': art['version'],
+    'totalProviders': len(store),
+    'featuresUsed': art['featCols'],
+    'allModelResults': [{model_type: metrics.get('auc')}],
+    'topProviders': [entry(i) for i in order[:TOP_HIGH]],
+    **{key: [entry(i) for i in idx] for key, idx in bands.items()},
+    'scoreDistribution': distribution,
+}, precision=6)
+
+print(f"\nDone in {time.time() - t0:.1f}s -> ml-scores.json, ml-all-high-scores.json")
+print(f"Scores: {distribution}")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Successive-halving hyperparameter search for the fraud model.
+
+Samples --configs candidates from SPACES[backend] (model parameters plus the
+negative-sample size the v3 recipe trains on) and races them over stratified
+cross-validation folds:
+
+  rung 0  every candidate on RUNG_FOLDS[0] fold(s)
+  rung r  the best 1/ETA by mean fold AUC continue, on RUNG_FOLDS[r] folds
+          (folds scored in earlier rungs are reused)
+
+(candidate, fold) fits run in a process pool. Workers memory-map the feature
+store and the cached fold assignment (SEARCH_DIR/folds-*.npy, keyed on the store
+build, the OIG file and the seed), so the matrix is shared through the page
+cache instead of being copied into every process.
+
+The winner is written to SEARCH_DIR/best-{backend}.json; ml-v3-retrain.py
+--tuned trains with it and records it in the trainingConfig block of
+ml-scores.json. Every rung's results go to the ml reports directory
+(search-{backend}.json).
+
+Run: python3 scripts/ml-search.py [--backend rf|hgb] [--configs 27] [--workers N]
+"""
+import argparse, hashlib, json, math, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from threadpoolctl import threadpool_limits
+from feature_store import open_store, OIG_CSV
+from ml_eval import evaluate, write_report
+from ml_models import BACKENDS, TUNED_DIR, make_model, SEED
+
+SEARCH_DIR = TUNED_DIR
+N_FOLDS = 5
+RUNG_FOLDS = (1, 2, 5)
+ETA = 3
+SPACES = {
+    'rf': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [8, 12, 16, None],
+        'min_samples_leaf': [1, 3, 5, 10],
+        'max_features': ['sqrt', 0.3, 0.5],
+        'negSample': [5000, 10000, 20000, 50000],
+    },
+    'hgb': {
+        'learning_rate': [0.03, 0.1, 0.2],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [20, 50, 100],
+        'l2_regularization': [0.0, 1.0, 10.0],
+        'negSample': [10000, 50000, 200000, None],  # None = every training negative
+    },
+}
+
+_w = {}
+
+
+def fold_assignment(store, y):
+    """int8 fold id per store row (stratified), cached on disk and memory-mapped."""
+    key = hashlib.sha1(json.dumps([store.meta['builtAt'], store.meta['nProviders'],
+                                   os.path.getmtime(OIG_CSV), SEED, N_FOLDS]).encode()).hexdigest()[:12]
+    path = os.path.join(SEARCH_DIR, f'folds-{key}.npy')
+    if not os.path.exists(path):
+        rng = np.random.default_rng(SEED)
+        folds = np.empty(len(y), np.int8)
+        for cls in (0, 1):
+            idx = rng.permutation(np.flatnonzero(y == cls))
+            folds[idx] = np.arange(len(idx)) % N_FOLDS
+        np.save(path + '.tmp.npy', folds)
+        os.replace(path + '.tmp.npy', path)
+    return path, key
+
+
+def sample_configs(backend, n):
+    space = SPACES[backend]
+    rng = np.random.default_rng(SEED)
+    total = math.prod(len(v) for v in space.values())
+    seen, configs = set(), []
+    while len(configs) < min(n, total):
+        cfg = {k: v[rng.integers(len(v))] for k, v in space.items()}
+        key = json.dumps(cfg, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configs.append(cfg)
+    return configs
+
+
+def mean_auc(fold_results, n_folds):
+    aucs = [fold_results[f]['auc'] for f in range(n_folds) if fold_results[f]['auc'] is not None]
+    return float(np.mean(aucs)) if aucs else 0.0
+
+
+def init_worker(folds_path):
+    store = open_store()
+    _w.update(store=store, y=store.labels()['fraud'], folds=np.load(folds_path, mmap_mode='r'))
+
+
+def run_fold(task):
+    """Fit one candidate on the other folds (all positives + negSample negatives) and score the held-out fold."""
+    cfg_id, backend, cfg, fold = task
+    t0 = time.time()
+    store, y, folds = _w['store'], _w['y'], _w['folds']
+    train = np.flatnonzero(folds != fold)
+    test = np.flatnonzero(folds == fold)
+    neg = train[y[train] == 0]
+    n_neg = cfg['negSample']
+    if n_neg is not None and n_neg < len(neg):
+        # seeded by fold and size only, so candidates with the same negSample see the same rows
+        neg = np.random.default_rng([SEED, fold, n_neg]).choice(neg, size=n_neg, replace=False)
+    rows = np.sort(np.concatenate([train[y[train] == 1], neg]))
+    params = {k: v for k, v in cfg.items() if k != 'negSample'}
+    with threadpool_limits(1):
+        mdl = make_model(backend, **params)
+        mdl.fit(np.asarray(store.X[rows]), y[rows])
+        scores = np.empty(len(test))
+        for lo in range(0, len(test), 100000):
+            part = test[lo:lo + 100000]
+            scores[lo:lo + len(part)] = mdl.predict_proba(np.asarray(store.X[part]))[:, 1]
+    return cfg_id, fold, {**evaluate(y[test], scores), 'trainRows': int(len(rows)),
+                          'seconds': round(time.time() - t0, 2)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Successive-halving hyperparameter search')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='rf')
+    parser.add_argument('--configs', type=int, default=ETA ** len(RUNG_FOLDS), help='candidates in the first rung')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    t0 = time.time()
+    os.makedirs(SEARCH_DIR, exist_ok=True)
+    store = open_store()
+    y = store.labels()['fraud']
+    if y.sum() < N_FOLDS:
+        raise SystemExit(f"Only {int(y.sum())} positive labels; need at least {N_FOLDS} for {N_FOLDS}-fold search")
+    folds_path, folds_key = fold_assignment(store, y)
+    configs = sample_configs(args.backend, args.configs)
+    print(f"Search: {len(configs)} {args.backend} candidates, rungs on {RUNG_FOLDS} folds, eta {ETA}; "
+          f"{len(store):,} providers, {int(y.sum())} positive; folds {folds_key}")
+
+    results = {i: {} for i in range(len(configs))}  # cfg_id -> {fold: metrics}
+    alive = list(range(len(configs)))
+    rungs = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(folds_path,)) as pool:
+        for r, n_folds in enumerate(RUNG_FOLDS):
+            t1 = time.time()
+            tasks = [(i, args.backend, configs[i], f) for i in alive for f in range(n_folds) if f not in results[i]]
+            for cfg_id, fold, m in pool.map(run_fold, tasks):
+                results[cfg_id][fold] = m
+            auc = {i: mean_auc(results[i], n_folds) for i in alive}
+            ranked = sorted(alive, key=lambda i: -auc[i])
+            rungs.append({'rung': r, 'folds': n_folds, 'fits': len(tasks), 'seconds': round(time.time() - t1, 2),
+                          'candidates': [{'id': i, 'config': configs[i], 'meanAuc': round(auc[i], 4)}
+                                         for i in ranked]})
+            print(f"  rung {r}: {len(alive)} candidates x {n_folds} folds ({len(tasks)} fits) in "
+                  f"{time.time() - t1:.1f}s; best AUC {auc[ranked[0]]:.4f}")
+            if r < len(RUNG_FOLDS) - 1:
+                alive = ranked[:max(1, math.ceil(len(alive) / ETA))]
+            else:
+                alive = ranked[:1]
+
+    best = alive[0]
+    final = [results[best][f] for f in range(RUNG_FOLDS[-1])]
+    best_auc = mean_auc(results[best], RUNG_FOLDS[-1])
+    params = {k: v for k, v in configs[best].items() if k != 'negSample'}
+    chosen = {
+        'backend': args.backend,
+        'params': params,
+        'negSample': configs[best]['negSample'],
+        'search': {
+            'method': 'successive_halving',
+            'candidates': len(configs),
+            'eta': ETA,
+            'rungFolds': list(RUNG_FOLDS),
+            'metric': 'mean fold AUC',
+            'meanAuc': round(best_auc, 4),
+            'precisionAtK': {k: round(float(np.mean([m['precisionAtK'][k] for m in final])), 4)
+                             for k in final[0]['precisionAtK']},
+            'folds': folds_key,
+            'searchedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    best_path = os.path.join(SEARCH_DIR, f'best-{args.backend}.json')
+    with open(best_path + '.tmp', 'w') as f:
+        json.dump(chosen, f, indent=2)
+    os.replace(best_path + '.tmp', best_path)
+
+    path = write_report(f'search-{args.backend}', {
+        'seed': SEED, 'workers': args.workers, 'elapsedSeconds': round(time.time() - t0, 2),
+        'featureStore': store.meta, 'space': SPACES[args.backend], 'chosen': chosen, 'rungs': rungs,
+    })
+    print(f"\nBest: {params}, negSample {configs[best]['negSample']}, mean AUC {best_auc:.4f}")
+    print(f"Done in {time.time() - t0:.1f}s -> {best_path} (train with ml-v3-retrain.py --tuned); report {path}")
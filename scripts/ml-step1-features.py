@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """Step 1: Extract ML features to CSV using DuckDB (low memory)"""
-import duckdb, os
+import os
+from duckdb_session import connect
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OUT = '/tmp/ml_features.csv'
 
-con = duckdb.connect()
+con = connect('ml')
 
 print("Extracting provider features (this takes ~2 min)...")
 con.execute(f"""
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Step 2 MICRO: Train on subsample, score all providers in batches."""
-import csv, json, os, gc
+import csv, os, gc
 import numpy as np
+from jsonout import write_json
 
 FEATURES_CSV = '/tmp/ml_features.csv'
 OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
@@ -201,8 +202,7 @@ output = {
 }
 
 out_path = os.path.join(OUT_DIR, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
 
 print(f"\nSaved to {out_path}")
 print(f"Model: random_forest, AUC: {auc:.4f}")
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Step 2 LEAN: Train ML model with minimal RAM usage.
 Key changes: n_jobs=1 everywhere, smaller RF, gc.collect between steps."""
-import csv, json, os, gc
+import csv, os, gc
 import numpy as np
 
 FEATURES_CSV = '/tmp/ml_features.csv'
@@ -56,6 +56,7 @@ del X; gc.collect()
 print(f"\nSUPERVISED: {excluded} positive labels")
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import cross_val_score
+from jsonout import write_json
 
 # Lean RF: fewer trees, n_jobs=1 to avoid duplicating memory
 mdl = RandomForestClassifier(
@@ -157,8 +158,7 @@ output = {
 }
 
 out_path = os.path.join(OUT_DIR, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
 
 print(f"\nSaved to {out_path}")
 print(f"Model: random_forest, AUC: {auc:.4f}")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Step 2: Train ML model on extracted features CSV"""
-import csv, json, os, numpy as np
+import csv, os, numpy as np
 
 FEATURES_CSV = '/tmp/ml_features.csv'
 OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
@@ -45,6 +45,7 @@ excluded = y.sum()
 print(f"  {len(oig_npis):,} OIG NPIs, {excluded} matched in data")
 
 from sklearn.preprocessing import StandardScaler
+from jsonout import write_json
 scaler = StandardScaler()
 X_scaled = scaler.fit_transform(X)
 
@@ -135,8 +136,7 @@ output = {
 }
 
 out_path = os.path.join(OUT_DIR, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
 
 print(f"\nSaved to {out_path}")
 print(f"Model: {model_type}, AUC: {model_auc}")
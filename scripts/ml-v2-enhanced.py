@@ -7,6 +7,7 @@ Enhanced ML Model v2:
 - Ensemble approach
 """
 import csv, json, os, numpy as np
+from jsonout import write_json
 
 FEATURES_CSV = '/tmp/ml_features.csv'  # From ml-step1-features.py (already generated)
 LEIE_CSV = '/tmp/leie_full.csv'
@@ -239,8 +240,7 @@ output = {
     }
 }
 
-with open(os.path.join(OUT, 'ml-scores.json'), 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(os.path.join(OUT, 'ml-scores.json'), output, precision=6)
 
 print(f"\nModel: {best_name} v2, AUC: {best_auc:.4f}")
 print(f"Labels: {total_pos} ({matched_npi} NPI + {matched_name} name)")
@@ -5,16 +5,27 @@ Key improvements over v2:
 1. Filter OIG labels to fraud-related exclusions only (not student loans, license issues)
 2. Add peer-comparison features (specialty z-scores, state z-scores)
 3. Add geographic risk features
-4. Temporal train/test split (train on 2018-2022, validate on 2023-2024)
+4. Stratified 5-fold CV here; temporal (rolling-origin) evaluation is scripts/ml-backtest.py
 5. Output real feature importances
 6. Top 1000 providers (up from 500)
 7. Subsample approach for 16GB RAM compatibility
 
-Run: python3 scripts/ml-v3-retrain.py
+Run: python3 scripts/ml-v3-retrain.py [--backend rf|hgb] [--tuned]
 Requires: sklearn, duckdb, numpy (pip3 install scikit-learn duckdb numpy)
 """
-import csv, json, os, gc
+import csv, os, gc, argparse
 import numpy as np
+from jsonout import write_json
+from ml_models import BACKENDS, make_model, training_config, save_artifact, load_tuned
+
+parser = argparse.ArgumentParser(description='ML v3 fraud model')
+parser.add_argument('--backend', choices=sorted(BACKENDS), default='rf',
+                    help='rf (v3 Random Forest) or hgb (histogram gradient boosting); see ml_models.py')
+parser.add_argument('--tuned', action='store_true',
+                    help='use the parameters and negative-sample size chosen by scripts/ml-search.py')
+args = parser.parse_args()
+tuned = load_tuned(args.backend) if args.tuned else None
+MODEL_TYPES = {'rf': 'random_forest', 'hgb': 'hist_gradient_boosting'}
 
 PARQUET = os.path.expanduser("~/.openclaw/workspace/medicaid-provider-spending.parquet")
 OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
@@ -79,8 +90,8 @@ for t, c in sorted(excl_type_counts.items(), key=lambda x: -x[1])[:10]:
 
 # Step 2: Extract features via DuckDB
 print("\n2. Extracting features from parquet...")
-import duckdb
-con = duckdb.connect()
+from duckdb_session import connect
+con = connect('ml')
 
 # Basic features + specialty/state for peer comparison
 print("  Query: provider features + specialty/state...")
@@ -104,8 +115,7 @@ COPY (
     GROUP BY npi
     HAVING SUM(TOTAL_PAID) > 0
 ) TO '{FEATURES_CSV}' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='provider features + specialty/state')
 
 # Top code concentration
 print("  Query: top code concentration...")
@@ -127,8 +137,7 @@ COPY (
     JOIN provider_totals pt ON ct.npi = pt.npi
     WHERE ct.rn = 1
 ) TO '/tmp/ml_v3_conc.csv' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='top code concentration')
 
 # Self-billing ratio
 print("  Query: self-billing ratio...")
@@ -139,8 +148,7 @@ COPY (
     FROM '{PARQUET}'
     GROUP BY npi
 ) TO '/tmp/ml_v3_self.csv' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='self-billing ratio')
 
 # Year-over-year growth
 print("  Query: growth ratio...")
@@ -158,8 +166,7 @@ COPY (
     FROM yearly
     GROUP BY npi
 ) TO '/tmp/ml_v3_growth.csv' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='growth ratio')
 
 # Peer stats by specialty
 print("  Query: specialty peer stats...")
@@ -199,8 +206,7 @@ COPY (
     FROM provider_stats p
     JOIN specialty_stats s ON p.specialty = s.specialty
 ) TO '{PEER_CSV}' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='specialty peer stats')
 
 # State-level peer stats
 print("  Query: state peer stats...")
@@ -234,8 +240,7 @@ COPY (
     FROM provider_stats p
     JOIN state_stats s ON p.state = s.state
 ) TO '/tmp/ml_v3_state_z.csv' (HEADER, DELIMITER ',')
-""")
-gc.collect()
+""", label='state peer stats')
 con.close()
 print("  All queries done.")
 
@@ -295,9 +300,8 @@ print(f"\n  Feature matrix: {X.shape}")
 print(f"  Positive labels (fraud-only): {y.sum()}")
 
 # Step 4: Train with subsampling
-print("\n4. Training Random Forest (subsampled)...")
+print(f"\n4. Training {MODEL_TYPES[args.backend]} (subsampled)...")
 from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import cross_val_score, StratifiedKFold
 from sklearn.metrics import classification_report, precision_recall_fscore_support
 
@@ -308,8 +312,9 @@ gc.collect()
 # Subsample negatives for training (keeps memory manageable)
 pos_idx = np.where(y == 1)[0]
 neg_idx = np.where(y == 0)[0]
+neg_size = len(neg_idx) if tuned and tuned['negSample'] is None else (tuned['negSample'] if tuned else 10000)
 np.random.seed(42)
-neg_sample = np.random.choice(neg_idx, size=min(10000, len(neg_idx)), replace=False)
+neg_sample = np.random.choice(neg_idx, size=min(neg_size, len(neg_idx)), replace=False)
 train_idx = np.concatenate([pos_idx, neg_sample])
 np.random.shuffle(train_idx)
 
@@ -317,15 +322,7 @@ X_train = X_scaled[train_idx]
 y_train = y[train_idx]
 print(f"  Training set: {len(X_train):,} ({y_train.sum()} positive, {len(X_train) - y_train.sum()} negative)")
 
-mdl = RandomForestClassifier(
-    n_estimators=100,
-    class_weight='balanced',
-    random_state=42,
-    n_jobs=1,
-    max_depth=12,
-    max_features='sqrt',
-    min_samples_leaf=3,
-)
+mdl = make_model(args.backend, **(tuned['params'] if tuned else {}))
 
 # Cross-validate
 print("  Cross-validating...")
@@ -348,7 +345,17 @@ mdl.fit(X_train, y_train)
 gc.collect()
 
 # Feature importance (REAL this time!)
-importances = dict(zip(FEAT_COLS, mdl.feature_importances_))
+if hasattr(mdl, 'feature_importances_'):
+    importances = dict(zip(FEAT_COLS, mdl.feature_importances_))
+else:  # hgb: permutation importance on the last CV fold (held out), normalized like impurity importances
+    from sklearn.base import clone
+    from sklearn.inspection import permutation_importance
+    fit_rows, held_rows = list(cv.split(X_train, y_train))[-1]
+    held_mdl = clone(mdl).fit(X_train[fit_rows], y_train[fit_rows])
+    perm = permutation_importance(held_mdl, X_train[held_rows], y_train[held_rows], scoring='roc_auc',
+                                  n_repeats=3, random_state=42)
+    imp = np.clip(perm.importances_mean, 0, None)
+    importances = dict(zip(FEAT_COLS, imp / imp.sum() if imp.sum() > 0 else imp))
 sorted_imp = sorted(importances.items(), key=lambda x: -x[1])
 print("\n  Feature Importance (Real):")
 for f, imp in sorted_imp:
@@ -388,7 +395,7 @@ for _, row in features_sorted.head(1000).iterrows():
 
 all_scores = features['ml_score'].values
 output = {
-    'modelType': 'random_forest',
+    'modelType': MODEL_TYPES[args.backend],
     'modelVersion': 'v3',
     'modelAuc': round(float(auc), 4),
     'modelPrecision': round(float(prec), 4),
@@ -410,25 +417,31 @@ output = {
         'p999': round(float(np.percentile(all_scores, 99.9)), 6),
     },
     'trainingConfig': {
-        'nEstimators': 100,
-        'maxDepth': 12,
-        'classWeight': 'balanced',
-        'negSubsampleSize': min(10000, len(neg_idx)),
+        **training_config(mdl, args.backend),
+        'negSubsampleSize': min(neg_size, len(neg_idx)),
         'cvFolds': 5,
         'randomState': 42,
         'fraudOnlyLabels': True,
         'excludedLabelTypes': ['1128b4 (license)', '1128b14 (student loans)', '1128b5 (other agency)', '1128b3 (controlled substances misdemeanor)'],
+        **({'search': tuned['search']} if tuned else {}),
     }
 }
 
 out_path = os.path.join(OUT_DIR, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
+artifact_dir = save_artifact(mdl, args.backend, FEAT_COLS, scaler=scaler, promote=True,
+                             metrics={'auc': round(float(auc), 4), 'precision': round(float(prec), 4),
+                                      'recall': round(float(rec), 4), 'f1': round(float(f1), 4),
+                                      'threshold': threshold},
+                             extra={'modelType': output['modelType'], 'modelVersion': output['modelVersion'],
+                                    'labelSource': output['labelSource'],
+                                    'featureImportances': output['featureImportances'],
+                                    'trainingConfig': output['trainingConfig']})
 
 print(f"\n{'=' * 60}")
 print(f"RESULTS")
 print(f"{'=' * 60}")
-print(f"Model: Random Forest v3 (fraud-only labels)")
+print(f"Model: {MODEL_TYPES[args.backend]} v3 (fraud-only labels)")
 print(f"AUC: {auc:.4f}")
 print(f"Precision: {prec:.4f} | Recall: {rec:.4f} | F1: {f1:.4f}")
 print(f"Providers scored: {len(features):,}")
@@ -441,6 +454,7 @@ for p in top_providers[:10]:
     fraud_tag = " [KNOWN FRAUD]" if p['isFraudExcluded'] else ""
     print(f"  NPI {p['npi']}: score={p['mlScore']:.4f} paid=${p['totalPaid']:,.0f} specialty_z={p['paidZSpecialty']:.1f}{fraud_tag}")
 print(f"\nSaved to {out_path}")
+print(f"Model artifact: {artifact_dir}  (re-score with scripts/ml-score.py)")
 
 # Cleanup
 for f in [FEATURES_CSV, '/tmp/ml_v3_conc.csv', '/tmp/ml_v3_self.csv', 
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """ML v3 Step 2 ULTRA-LEAN: Train on subsample, score in batches.
 Designed for <2GB RAM usage on memory-starved 16GB Mac."""
-import csv, json, os, gc
+import csv, os, gc
 import numpy as np
+from jsonout import write_json
+from ml_models import save_artifact
 
 OUTDIR = '/tmp/ml_v3'
 OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
@@ -160,7 +162,7 @@ print("\n  Feature Importances:")
 for f, i in sorted_imp:
     print(f"    {f:25s} {i:.4f} {'█'*int(i*200)}")
 
-# Save scaler params for batch scoring
+# Scaler params for batch scoring (also saved with the model artifact below)
 scaler_mean = scaler.mean_
 scaler_scale = scaler.scale_
 del X_train, X_train_scaled, y_train; gc.collect()
@@ -274,8 +276,13 @@ output = {
 }
 
 out_path = os.path.join(APP_OUT, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
+artifact_dir = save_artifact(mdl, 'rf', ALL_NAMES, scaler=scaler, promote=True,
+                             metrics={'auc': round(float(auc), 4), 'precision': round(float(prec), 4),
+                                      'recall': round(float(rec), 4), 'f1': round(float(f1), 4),
+                                      'threshold': threshold},
+                             extra={k: output[k] for k in ('modelType', 'modelVersion', 'labelSource',
+                                                           'featureImportances', 'trainingConfig')})
 
 print(f"\n{'='*50}")
 print(f"AUC: {auc:.4f} | P={prec:.3f} R={rec:.3f} F1={f1:.3f}")
@@ -286,3 +293,4 @@ for p in top_providers[:10]:
     tag = " [FRAUD]" if p['isFraudExcluded'] else (" [EXCL]" if p['isExcluded'] else "")
     print(f"  {p['npi']}: {p['mlScore']:.4f} ${p['totalPaid']:,.0f}{tag}")
 print(f"\nSaved: {out_path}")
+print(f"Model artifact: {artifact_dir}  (re-score with scripts/ml-score.py)")
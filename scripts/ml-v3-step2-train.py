@@ -4,8 +4,9 @@ ML v3 Step 2: Train improved model on pre-extracted features.
 Designed for 16GB RAM — uses subsampling and n_jobs=1.
 Run after: bash scripts/ml-v3-step1-extract.sh
 """
-import csv, json, os, gc
+import csv, os, gc
 import numpy as np
+from jsonout import write_json
 
 OUTDIR = '/tmp/ml_v3'
 OIG_CSV = os.path.expanduser("~/Projects/medicaid-tracker-app/reference-data/oig-exclusions.csv")
@@ -275,8 +276,7 @@ output = {
 }
 
 out_path = os.path.join(APP_OUT, 'ml-scores.json')
-with open(out_path, 'w') as f:
-    json.dump(output, f, indent=2)
+write_json(out_path, output, precision=6)
 
 print(f"\n{'='*60}")
 print("RESULTS")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Shared evaluation helpers for the ML scripts: splits, metrics and run reports.
+
+Reports are JSON files in REPORT_DIR (one per run name, overwritten), recording
+the parameters, seeds and timings needed to reproduce a comparison.
+"""
+import json, os, platform, time
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+REPORT_DIR = os.path.expanduser("~/.openclaw/workspace/ml/reports")
+K_VALUES = (100, 500, 1000)
+TRAIN, VALID, TEST = 0, 1, 2  # temporal_split codes
+
+
+def holdout_mask(y, frac=0.2, seed=42):
+    """Boolean test mask holding out frac of each class (stratified, reproducible)."""
+    rng = np.random.default_rng(seed)
+    test = np.zeros(len(y), bool)
+    for cls in np.unique(y):
+        idx = np.flatnonzero(y == cls)
+        test[rng.choice(idx, size=max(1, int(round(len(idx) * frac))), replace=False)] = True
+    return test
+
+
+def temporal_split(y, excl_year, valid_year, test_year, valid_frac=0.1, test_frac=0.2, seed=42):
+    """Per-row TRAIN / VALID / TEST by exclusion date: positives excluded before valid_year
+    (or undated) train, [valid_year, test_year) validate, >= test_year test. Negatives have
+    no date and are split at random in the same proportions."""
+    rng = np.random.default_rng(seed)
+    split = np.full(len(y), TRAIN, np.int8)
+    pos = y == 1
+    split[pos & (excl_year >= valid_year)] = VALID
+    split[pos & (excl_year >= test_year)] = TEST
+    neg = rng.permutation(np.flatnonzero(~pos))
+    n_valid, n_test = int(len(neg) * valid_frac), int(len(neg) * test_frac)
+    split[neg[:n_valid]] = VALID
+    split[neg[n_valid:n_valid + n_test]] = TEST
+    return split
+
+
+def precision_at_k(y_true, scores, k):
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return float(y_true[top].mean())
+
+
+def evaluate(y_true, scores, k_values=K_VALUES):
+    """{auc, precisionAtK: {k: p}}; auc is None when only one class is present."""
+    auc = roc_auc_score(y_true, scores) if 0 < y_true.sum() < len(y_true) else None
+    return {
+        'auc': round(float(auc), 4) if auc is not None else None,
+        'positives': int(y_true.sum()),
+        'n': int(len(y_true)),
+        'precisionAtK': {str(k): round(precision_at_k(y_true, scores, k), 4) for k in k_values if k <= len(scores)},
+    }
+
+
+def write_report(name, report):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report = {'name': name, 'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'host': {'cpus': os.cpu_count(), 'python': platform.python_version()}, **report}
+    path = os.path.join(REPORT_DIR, f'{name}.json')
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
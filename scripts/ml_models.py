@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Model backends and on-disk artifacts for the fraud model.
+
+Backends (make_model(name, **overrides)):
+  rf    RandomForestClassifier as in ml-v3-retrain.py (100 trees, depth 12)
+  hgb   HistGradientBoostingClassifier: 255-bin histograms, multithreaded,
+        early stopping on a caller-supplied validation set (X_val / y_val)
+
+save_artifact() writes MODEL_DIR/{backend}-{YYYYmmdd-HHMMSS}/ with model.joblib and
+artifact.json (backend, params, feature schema, scaler mean/scale, metrics);
+promote=True also points MODEL_DIR/LATEST at it. load_artifact() reads one back
+(latest by default) for scripts/ml-score.py.
+
+load_tuned() returns the configuration chosen by scripts/ml-search.py
+(TUNED_DIR/best-{backend}.json) for ml-v3-retrain.py --tuned.
+
+tree_paths() / path_contributions() give per-row feature contributions for either
+backend by walking each tree's decision path (Saabas attribution; the fallback
+when shap is not installed, see scripts/ml-explain.py).
+"""
+import json, os, time
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+
+MODEL_DIR = os.path.expanduser("~/.openclaw/workspace/ml/models")
+TUNED_DIR = os.path.expanduser("~/.openclaw/workspace/ml/search")
+ARTIFACT_FORMAT = 1  # bump when artifact.json changes incompatibly
+SEED = 42
+
+BACKENDS = {
+    'rf': {
+        'cls': RandomForestClassifier,
+        'params': {'n_estimators': 100, 'class_weight': 'balanced', 'random_state': SEED, 'n_jobs': 1,
+                   'max_depth': 12, 'max_features': 'sqrt', 'min_samples_leaf': 3},
+        'scaled': True,   # fitted on StandardScaler output, as in v3
+    },
+    'hgb': {
+        'cls': HistGradientBoostingClassifier,
+        'params': {'learning_rate': 0.1, 'max_iter': 500, 'max_leaf_nodes': 31, 'min_samples_leaf': 20,
+                   'l2_regularization': 1.0, 'max_bins': 255, 'class_weight': 'balanced',
+                   'early_stopping': True, 'n_iter_no_change': 20, 'scoring': 'loss',
+                   'random_state': SEED},
+        'scaled': False,  # binned; scaling is a no-op for trees
+    },
+}
+
+
+def make_model(backend, **overrides):
+    spec = BACKENDS[backend]
+    return spec['cls'](**{**spec['params'], **overrides})
+
+
+def is_scaled(backend):
+    return BACKENDS[backend]['scaled']
+
+
+def fit(model, X, y, X_val=None, y_val=None):
+    """fit(), passing the validation set to backends that early-stop on it."""
+    if isinstance(model, HistGradientBoostingClassifier) and X_val is not None:
+        return model.fit(X, y, X_val=X_val, y_val=y_val)
+    return model.fit(X, y)
+
+
+def training_config(model, backend):
+    """camelCase subset of the model's params for the trainingConfig block of ml-scores.json."""
+    p = model.get_params()
+    keys = {'n_estimators': 'nEstimators', 'max_depth': 'maxDepth', 'min_samples_leaf': 'minSamplesLeaf',
+            'max_features': 'maxFeatures', 'class_weight': 'classWeight', 'learning_rate': 'learningRate',
+            'max_iter': 'maxIter', 'max_leaf_nodes': 'maxLeafNodes', 'l2_regularization': 'l2Regularization',
+            'max_bins': 'maxBins', 'random_state': 'randomState'}
+    cfg = {'backend': backend, **{v: p[k] for k, v in keys.items() if k in p}}
+    if hasattr(model, 'n_iter_'):
+        cfg['iterationsUsed'] = int(model.n_iter_)
+    return cfg
+
+
+def save_artifact(model, backend, feat_cols, scaler=None, metrics=None, extra=None, promote=False,
+                  model_dir=MODEL_DIR):
+    """Write the model and its metadata; returns the artifact directory."""
+    version = f"{backend}-{time.strftime('%Y%m%d-%H%M%S')}"
+    path = os.path.join(model_dir, version)
+    os.makedirs(path, exist_ok=True)
+    joblib.dump(model, os.path.join(path, 'model.joblib'), compress=3)
+    meta = {
+        'artifactFormat': ARTIFACT_FORMAT,
+        'version': version,
+        'backend': backend,
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'featCols': list(feat_cols),
+        'scaler': None if scaler is None else {
+            'mean': np.asarray(scaler.mean_).tolist(), 'scale': np.asarray(scaler.scale_).tolist()},
+        'trainingConfig': training_config(model, backend),
+        'metrics': metrics or {},
+        **(extra or {}),
+    }
+    with open(os.path.join(path, 'artifact.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    if promote:
+        with open(os.path.join(model_dir, 'LATEST'), 'w') as f:
+            f.write(version + '\n')
+    return path
+
+
+def load_artifact(version=None, model_dir=MODEL_DIR):
+    """(model, artifact meta) for a version name or directory; LATEST when version is None."""
+    if version and os.path.isdir(version):
+        path = version
+    else:
+        if version is None:
+            latest = os.path.join(model_dir, 'LATEST')
+            if not os.path.exists(latest):
+                raise SystemExit(f"No promoted model in {model_dir}; train one (ml-v3-retrain.py) or pass --model")
+            with open(latest) as f:
+                version = f.read().strip()
+        path = os.path.join(model_dir, version)
+    with open(os.path.join(path, 'artifact.json')) as f:
+        meta = json.load(f)
+    if meta.get('artifactFormat') != ARTIFACT_FORMAT:
+        raise SystemExit(f"{path}: artifact format {meta.get('artifactFormat')}, expected {ARTIFACT_FORMAT}; retrain")
+    return joblib.load(os.path.join(path, 'model.joblib')), meta
+
+
+def load_tuned(backend, tuned_dir=TUNED_DIR):
+    """{params, negSample, search} written by ml-search.py for this backend."""
+    path = os.path.join(tuned_dir, f'best-{backend}.json')
+    if not os.path.exists(path):
+        raise SystemExit(f"No search result at {path}; run scripts/ml-search.py --backend {backend}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def tree_paths(model):
+    """(trees, scale, base, units) for path_contributions(). Each tree is (feature,
+    threshold, left, right, value) node arrays with left == -1 at leaves and value the
+    expected output at every node. RF values are class-1 probabilities averaged over
+    trees; HGB values are log-odds summed over iterations, with internal-node values
+    filled in as count-weighted means of their children."""
+    if isinstance(model, HistGradientBoostingClassifier):
+        trees = []
+        for (pred,) in model._predictors:
+            nd = pred.nodes
+            left = np.where(nd['is_leaf'], -1, nd['left'].astype(np.intp))
+            right = nd['right'].astype(np.intp)
+            value = nd['value'].astype(np.float64)
+            count = nd['count'].astype(np.float64)
+            for i in np.argsort(-nd['depth'], kind='stable'):  # children before parents
+                if left[i] != -1:
+                    value[i] = (count[left[i]] * value[left[i]] + count[right[i]] * value[right[i]]) / count[i]
+            trees.append((nd['feature_idx'].astype(np.intp), nd['num_threshold'], left, right, value))
+        base = float(np.ravel(model._baseline_prediction)[0]) + sum(t[4][0] for t in trees)
+        return trees, 1.0, base, 'log-odds'
+    trees = []
+    for est in model.estimators_:
+        t = est.tree_
+        v = t.value[:, 0, :]
+        trees.append((t.feature.astype(np.intp), t.threshold, t.children_left.astype(np.intp),
+                      t.children_right.astype(np.intp), v[:, 1] / v.sum(axis=1)))
+    return trees, 1.0 / len(trees), sum(t[4][0] for t in trees) / len(trees), 'probability'
+
+
+def path_contributions(paths, X):
+    """[n, n_features] contributions; base + row sum equals the model output (predict_proba
+    for RF, decision_function for HGB). X must be what the model was fitted on (scaled for
+    RF) and free of NaN."""
+    trees, scale, _, _ = paths
+    out = np.zeros(X.shape)
+    for feature, threshold, left, right, value in trees:
+        node = np.zeros(len(X), np.intp)
+        active = np.arange(len(X))
+        while len(active):
+            cur = node[active]
+            f = feature[cur]
+            child = np.where(X[active, f] <= threshold[cur], left[cur], right[cur])
+            out[active, f] += value[child] - value[cur]  # one split per row per step: no collisions
+            node[active] = child
+            active = active[left[child] != -1]
+    return out * scale
@@ -0,0 +1,47 @@
+"""Name/city normalization shared by the generators (originally in gen10-clean-and-enrich.py)."""
+
+# --- TITLE CASE HELPER ---
+SMALL_WORDS = {'of', 'the', 'and', 'in', 'for', 'to', 'a', 'an', 'at', 'by', 'or', 'on', 'is', 'with'}
+KEEP_UPPER = {'LLC', 'INC', 'LP', 'LLP', 'PC', 'PA', 'MD', 'DO', 'DDS', 'DMD', 'PhD', 'RN',
+              'NP', 'PLLC', 'DPM', 'OD', 'PT', 'II', 'III', 'IV', 'VA', 'NY', 'CA', 'TX',
+              'FL', 'IL', 'OH', 'MI', 'NJ', 'NC', 'MA', 'WA', 'CO', 'MN', 'OR', 'WI', 'CT',
+              'SC', 'AL', 'KY', 'OK', 'IA', 'AR', 'MS', 'KS', 'NV', 'NM', 'NE', 'WV', 'ID',
+              'HI', 'NH', 'ME', 'MT', 'RI', 'DE', 'SD', 'ND', 'AK', 'VT', 'WY', 'DC', 'PR',
+              'DDS', 'HHS', 'DHHS', 'PHS', 'IHS', 'DPH', 'USA', 'US', 'CDC'}
+
+def title_case(s):
+    if not s:
+        return s
+    words = s.split()
+    result = []
+    for i, w in enumerate(words):
+        upper = w.upper()
+        if upper in KEEP_UPPER:
+            result.append(upper)
+        elif i > 0 and w.lower() in SMALL_WORDS:
+            result.append(w.lower())
+        else:
+            # Title case but preserve internal caps like "McDonald"
+            result.append(w.capitalize())
+        # Handle hyphenated words
+    return ' '.join(result)
+
+def clean_city(city):
+    if not city:
+        return city
+    return title_case(city)
+
+def clean_name(name):
+    if not name:
+        return name
+    return title_case(name)
+
+def clean_state(state):
+    """Two-letter upper-case postal code, or '' if the value isn't one."""
+    state = (state or '').strip().upper()
+    return state if len(state) == 2 and state.isalpha() else ''
+
+def clean_zip(zip_code):
+    """First five digits of a ZIP / ZIP+4, or '' if there aren't five."""
+    digits = ''.join(ch for ch in str(zip_code or '') if ch.isdigit())
+    return digits[:5] if len(digits) >= 5 else ''
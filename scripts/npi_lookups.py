@@ -0,0 +1,40 @@
+"""
+reference-data/npi_lookups_expanded.csv reader/writer shared by the generators.
+
+Several scripts rewrite the lookup file (gen30 from NPPES, gen6/gen12/gen15 from
+the registry API). write_lookups() always writes LOOKUP_FIELDS first and then any
+other column already present in the file, so one writer never drops a column
+another one added (gen30's zip, used by gen21-geo-rollup.py).
+
+Usage:
+  from npi_lookups import LOOKUP_FIELDS, read_lookups, write_lookups
+  rows, fields = read_lookups(path)          # {npi: row}, header of the existing file
+  write_lookups(path, rows, fields)
+"""
+import csv, os
+
+LOOKUP_FIELDS = ['npi', 'provider_name', 'entity_type', 'taxonomy_description', 'city', 'state', 'zip']
+
+
+def read_lookups(path):
+    """{npi: row} and the file's header; ({}, LOOKUP_FIELDS) when the file doesn't exist."""
+    rows = {}
+    if not os.path.exists(path):
+        return rows, list(LOOKUP_FIELDS)
+    with open(path) as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            rows[row['npi']] = row
+    return rows, list(reader.fieldnames or LOOKUP_FIELDS)
+
+
+def write_lookups(path, rows, fields=()):
+    """Write rows ({npi: row} or a list of rows): LOOKUP_FIELDS, then any extra columns in `fields`."""
+    fieldnames = LOOKUP_FIELDS + [k for k in fields if k not in LOOKUP_FIELDS]
+    rows = rows.values() if isinstance(rows, dict) else rows
+    with open(path + '.tmp', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k) or '' for k in fieldnames})
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Local read-only query service over the provider rollups.
+
+Answers lookups for any billing NPI, not just the ~24.5K providers materialized
+in public/data/providers. Reads the parquet tables written by
+scripts/gen23-rollups.py (and the sketches from gen26-hll-sketches.py and
+gen27-heavy-hitters.py, the cohort ranks from gen28-peer-stats.py and the
+servicing tables, when present); no external services.
+
+Endpoints (JSON):
+  GET /providers/{npi}           same shape as public/data/providers/{npi}.json
+  GET /providers/{npi}/peers     percentile rank and robust z per metric against specialty,
+                                 state, specialty x state and primary-code peers (gen28)
+  GET /providers/{npi}/servicing?limit=50
+                                 servicing NPIs (clinicians) behind a billing NPI, by paid
+  GET /servicing/{npi}           servicing NPI detail: billing NPIs it bills through,
+                                 monthly volume, implied hours and peak month
+  GET /codes/{code}?limit=50     same shape as public/data/code-providers/{code}.json
+  GET /states/{ST}?limit=50      same shape as public/data/state-providers/{ST}.json
+  GET /distinct/providers?code=&state=&specialty=&year=
+                                 approximate distinct billing NPIs (HLL sketch union)
+  GET /distinct/servicing/{npi}  approximate distinct servicing NPIs under a billing NPI
+  GET /top?code=&state=&month=&year=&limit=50
+                                 top billing NPIs by paid from the heavy-hitter summaries,
+                                 with lower/upper bounds (gen27-heavy-hitters.py)
+  GET /health                    pool / cache stats
+
+Results are kept in an LRU cache; queries run on a bounded pool of DuckDB
+cursors, and requests that cannot get a cursor within POOL_TIMEOUT get a 503.
+
+Run: python3 scripts/query-service.py [--port 8787] [--pool 4]
+"""
+import json, os, csv, queue, argparse, time, re
+import hll
+import heavy_hitters as hh
+from duckdb_session import connect
+from functools import lru_cache
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, parse_qsl
+from name_utils import clean_name, clean_city
+
+ROLLUP_DIR = os.path.expanduser("~/.openclaw/workspace/rollups")
+HLL_DIR = os.path.join(ROLLUP_DIR, 'hll')
+HH_DIR = os.path.join(ROLLUP_DIR, 'heavy-hitters')
+NPI_CSV = os.path.join(os.path.dirname(__file__), '..', 'reference-data', 'npi_lookups_expanded.csv')
+
+CACHE_SIZE = 4096
+POOL_TIMEOUT = 5.0  # seconds
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+parser = argparse.ArgumentParser(description='Local read-only provider query service')
+parser.add_argument('--host', default='127.0.0.1')
+parser.add_argument('--port', type=int, default=8787)
+parser.add_argument('--pool', type=int, default=4, help='max concurrent DuckDB cursors')
+args = parser.parse_args()
+
+for name in ('provider', 'provider_code', 'provider_month'):
+    if not os.path.exists(os.path.join(ROLLUP_DIR, f'{name}.parquet')):
+        raise SystemExit(f"Missing {name}.parquet in {ROLLUP_DIR}; run scripts/gen23-rollups.py first")
+
+npi_info = {}
+with open(NPI_CSV) as f:
+    for row in csv.DictReader(f):
+        npi_info[row['npi']] = row
+print(f"Loaded {len(npi_info)} NPI lookups")
+
+con = connect('service', threads=args.pool)
+for name in ('provider', 'provider_code', 'provider_month'):
+    con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{os.path.join(ROLLUP_DIR, name)}.parquet')")
+HAS_HLL = os.path.exists(os.path.join(HLL_DIR, 'providers.parquet'))
+if HAS_HLL:
+    for name in ('providers', 'servicing'):
+        con.execute(f"CREATE VIEW hll_{name} AS SELECT * FROM read_parquet('{os.path.join(HLL_DIR, name)}.parquet')")
+HAS_PEERS = os.path.exists(os.path.join(ROLLUP_DIR, 'peer_stats.parquet'))
+if HAS_PEERS:
+    con.execute(f"CREATE VIEW peer_stats AS SELECT * FROM read_parquet('{os.path.join(ROLLUP_DIR, 'peer_stats.parquet')}')")
+HAS_SERVICING = os.path.exists(os.path.join(ROLLUP_DIR, 'servicing_provider.parquet'))
+if HAS_SERVICING:
+    for name in ('servicing_provider', 'servicing_billing_code_month', 'provider_servicing'):
+        con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{os.path.join(ROLLUP_DIR, name)}.parquet')")
+HAS_HH = os.path.exists(os.path.join(HH_DIR, 'code_month.parquet'))
+if HAS_HH:
+    for name in ('code_state_year', 'code_month', 'state_month'):
+        con.execute(f"CREATE VIEW hh_{name} AS SELECT * FROM read_parquet('{os.path.join(HH_DIR, name)}.parquet')")
+
+pool = queue.Queue(maxsize=args.pool)
+for _ in range(args.pool):
+    pool.put(con.cursor())
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+@contextmanager
+def cursor():
+    try:
+        cur = pool.get(timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        raise PoolExhausted()
+    try:
+        yield cur
+    finally:
+        pool.put(cur)
+
+
+def identity(npi, state='', specialty=''):
+    info = npi_info.get(npi, {})
+    return {
+        'name': clean_name(info.get('provider_name', '')),
+        'specialty': info.get('taxonomy_description') or specialty or '',
+        'city': clean_city(info.get('city', '')),
+        'state': info.get('state') or state or '',
+    }
+
+
+def provider_detail(npi):
+    with cursor() as cur:
+        p = cur.execute("SELECT * FROM provider WHERE npi = ?", [npi]).fetchone()
+        if p is None:
+            return None
+        procs = cur.execute("""
+            SELECT code, totalPaid, totalClaims, uniqueBeneficiaries FROM provider_code
+            WHERE npi = ? ORDER BY totalPaid DESC
+        """, [npi]).fetchall()
+        months = cur.execute("""
+            SELECT month, totalPaid, totalClaims FROM provider_month
+            WHERE npi = ? ORDER BY month
+        """, [npi]).fetchall()
+    # provider row: npi, state, specialty, totalPaid, totalClaims, totalBeneficiaries, uniqueCodes, activeMonths
+    return {
+        'npi': npi,
+        **identity(npi, p[1], p[2]),
+        'totalPaid': round(float(p[3]), 2),
+        'totalClaims': int(p[4]),
+        'totalBeneficiaries': int(p[5] or 0),
+        'uniqueCodes': int(p[6]),
+        'activeMonths': int(p[7]),
+        'procedures': [{'code': c, 'totalPaid': round(float(paid), 2), 'totalClaims': int(claims),
+                        'uniqueBeneficiaries': int(benes or 0)} for c, paid, claims, benes in procs],
+        'monthlyTrend': [{'month': m, 'totalPaid': round(float(paid), 2), 'totalClaims': int(claims)}
+                         for m, paid, claims in months],
+    }
+
+
+def code_providers(code, limit):
+    with cursor() as cur:
+        total = cur.execute("SELECT COUNT(*) FROM provider_code WHERE code = ?", [code]).fetchone()[0]
+        if not total:
+            return None
+        rows = cur.execute("""
+            SELECT c.npi, c.totalPaid, c.totalClaims, c.uniqueBeneficiaries, p.state, p.specialty
+            FROM provider_code c JOIN provider p USING (npi)
+            WHERE c.code = ? ORDER BY c.totalPaid DESC LIMIT ?
+        """, [code, limit]).fetchall()
+    top = []
+    for npi, paid, claims, benes, state, specialty in rows:
+        top.append({
+            'npi': npi, **identity(npi, state, specialty),
+            'totalPaid': round(float(paid), 2), 'claims': int(claims), 'beneficiaries': int(benes or 0),
+            'costPerClaim': round(float(paid) / claims, 2) if claims else 0.0,
+        })
+    return {'code': code, 'providerCount': int(total), 'topProviders': top}
+
+
+def state_providers(state, limit):
+    with cursor() as cur:
+        rows = cur.execute("""
+            SELECT npi, specialty, totalPaid, totalClaims, totalBeneficiaries FROM provider
+            WHERE state = ? ORDER BY totalPaid DESC LIMIT ?
+        """, [state, limit]).fetchall()
+    if not rows:
+        return None
+    out = []
+    for npi, specialty, paid, claims, benes in rows:
+        info = identity(npi, state, specialty)
+        out.append({
+            'npi': npi, 'name': info['name'], 'city': info['city'], 'specialty': info['specialty'],
+            'totalPaid': round(float(paid), 2), 'totalClaims': int(claims), 'totalBenes': int(benes or 0),
+        })
+    return out
+
+
+DISTINCT_FILTERS = {'code': str.upper, 'state': str.upper, 'specialty': str, 'year': int}
+
+
+def distinct_providers(query):
+    if not HAS_HLL:
+        return None
+    where, params = [], []
+    for key, value in query:
+        if key in DISTINCT_FILTERS:
+            where.append(f"{key} = ?")
+            params.append(DISTINCT_FILTERS[key](value))
+    with cursor() as cur:
+        n = hll.estimate(cur, 'hll_providers', ' AND '.join(where), params)
+    return {'filters': dict(query), 'providers': n, 'approximate': True,
+            'standardError': round(hll.standard_error(), 4)}
+
+
+def distinct_servicing(npi):
+    if not HAS_HLL:
+        return None
+    with cursor() as cur:
+        n = hll.estimate(cur, 'hll_servicing', 'npi = ?', [npi])
+    return {'npi': npi, 'servicingProviders': n, 'approximate': True,
+            'standardError': round(hll.standard_error(), 4)}
+
+
+PEER_METRICS = ('paid', 'costPerClaim', 'costPerBene', 'claimsPerBene')
+PEER_COHORTS = {'specialty': 'Specialty', 'state': 'State', 'specialtyState': 'SpecialtyState', 'code': 'Code'}
+
+
+def provider_peers(npi):
+    if not HAS_PEERS:
+        return None
+    with cursor() as cur:
+        cur.execute("SELECT * FROM peer_stats WHERE npi = ?", [npi])
+        row = cur.fetchone()
+        if row is None:
+            return None
+        r = dict(zip([d[0] for d in cur.description], row))
+
+    def num(v, digits):
+        return round(float(v), digits) if v is not None else None
+    return {
+        'npi': npi, 'specialty': r['specialty'], 'state': r['state'], 'primaryCode': r['primaryCode'],
+        'metrics': {m: num(r[m], 2) for m in PEER_METRICS},
+        'cohorts': {key: {'peers': r[f'peers{suffix}'],
+                          **{m: {'percentile': num(r[f'{m}Pct{suffix}'], 4), 'robustZ': num(r[f'{m}RobustZ{suffix}'], 2)}
+                             for m in PEER_METRICS}}
+                    for key, suffix in PEER_COHORTS.items()},
+    }
+
+
+def provider_servicing(npi, limit):
+    if not HAS_SERVICING:
+        return None
+    with cursor() as cur:
+        rows = cur.execute("""
+            SELECT servicingNpi, totalPaid, totalClaims, activeMonths, impliedHours FROM provider_servicing
+            WHERE npi = ? ORDER BY totalPaid DESC LIMIT ?
+        """, [npi, limit]).fetchall()
+        total = cur.execute("SELECT COUNT(*) FROM provider_servicing WHERE npi = ?", [npi]).fetchone()[0]
+    if not rows:
+        return None
+    return {
+        'npi': npi, **identity(npi), 'servicingProviders': total,
+        'servicing': [{'npi': snpi, **identity(snpi), 'totalPaid': round(float(paid), 2),
+                       'totalClaims': int(claims), 'activeMonths': int(months),
+                       'impliedHours': round(float(hours), 1) if hours is not None else None}
+                      for snpi, paid, claims, months, hours in rows],
+    }
+
+
+def servicing_detail(npi):
+    if not HAS_SERVICING:
+        return None
+    with cursor() as cur:
+        cur.execute("SELECT * FROM servicing_provider WHERE servicingNpi = ?", [npi])
+        row = cur.fetchone()
+        if row is None:
+            return None
+        r = dict(zip([d[0] for d in cur.description], row))
+        months = cur.execute("""
+            SELECT month, SUM(totalPaid), SUM(totalClaims), COUNT(DISTINCT billingNpi)
+            FROM servicing_billing_code_month WHERE servicingNpi = ?
+            GROUP BY month ORDER BY month
+        """, [npi]).fetchall()
+    return {
+        'npi': npi,
+        **identity(npi),
+        'totalPaid': round(float(r['totalPaid']), 2),
+        'totalClaims': int(r['totalClaims']),
+        'totalBeneficiaries': int(r['totalBeneficiaries'] or 0),
+        'uniqueCodes': int(r['uniqueCodes']),
+        'activeMonths': int(r['activeMonths']),
+        'selfBills': bool(r['selfBills']),
+        'impliedHours': round(float(r['impliedHours']), 1) if r['impliedHours'] is not None else None,
+        'peakMonth': r['peakMonth'],
+        'peakHoursPerDay': round(float(r['peakHoursPerDay']), 2) if r['peakHoursPerDay'] is not None else None,
+        'billingProviders': int(r['billingNpis']),
+        'billedThrough': [{'npi': b['npi'], **identity(b['npi']), 'totalPaid': round(float(b['totalPaid']), 2),
+                           'totalClaims': int(b['totalClaims']), 'activeMonths': int(b['activeMonths'])}
+                          for b in r['billedThrough']],
+        'monthlyTrend': [{'month': m, 'totalPaid': round(float(paid), 2), 'totalClaims': int(claims),
+                          'billingProviders': int(n)} for m, paid, claims, n in months],
+    }
+
+
+# summary table and cell keys for each filter combination /top can answer,
+# coarsest cells first (fewer merged cells, tighter error bound)
+TOP_SUMMARIES = [
+    ({'code', 'state', 'year'}, 'hh_code_state_year', ['code', 'state', 'year']),
+    ({'code', 'month'}, 'hh_code_month', ['code', 'month']),
+    ({'state', 'month'}, 'hh_state_month', ['state', 'month']),
+]
+TOP_FILTERS = {'code': str.upper, 'state': str.upper, 'month': str, 'year': int}
+
+
+def top_providers(query, limit):
+    if not HAS_HH:
+        return None
+    filters = {k: TOP_FILTERS[k](v) for k, v in query if k in TOP_FILTERS}
+    if 'month' in filters:
+        filters.pop('year', None)
+    match = next(((table, keys) for allowed, table, keys in TOP_SUMMARIES if set(filters) <= allowed), None)
+    if match is None:
+        raise BadRequest(f"no summary covers {'+'.join(sorted(filters))}; "
+                         "use code+month, state+month or code+state+year")
+    table, keys = match
+    where = ' AND '.join(f"{k} = ?" for k in filters)
+    with cursor() as cur:
+        rows = hh.topk(cur, table, keys, where, list(filters.values()), limit)
+    if not rows:
+        return None
+    return {
+        'filters': filters, 'summary': table[len('hh_'):], 'errorBound': round(float(rows[0][4]), 2),
+        'topProviders': [{'npi': npi, **identity(npi), 'totalPaid': round(float(lower), 2),
+                          'totalPaidUpper': round(float(upper), 2), 'claims': int(claims)}
+                         for npi, lower, upper, claims, _ in rows],
+    }
+
+
+ROUTES = [
+    (re.compile(r'^/providers/(\d{10})$'), lambda m, limit, query: provider_detail(m.group(1))),
+    (re.compile(r'^/providers/(\d{10})/peers$'), lambda m, limit, query: provider_peers(m.group(1))),
+    (re.compile(r'^/providers/(\d{10})/servicing$'), lambda m, limit, query: provider_servicing(m.group(1), limit)),
+    (re.compile(r'^/servicing/(\d{10})$'), lambda m, limit, query: servicing_detail(m.group(1))),
+    (re.compile(r'^/codes/([A-Za-z0-9]{1,8})$'), lambda m, limit, query: code_providers(m.group(1).upper(), limit)),
+    (re.compile(r'^/states/([A-Za-z]{2})$'), lambda m, limit, query: state_providers(m.group(1).upper(), limit)),
+    (re.compile(r'^/distinct/providers$'), lambda m, limit, query: distinct_providers(query)),
+    (re.compile(r'^/distinct/servicing/(\d{10})$'), lambda m, limit, query: distinct_servicing(m.group(1))),
+    (re.compile(r'^/top$'), lambda m, limit, query: top_providers(query, limit)),
+]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def resolve(path, limit, query=()):
+    """Returns (status, body bytes); cached per (path, limit, query). Pool errors are not cached."""
+    for pattern, handler in ROUTES:
+        m = pattern.match(path)
+        if m:
+            result = handler(m, limit, query)
+            if result is None:
+                return 404, json.dumps({'error': 'not found'}).encode()
+            return 200, json.dumps(result).encode()
+    return 404, json.dumps({'error': 'unknown endpoint'}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        t0 = time.time()
+        if path == '/health':
+            info = resolve.cache_info()
+            status, body = 200, json.dumps({
+                'ok': True, 'poolSize': args.pool, 'poolIdle': pool.qsize(),
+                'cacheHits': info.hits, 'cacheMisses': info.misses, 'cacheSize': info.currsize,
+            }).encode()
+        else:
+            try:
+                limit = min(max(int(parse_qs(url.query).get('limit', [DEFAULT_LIMIT])[0]), 1), MAX_LIMIT)
+                query = tuple(sorted((k, v) for k, v in parse_qsl(url.query) if k != 'limit'))
+                status, body = resolve(path, limit, query)
+            except ValueError:
+                status, body = 400, json.dumps({'error': 'limit and year must be integers'}).encode()
+            except BadRequest as e:
+                status, body = 400, json.dumps({'error': str(e)}).encode()
+            except PoolExhausted:
+                status, body = 503, json.dumps({'error': 'busy, retry'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Query-Ms', f"{(time.time() - t0) * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *a):
+        print(f"  {self.address_string()} {fmt % a}")
+
+
+server = ThreadingHTTPServer((args.host, args.port), Handler)
+print(f"Serving {ROLLUP_DIR} on http://{args.host}:{args.port} (pool={args.pool}, cache={CACHE_SIZE})")
+try:
+    server.serve_forever()
+except KeyboardInterrupt:
+    pass
+finally:
+    server.server_close()
+    con.close()
@@ -0,0 +1,53 @@
+"""
+Merging a detector's flags into public/data/smart-watchlist.json.
+
+The smart watchlist is keyed by billing NPI (gen11-smart-fraud.py). Detectors
+that flag servicing NPIs (gen20, gen29, gen31) carry a `role` on each record,
+which ends up in flagDetails. An existing entry keeps its own totalPaid, so a
+clinician's serviced dollars never mix into a billing entity's total; entries
+created here take the flag record's totalPaid and its role.
+
+Usage:
+  from watchlist import merge_flag
+  watchlist = merge_flag(OUT, 'impossible_volume', flags)
+"""
+import json, os
+from jsonout import write_json
+
+
+def merge_flag(out_dir, flag, flags):
+    """Replace `flag` on every watchlist entry with `flags` (records with npi, name, specialty,
+    city, state, totalPaid, role); the first record per NPI wins. Writes and returns the watchlist."""
+    wl_path = os.path.join(out_dir, 'smart-watchlist.json')
+    watchlist = []
+    if os.path.exists(wl_path):
+        with open(wl_path) as f:
+            watchlist = json.load(f)
+
+    by_npi = {}
+    for p in watchlist:
+        if flag in p.get('flags', []):  # re-runs replace the previous flag
+            p['flags'].remove(flag)
+            p.get('flagDetails', {}).pop(flag, None)
+            p['flagCount'] = len(p['flags'])
+        by_npi[p['npi']] = p
+
+    for fl in flags:
+        entry = by_npi.get(fl['npi'])
+        if entry is None:
+            entry = {
+                'npi': fl['npi'], 'name': fl['name'], 'specialty': fl['specialty'],
+                'city': fl['city'], 'state': fl['state'], 'role': fl.get('role', 'billing'),
+                'totalPaid': fl['totalPaid'], 'flagCount': 0, 'flags': [], 'flagDetails': {},
+            }
+            by_npi[fl['npi']] = entry
+        if flag in entry['flags']:
+            continue  # flagged under another role too; the caller's order decides which record is kept
+        entry['flags'].append(flag)
+        entry['flagDetails'][flag] = fl
+        entry['flagCount'] = len(entry['flags'])
+
+    watchlist = [p for p in by_npi.values() if p['flagCount'] > 0]
+    watchlist.sort(key=lambda x: (-x['flagCount'], -x['totalPaid']))
+    write_json(wl_path, watchlist)
+    return watchlist
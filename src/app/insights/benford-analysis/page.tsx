@@ -211,9 +211,10 @@ export default function BenfordAnalysis() {
           <p className="text-white font-semibold mb-1">What the Chi-Squared Statistic Means</p>
           <p className="text-sm text-slate-400 leading-relaxed">
             The chi-squared test compares observed leading-digit frequencies against Benford&apos;s expected distribution.
-            A value near 0 means the data perfectly matches the expected pattern. Values above 2.0 suggest significant
-            deviation. Values above 3.0 are unusual enough to warrant investigation &mdash; the probability of this
-            occurring by chance in natural data is very low.
+            A value near 0 means the data perfectly matches the expected pattern. With nine possible leading digits,
+            values above 20.1 would occur by chance less than 1% of the time in natural data. Because the statistic
+            grows with the number of payments, we only flag providers whose digit frequencies are also far off on average
+            (Nigrini&apos;s mean-absolute-deviation bounds), so large billers are not flagged for tiny deviations.
           </p>
         </div>
 
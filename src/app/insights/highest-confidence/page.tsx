@@ -52,6 +52,8 @@ type CompositeProvider = {
   hasVelocity: boolean;
   hasChangePoint: boolean;
   hasConcentration: boolean;
+  hasAnomaly?: boolean;
+  anomalyPercentile?: number | null;
 };
 
 const providers = (compositeScores as CompositeProvider[]).sort((a, b) => b.compositeScore - a.compositeScore);
@@ -63,6 +65,7 @@ const METHOD_BADGES: { key: keyof CompositeProvider; label: string; color: strin
   { key: "hasVelocity", label: "Velocity", color: "text-cyan-400", bgColor: "bg-cyan-500/15 border-cyan-500/30" },
   { key: "hasChangePoint", label: "Change Point", color: "text-teal-400", bgColor: "bg-teal-500/15 border-teal-500/30" },
   { key: "hasConcentration", label: "Concentration", color: "text-amber-400", bgColor: "bg-amber-500/15 border-amber-500/30" },
+  { key: "hasAnomaly", label: "Anomaly", color: "text-rose-400", bgColor: "bg-rose-500/15 border-rose-500/30" },
 ];
 
 function getActiveMethodBadges(p: CompositeProvider) {
@@ -92,6 +95,7 @@ export default function HighestConfidence() {
     if (p.hasVelocity) parts.push("Velocity");
     if (p.hasChangePoint) parts.push("Change Point");
     if (p.hasConcentration) parts.push("Concentration");
+    if (p.hasAnomaly) parts.push("Anomaly");
     return parts.join(" + ");
   }
   const comboCounts: Record<string, number> = {};
@@ -1,16 +1,13 @@
 import Link from "next/link";
 import { notFound } from "next/navigation";
 import type { Metadata } from "next";
-import { formatMoney, formatNumber, formatMoneyFull, formatCpc, riskLabel, riskColor, riskDot, riskBgColor, getFlagInfo, parseFlags, hcpcsDescription, stateName, decileColor, decileBgColor } from "@/lib/format";
+import { formatMoney, formatNumber, formatMoneyFull, formatCpc, riskLabel, riskColor, riskDot, riskBgColor, getFlagInfo, parseFlags, hcpcsDescription, stateName, decileColor, decileBgColor, expandColumns, mlFeatureLabel } from "@/lib/format";
 import { MonthlySpendingChart } from "@/components/Charts";
 import { CopyLinkButton } from "@/components/CopyLinkButton";
+import { loadFlagBundle } from "@/lib/flags";
 import topProviders from "../../../../public/data/top-providers-1000.json";
-import smartWatchlist from "../../../../public/data/smart-watchlist.json";
-import oldWatchlist from "../../../../public/data/expanded-watchlist.json";
 import stats from "../../../../public/data/stats.json";
-import mlScores from "../../../../public/data/ml-scores.json";
 import specialtyBenchmarks from "../../../../public/data/specialty-benchmarks.json";
-import leieMatched from "../../../../public/data/leie-matched.json";
 
 // Load code benchmarks lazily at runtime (avoid bundling 2.7MB into serverless function)
 let _codeBenchMap: Map<string, any> | null = null;
@@ -27,9 +24,6 @@ function getCodeBenchMap(): Map<string, any> {
 import fs from "fs";
 import path from "path";
 
-// Build exclusion lookup (40 entries)
-const leieMatchedMap = new Map<string, any>((leieMatched as any[]).map((d: any) => [d.npi, d]));
-
 interface Props {
   params: { npi: string };
 }
@@ -52,8 +46,9 @@ export async function generateMetadata({ params }: Props): Promise<Metadata> {
     }
   } catch {}
   const name = detail?.name || provider?.name || `Provider ${params.npi}`;
-  const smartEntry = (smartWatchlist as any[]).find((w: any) => w.npi === params.npi);
-  const oldEntry = (oldWatchlist as any[]).find((w: any) => w.npi === params.npi);
+  const flagBundle = loadFlagBundle(params.npi);
+  const smartEntry = flagBundle?.smart;
+  const oldEntry = flagBundle?.expanded;
   const flagCount = smartEntry?.flagCount || oldEntry?.flag_count || 0;
   const flagged = flagCount > 0 ? ` Flagged for ${flagCount} billing anomalies.` : '';
   return {
@@ -89,6 +84,19 @@ function buildFlagExplanation(flag: string, details: any): string {
       ).join(', ');
       return `Billing above the 90th percentile for ${codes} procedure codes${codeExamples ? `: ${codeExamples}` : ''}.`;
     }
+    case 'impossible_volume': {
+      return `Timed procedure codes imply ${details.peakHoursPerDay?.toFixed(1)} hours of work per day in ${details.peakMonth} (mostly ${details.peakCode}), with ${details.monthsOverCapacity} months over a single clinician's capacity.`;
+    }
+    case 'billed_while_excluded': {
+      const ymd = (d: string) => d && d.length === 8 ? `${d.slice(4, 6)}/${d.slice(6, 8)}/${d.slice(0, 4)}` : d;
+      const months = Math.max(details.billedMonths || 0, details.servicedMonths || 0);
+      const status = details.reinDate ? `reinstated ${ymd(details.reinDate)}` : 'never reinstated';
+      return `Excluded by the OIG on ${ymd(details.exclDate)} (${details.exclType}, ${status}), yet Medicaid paid ${formatMoney(details.totalPaid)} on claims it ${details.role === 'servicing' ? 'serviced' : 'billed'} across ${months} months of the exclusion (${details.firstMonth} to ${details.lastMonth}).`;
+    }
+    case 'multi_state_billing': {
+      const top = (details.states || []).slice(0, 3).map((s: any) => s.state).join(', ');
+      return `Paid in ${details.statesCount} states (mostly ${top}) as the ${details.role} provider, with ${details.concurrentMonths} months billed in two or more states at once and ${details.stateHops} moves of its main billing state between months.`;
+    }
     // Old flag types
     case 'outlier_spending':
       return details.total_paid ? `Total spending of ${formatMoney(details.total_paid)} is significantly above median.` : '';
@@ -115,19 +123,6 @@ function buildFlagExplanation(flag: string, details: any): string {
   }
 }
 
-// Load advanced detection datasets (once at module level)
-function loadJsonArray(filename: string): any[] {
-  try {
-    const p = path.join(process.cwd(), "public", "data", filename);
-    if (fs.existsSync(p)) return JSON.parse(fs.readFileSync(p, "utf-8"));
-  } catch {}
-  return [];
-}
-const impossibleVolumeMap = new Map<string, any>(loadJsonArray("impossible-volume.json").map((d: any) => [d.npi, d]));
-const benfordFlagsMap = new Map<string, any>(loadJsonArray("benford-flags.json").map((d: any) => [d.npi, d]));
-const changePointsMap = new Map<string, any>(loadJsonArray("change-points.json").map((d: any) => [d.npi, d]));
-const suspiciousConcentrationMap = new Map<string, any>(loadJsonArray("suspicious-concentration.json").map((d: any) => [d.npi, d]));
-
 // Lazy lookup: find NPI in code-providers files (only when needed, avoids loading 65MB at module init)
 function findInCodeProviders(npi: string): any | null {
   try {
@@ -158,9 +153,11 @@ export default function ProviderPage({ params }: Props) {
     }
   } catch {}
 
-  // Watchlist entries - smart watchlist is primary, merge with old
-  const smartEntry = (smartWatchlist as any[]).find((w: any) => w.npi === npi);
-  const oldEntry = (oldWatchlist as any[]).find((w: any) => w.npi === npi);
+  // Watchlist, detector, ML and exclusion records for this NPI (one shard read)
+  // Smart watchlist is primary, merged with old
+  const flagBundle = loadFlagBundle(npi);
+  const smartEntry = flagBundle?.smart;
+  const oldEntry = flagBundle?.expanded;
   const providerEntry = (topProviders as any[]).find((p: any) => p.npi === npi);
 
   // Fallback: find this NPI in code-providers (procedure page data)
@@ -176,7 +173,7 @@ export default function ProviderPage({ params }: Props) {
   const avgPerClaim = totalClaims > 0 ? totalPaid / totalClaims : 0;
   const claimsPerBene = totalBenes > 0 ? totalClaims / totalBenes : 0;
   const growthRate = detail?.growthRate || 0;
-  const monthly = detail?.monthly || detail?.monthlyTrend || [];
+  const monthly = expandColumns(detail?.monthly || detail?.monthlyTrend);
   // Build yearly data from various formats
   const yearlyData: Record<string, number> = {};
   if (detail?.yearlyData && typeof detail.yearlyData === 'object' && !Array.isArray(detail.yearlyData)) {
@@ -188,7 +185,7 @@ export default function ProviderPage({ params }: Props) {
       yearlyData[item.year || item.month?.substring(0, 4)] = item.totalPaid ?? item.payments ?? 0;
     }
   }
-  const procedures = (detail?.procedures || detail?.codes || detail?.topProcedures || []).map((p: any) => {
+  const procedures = expandColumns(detail?.procedures || detail?.codes || detail?.topProcedures).map((p: any) => {
     const payments = p.payments ?? p.totalPaid ?? p.paid ?? 0;
     const claims = p.claims ?? p.totalClaims ?? 0;
     const providerCpc = p.providerCpc ?? p.costPerClaim ?? (claims > 0 ? payments / claims : 0);
@@ -217,8 +214,9 @@ export default function ProviderPage({ params }: Props) {
   });
 
   // ML Score lookup
-  const mlEntry = ((mlScores as any).topProviders as any[])?.find((p: any) => p.npi === npi);
+  const mlEntry = flagBundle?.ml;
   const mlScore = mlEntry?.mlScore ?? null;
+  const mlFactors = (flagBundle?.mlFactors ?? mlEntry?.topFactors ?? []) as Array<{ feature: string; value: number; contribution: number }>;
 
   // Merge flags from smart watchlist + old watchlist + detail JSON
   const smartFlags = smartEntry?.flags || [];
@@ -339,8 +337,8 @@ export default function ProviderPage({ params }: Props) {
       </div>
 
       {/* OIG Exclusion Banner */}
-      {leieMatchedMap.has(npi) && (() => {
-        const excl = leieMatchedMap.get(npi)!;
+      {flagBundle?.leie && (() => {
+        const excl = flagBundle.leie;
         const exclDateRaw = excl.exclDate || '';
         const exclDateFormatted = exclDateRaw.length === 8
           ? `${exclDateRaw.slice(4, 6)}/${exclDateRaw.slice(6, 8)}/${exclDateRaw.slice(0, 4)}`
@@ -416,6 +414,21 @@ export default function ProviderPage({ params }: Props) {
             </Link>
           </div>
         )}
+        {mlScore !== null && mlFactors.length > 0 && (
+          <div className="mt-3 bg-dark-800/60 border border-dark-500/50 rounded-lg px-4 py-3">
+            <p className="text-[10px] text-slate-500 uppercase tracking-wider font-semibold mb-2">Why the model scored this provider</p>
+            <ul className="space-y-1">
+              {mlFactors.map((f) => (
+                <li key={f.feature} className="flex items-center justify-between gap-4 text-xs">
+                  <span className="text-slate-300">{mlFeatureLabel(f.feature)}</span>
+                  <span className="text-slate-500 tabular-nums">
+                    {formatNumber(f.value)} <span className="text-red-400 font-semibold">+{f.contribution.toFixed(3)}</span>
+                  </span>
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
       </div>
 
       {/* Limited Data Banner */}
@@ -530,10 +543,10 @@ export default function ProviderPage({ params }: Props) {
 
       {/* Advanced Detection Signals */}
       {flagCount > 0 && (() => {
-        const ivEntry = impossibleVolumeMap.get(npi);
-        const bfEntry = benfordFlagsMap.get(npi);
-        const cpEntry = changePointsMap.get(npi);
-        const scEntry = suspiciousConcentrationMap.get(npi);
+        const ivEntry = flagBundle?.detectors?.impossibleVolume;
+        const bfEntry = flagBundle?.detectors?.benford;
+        const cpEntry = flagBundle?.detectors?.changePoints;
+        const scEntry = flagBundle?.detectors?.suspiciousConcentration;
         if (!ivEntry && !bfEntry && !cpEntry && !scEntry) return null;
 
         const signals: { label: string; value: string; color: string; bg: string }[] = [];
@@ -561,6 +574,46 @@ export default function ProviderPage({ params }: Props) {
         );
       })()}
 
+      {/* Clinicians billed under this NPI */}
+      {(() => {
+        const servicing = flagBundle?.servicing ?? [];
+        if (servicing.length === 0) return null;
+        return (
+          <div className="bg-dark-800 border border-dark-500/50 rounded-xl p-5 mb-8">
+            <h2 className="text-sm font-bold text-white mb-3">Clinicians Billed Under This NPI</h2>
+            <p className="text-[10px] text-slate-500 mb-3">
+              Top {servicing.length} of {formatNumber(flagBundle?.servicingCount ?? servicing.length)} servicing providers by Medicaid paid. Hours are implied by timed procedure codes; peak hours are per calendar day across every entity the clinician bills through.
+            </p>
+            <div className="overflow-x-auto">
+              <table className="w-full text-xs">
+                <thead>
+                  <tr className="text-slate-500 text-left">
+                    <th className="py-1.5 pr-4 font-semibold">Provider</th>
+                    <th className="py-1.5 pr-4 font-semibold text-right">Paid</th>
+                    <th className="py-1.5 pr-4 font-semibold text-right">Implied Hours</th>
+                    <th className="py-1.5 font-semibold text-right">Peak Hours/Day</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {servicing.map((s) => (
+                    <tr key={s.npi} className="border-t border-dark-500/40">
+                      <td className="py-1.5 pr-4">
+                        <Link href={`/providers/${s.npi}`} className="text-blue-400 hover:text-blue-300">{s.name || `NPI ${s.npi}`}</Link>
+                      </td>
+                      <td className="py-1.5 pr-4 text-right text-slate-300 tabular-nums">{formatMoney(s.totalPaid)}</td>
+                      <td className="py-1.5 pr-4 text-right text-slate-300 tabular-nums">{s.impliedHours > 0 ? formatNumber(s.impliedHours) : '\u2014'}</td>
+                      <td className={`py-1.5 text-right tabular-nums ${s.peakHoursPerDay > 24 ? 'text-red-400 font-semibold' : 'text-slate-300'}`}>
+                        {s.peakHoursPerDay > 0 ? `${s.peakHoursPerDay.toFixed(1)} (${s.peakMonth})` : '\u2014'}
+                      </td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+          </div>
+        );
+      })()}
+
       {/* Risk Assessment — plain-English summary */}
       {flagCount > 0 && procedures.length > 0 && (() => {
         // Build plain-English risk assessment sentences
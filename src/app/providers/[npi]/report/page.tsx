@@ -1,12 +1,10 @@
 import Link from "next/link";
 import { notFound } from "next/navigation";
 import type { Metadata } from "next";
-import { formatMoney, formatNumber, formatMoneyFull, formatCpc, getFlagInfo, parseFlags, hcpcsDescription, stateName } from "@/lib/format";
+import { formatMoney, formatNumber, formatMoneyFull, formatCpc, getFlagInfo, parseFlags, hcpcsDescription, stateName, expandColumns, mlFeatureLabel } from "@/lib/format";
 import PrintButton from "@/components/PrintButton";
 import topProviders from "../../../../../public/data/top-providers-1000.json";
-import smartWatchlist from "../../../../../public/data/smart-watchlist.json";
-import oldWatchlist from "../../../../../public/data/expanded-watchlist.json";
-import mlScores from "../../../../../public/data/ml-scores.json";
+import { loadFlagBundle } from "@/lib/flags";
 import fs from "fs";
 import path from "path";
 
@@ -17,8 +15,12 @@ interface Props {
 export async function generateStaticParams() {
   // Only pre-render report pages for flagged providers
   const npis = new Set<string>();
-  for (const p of smartWatchlist as any[]) npis.add(p.npi);
-  for (const p of oldWatchlist as any[]) npis.add(p.npi);
+  for (const file of ["smart-watchlist.json", "expanded-watchlist.json"]) {
+    try {
+      const list = JSON.parse(fs.readFileSync(path.join(process.cwd(), "public", "data", file), "utf-8"));
+      for (const p of list as any[]) npis.add(p.npi);
+    } catch {}
+  }
   return Array.from(npis).slice(0, 200).map((npi) => ({ npi }));
 }
 
@@ -33,7 +35,7 @@ export async function generateMetadata({ params }: Props): Promise<Metadata> {
     }
   } catch {}
   const provider = (topProviders as any[]).find((p: any) => p.npi === params.npi);
-  const smartEntry = (smartWatchlist as any[]).find((w: any) => w.npi === params.npi);
+  const smartEntry = loadFlagBundle(params.npi)?.smart;
   const name = detail?.name || smartEntry?.name || provider?.name || `Provider ${params.npi}`;
   return {
     title: `Report Card — ${name}`,
@@ -42,14 +44,6 @@ export async function generateMetadata({ params }: Props): Promise<Metadata> {
   };
 }
 
-function loadJsonArray(filename: string): any[] {
-  try {
-    const p = path.join(process.cwd(), "public", "data", filename);
-    if (fs.existsSync(p)) return JSON.parse(fs.readFileSync(p, "utf-8"));
-  } catch {}
-  return [];
-}
-
 function buildFlagExplanation(flag: string, details: any): string {
   if (!details) return '';
   switch (flag) {
@@ -94,12 +88,6 @@ function buildFlagExplanation(flag: string, details: any): string {
   }
 }
 
-// Load advanced detection datasets
-const impossibleVolumeMap = new Map<string, any>(loadJsonArray("impossible-volume.json").map((d: any) => [d.npi, d]));
-const benfordFlagsMap = new Map<string, any>(loadJsonArray("benford-flags.json").map((d: any) => [d.npi, d]));
-const changePointsMap = new Map<string, any>(loadJsonArray("change-points.json").map((d: any) => [d.npi, d]));
-const suspiciousConcentrationMap = new Map<string, any>(loadJsonArray("suspicious-concentration.json").map((d: any) => [d.npi, d]));
-
 export default function ProviderReportPage({ params }: Props) {
   const { npi } = params;
 
@@ -112,8 +100,9 @@ export default function ProviderReportPage({ params }: Props) {
     }
   } catch {}
 
-  const smartEntry = (smartWatchlist as any[]).find((w: any) => w.npi === npi);
-  const oldEntry = (oldWatchlist as any[]).find((w: any) => w.npi === npi);
+  const flagBundle = loadFlagBundle(npi);
+  const smartEntry = flagBundle?.smart;
+  const oldEntry = flagBundle?.expanded;
   const providerEntry = (topProviders as any[]).find((p: any) => p.npi === npi);
 
   const name = detail?.name || smartEntry?.name || providerEntry?.name || `Provider ${npi}`;
@@ -124,11 +113,12 @@ export default function ProviderReportPage({ params }: Props) {
   const totalClaims = detail?.totalClaims || providerEntry?.totalClaims || 0;
   const totalBenes = detail?.totalBeneficiaries || detail?.totalBenes || providerEntry?.totalBeneficiaries || providerEntry?.totalBenes || 0;
   const avgPerClaim = totalClaims > 0 ? totalPaid / totalClaims : 0;
-  const monthly = detail?.monthly || [];
+  const monthly = expandColumns(detail?.monthly);
 
   // ML Score lookup
-  const mlEntry = ((mlScores as any).topProviders as any[])?.find((p: any) => p.npi === npi);
+  const mlEntry = flagBundle?.ml;
   const mlScore = mlEntry?.mlScore ?? null;
+  const mlFactors = (flagBundle?.mlFactors ?? mlEntry?.topFactors ?? []) as Array<{ feature: string; value: number; contribution: number }>;
 
   // Merge flags
   const smartFlags = smartEntry?.flags || [];
@@ -149,10 +139,10 @@ export default function ProviderReportPage({ params }: Props) {
   }
 
   // Advanced detection
-  const ivEntry = impossibleVolumeMap.get(npi);
-  const bfEntry = benfordFlagsMap.get(npi);
-  const cpEntry = changePointsMap.get(npi);
-  const scEntry = suspiciousConcentrationMap.get(npi);
+  const ivEntry = flagBundle?.detectors?.impossibleVolume;
+  const bfEntry = flagBundle?.detectors?.benford;
+  const cpEntry = flagBundle?.detectors?.changePoints;
+  const scEntry = flagBundle?.detectors?.suspiciousConcentration;
   const hasAdvanced = !!(ivEntry || bfEntry || cpEntry || scEntry);
 
   // Risk tier
@@ -335,6 +325,12 @@ export default function ProviderReportPage({ params }: Props) {
               {mlScore >= 0.3 && mlScore < 0.6 && ' This is a moderate score.'}
               {mlScore < 0.3 && ' This is a low score.'}
             </p>
+            {mlFactors.length > 0 && (
+              <p className="text-sm text-gray-600 mt-2">
+                Largest contributors to the score:{' '}
+                {mlFactors.map((f) => `${mlFeatureLabel(f.feature)} (${formatNumber(f.value)})`).join(', ')}.
+              </p>
+            )}
             {flagCount > 0 && (
               <p className="text-sm text-gray-800 font-semibold mt-2">
                 This provider was flagged by both statistical tests and machine learning — providers flagged by both methods are significantly more likely to warrant investigation.
@@ -13,6 +13,8 @@ const data = geoRisk as Array<{
   population: number;
   flagsPerCapita: number;
   spendingPerCapita: number;
+  multiStateProviders?: number;
+  multiStatePaid?: number;
 }>;
 
 const stateMap = new Map(data.map((s) => [s.state, s]));
@@ -108,6 +110,10 @@ export default function StateRiskPage({ params }: { params: { state: string } })
           }.
           Of {st.flaggedCount} total flagged providers, {st.statFlags} were identified through statistical analysis
           {st.mlFlags > 0 && <> and {st.mlFlags} by machine learning models</>}.
+          {(st.multiStateProviders ?? 0) > 0 && <>
+            {" "}<strong className="text-white">{st.multiStateProviders}</strong> providers paid here also bill Medicaid
+            in other states at the same time or move between states ({formatMoney(st.multiStatePaid ?? 0)} paid in {name}).
+          </>}
           {st.totalSpending > 0 && <>
             {" "}Total suspicious spending amounts to <strong className="text-white">{formatMoney(st.totalSpending)}</strong>,
             translating to <strong className="text-white">${st.spendingPerCapita.toLocaleString()}</strong> per resident —
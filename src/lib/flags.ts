@@ -0,0 +1,39 @@
+import fs from "fs";
+import path from "path";
+
+// Per-NPI flag records written by scripts/gen24-flag-bundle.py, sharded by NPI prefix.
+const SHARD_DIGITS = 5;
+
+export interface FlagBundle {
+  npi: string;
+  flags: string[];
+  smart?: any;
+  expanded?: any;
+  fraud?: Record<string, any[]>;
+  detectors?: {
+    impossibleVolume?: any;
+    benford?: any;
+    changePoints?: any;
+    suspiciousConcentration?: any;
+  };
+  ml?: any;
+  mlHigh?: any;
+  mlColabScore?: number;
+  // top positive per-feature contributions to the ML score (scripts/ml-explain.py)
+  mlFactors?: Array<{ feature: string; value: number; contribution: number }>;
+  leie?: any;
+  leieIndex?: any;
+  // top servicing NPIs billed under this NPI (gen23 rollups); peakHoursPerDay is per calendar day
+  servicing?: Array<{ npi: string; name: string; totalPaid: number; impliedHours: number; peakMonth: string; peakHoursPerDay: number }>;
+  servicingCount?: number;
+}
+
+export function loadFlagBundle(npi: string): FlagBundle | null {
+  try {
+    const p = path.join(process.cwd(), "public", "data", "flags", `${npi.slice(0, SHARD_DIGITS)}.json`);
+    if (!fs.existsSync(p)) return null;
+    return JSON.parse(fs.readFileSync(p, "utf-8"))[npi] ?? null;
+  } catch {
+    return null;
+  }
+}
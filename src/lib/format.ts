@@ -154,8 +154,56 @@ const FLAG_INFO: Record<string, FlagInfo> = {
     color: 'text-orange-400',
     bgColor: 'bg-orange-500/15 border-orange-500/30',
   },
+  'impossible_volume': {
+    label: 'Impossible Hours',
+    description: 'Timed procedure codes imply more work hours per day than one clinician could deliver.',
+    color: 'text-red-400',
+    bgColor: 'bg-red-500/15 border-red-500/30',
+  },
+  'billed_while_excluded': {
+    label: 'Paid While Excluded',
+    description: 'Medicaid paid claims billed or serviced by this NPI during its OIG (LEIE) exclusion period.',
+    color: 'text-red-400',
+    bgColor: 'bg-red-500/15 border-red-500/30',
+  },
+  'multi_state_billing': {
+    label: 'Multi-State Billing',
+    description: 'Paid by Medicaid in several states in the same months, or repeatedly moving its billing between states.',
+    color: 'text-orange-400',
+    bgColor: 'bg-orange-500/15 border-orange-500/30',
+  },
 };
 
+// ── ML feature names (scripts/feature_store.py FEAT_COLS) ─────────
+
+const ML_FEATURE_LABELS: Record<string, string> = {
+  total_paid: 'Total Payments',
+  total_claims: 'Total Claims',
+  total_benes: 'Total Beneficiaries',
+  code_count: 'Unique Procedure Codes',
+  cost_per_claim: 'Cost Per Claim',
+  cost_per_bene: 'Cost Per Beneficiary',
+  claims_per_bene: 'Claims Per Beneficiary',
+  active_months: 'Active Months',
+  paid_per_month: 'Payments Per Month',
+  claims_per_month: 'Claims Per Month',
+  top_code_conc: 'Top Code Concentration',
+  self_bill_ratio: 'Self-Billing Ratio',
+  max_growth_ratio: 'Year-over-Year Growth',
+  short_burst: 'Short Burst Billing',
+  low_code_high_bill: 'Low Codes / High Spend',
+  paid_z_specialty: 'Payments vs Specialty Peers',
+  cpc_z_specialty: 'Cost Per Claim vs Specialty Peers',
+  cpb_z_specialty: 'Cost Per Beneficiary vs Specialty Peers',
+  paid_z_state: 'Payments vs State Peers',
+  cpc_z_state: 'Cost Per Claim vs State Peers',
+  peer_count: 'Specialty Peer Count',
+};
+
+export function mlFeatureLabel(feature: string): string {
+  return ML_FEATURE_LABELS[feature] || feature.replace(/_/g, ' ').replace(/\b\w/g, c => c.toUpperCase());
+}
+
 export function getFlagInfo(flag: string): FlagInfo {
   return FLAG_INFO[flag] || {
     label: flag.replace(/_/g, ' ').replace(/\b\w/g, c => c.toUpperCase()),
@@ -406,3 +454,13 @@ const STATE_NAMES: Record<string, string> = {
 export function stateName(code: string): string {
   return STATE_NAMES[code] || code;
 }
+
+// Generators may store record lists as { columns, rows } (scripts/jsonout.py); accepts either form.
+export function expandColumns<T = any>(v: any): T[] {
+  if (!v) return [];
+  if (Array.isArray(v)) return v;
+  if (Array.isArray(v.columns) && Array.isArray(v.rows)) {
+    return v.rows.map((r: any[]) => Object.fromEntries(v.columns.map((c: string, i: number) => [c, r[i]])) as T);
+  }
+  return [];
+}
@@ -0,0 +1,61 @@
+"""Bounds of the mergeable top-K summaries in scripts/heavy_hitters.py."""
+import os, random, sys
+
+import duckdb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+import heavy_hitters as hh  # noqa: E402
+
+KEYS = ['code']
+
+
+def summarize(con, name, rows, k, src='new', old=None):
+    con.execute(f"CREATE OR REPLACE TEMP TABLE raw_{name} (code VARCHAR, npi VARCHAR, paid DOUBLE, claims BIGINT)")
+    con.executemany(f"INSERT INTO raw_{name} VALUES (?, ?, ?, ?)", rows)
+    inp = hh.exact_input_sql(f'raw_{name}', KEYS, src)
+    if old:
+        inp = f"SELECT *, 'old' AS src FROM {old} UNION ALL BY NAME {inp}"
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {name} AS {hh.summarize_sql(inp, KEYS, k)}")
+
+
+def truth(rows):
+    out = {}
+    for _, npi, paid, _ in rows:
+        out[npi] = out.get(npi, 0.0) + paid
+    return out
+
+
+def check_bounds(con, table, true_totals):
+    rows = hh.topk(con, table, KEYS, limit=1000)
+    assert rows
+    for npi, lower, upper, _, error_bound in rows:
+        assert lower <= true_totals[npi] + 1e-6
+        assert true_totals[npi] <= upper + 1e-6
+    listed = {r[0] for r in rows}
+    floor = min(r[1] for r in rows)
+    for npi, total in true_totals.items():
+        if npi not in listed:
+            assert total <= floor + rows[0][4] + 1e-6
+
+
+def test_merge_keeps_upper_bound():
+    # k=1: the first batch keeps x and drops y (9); the second makes y the kept
+    # item, so y's lower misses the 9 that only the old cell error covers
+    con = duckdb.connect()
+    first = [('A', 'x', 10.0, 1), ('A', 'y', 9.0, 1)]
+    second = [('A', 'y', 20.0, 1)]
+    summarize(con, 'h1', first, 1)
+    summarize(con, 'h2', second, 1, old='h1')
+    check_bounds(con, 'h2', truth(first + second))
+
+
+def test_random_appends_keep_bounds():
+    rng = random.Random(7)
+    con = duckdb.connect()
+    all_rows, prev = [], None
+    for month in range(6):
+        rows = [(rng.choice('ABC'), f'n{rng.randrange(40)}', rng.expovariate(1 / 100), 1) for _ in range(300)]
+        all_rows += rows
+        summarize(con, f'm{month}', rows, 5, old=prev)
+        prev = f'm{month}'
+        check_bounds(con, prev, truth(all_rows))